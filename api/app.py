@@ -7,6 +7,7 @@ This API exposes the fraud detection model as a REST service.
 Endpoints:
     POST /predict          - Predict fraud for a single transaction
     POST /predict/batch    - Predict fraud for multiple transactions
+    GET  /drift           - Feature drift (PSI/KS) of recent traffic vs training
     GET  /health          - Health check
     GET  /                - API documentation
 
@@ -19,41 +20,70 @@ Access:
 
 from flask import Flask, request, jsonify, render_template
 from flask_cors import CORS
-import pandas as pd
 import sys
 from pathlib import Path
 
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from utils import (  # type: ignore
-    load_model,
-    load_scaler,
-    load_feature_names,
-    preprocess_transaction,
-    interpret_prediction
-)
+from utils import interpret_prediction  # type: ignore
+from inference_pipeline import load_model_bundle  # type: ignore
+from velocity_features import VelocityFeatureStore  # type: ignore
+from drift_monitor import DriftMonitor, load_drift_reference  # type: ignore
 
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for frontend integration
 
+# Per-card velocity (transaction counts/amount sums over 1m/1h/24h), updated
+# for every scored transaction that carries this key
+VELOCITY_ENTITY_KEY = 'card_id'
+VELOCITY = VelocityFeatureStore()
+
+
+def add_velocity_features(transaction: dict) -> tuple:
+    """
+    Record a transaction in the velocity store and merge its features.
+    
+    Returns:
+        (features for scoring, velocity features or None without an entity key)
+    """
+    entity = transaction.get(VELOCITY_ENTITY_KEY)
+    if entity is None:
+        return transaction, None
+    
+    velocity = VELOCITY.update(
+        entity, transaction.get('Time') or 0.0, transaction.get('Amount') or 0.0
+    )
+    return {**transaction, **velocity}, velocity
+
+
 # Load model at startup
 print("🔧 Loading fraud detection model...")
 try:
     # Fix path - use models/ from project root
     model_dir = Path(__file__).parent.parent / 'models'
-    MODEL = load_model(str(model_dir / 'fraud_detector.pkl'))
-    SCALER = load_scaler(str(model_dir / 'scaler.pkl'))
-    FEATURE_NAMES = load_feature_names(str(model_dir / 'feature_names.pkl'))
+    # Scaler, feature order and model as one artifact (scaling fused for linear models)
+    PIPELINE = load_model_bundle(model_dir)
+    MODEL = PIPELINE.model
+    SCALER = PIPELINE.scaler
+    FEATURE_NAMES = PIPELINE.feature_names
     print("✅ Model loaded successfully!")
 except Exception as e:
     print(f"❌ Error loading model: {e}")
     print("Please train the model first using notebooks/02_Model_Training.ipynb")
+    PIPELINE = None
     MODEL = None
     SCALER = None
     FEATURE_NAMES = None
 
+# Live feature histograms of scored transactions, compared with training at /drift
+try:
+    MONITOR = DriftMonitor(load_drift_reference(model_dir), FEATURE_NAMES) if PIPELINE else None
+except FileNotFoundError as e:
+    print(f"⚠️  Drift monitoring disabled: {e}")
+    MONITOR = None
+
 
 # HTML template for API documentation
 API_DOCS = """
@@ -233,9 +263,12 @@ def health_check():
         'status': 'healthy',
         'model_loaded': MODEL is not None,
         'version': '1.0',
+        'velocity_store': VELOCITY.stats(),
+        'drift_monitor': MONITOR.stats() if MONITOR is not None else None,
         'endpoints': {
             'predict': '/predict (POST)',
             'batch_predict': '/predict/batch (POST)',
+            'drift': '/drift (GET)',
             'health': '/health (GET)'
         }
     })
@@ -259,7 +292,7 @@ def predict_single():
         JSON with prediction results
     """
     # Check if model is loaded
-    if MODEL is None:
+    if PIPELINE is None:
         return jsonify({
             'error': 'Model not loaded. Please train the model first.'
         }), 500
@@ -273,19 +306,19 @@ def predict_single():
                 'error': 'No transaction data provided'
             }), 400
         
-        # Preprocess transaction
-        features = preprocess_transaction(
-            transaction_data,
-            SCALER,
-            FEATURE_NAMES
-        )
+        features, velocity = add_velocity_features(transaction_data)
         
-        # Make prediction
-        prediction = MODEL.predict(features)[0]
-        probability = MODEL.predict_proba(features)[0, 1]
+        # Preprocess and score in one call
+        X = PIPELINE.to_matrix(features)
+        probability = float(PIPELINE.score_matrix(X)[0])
+        if MONITOR is not None:
+            MONITOR.observe(X)
+        prediction = int(probability >= PIPELINE.threshold)
         
         # Interpret results
-        result = interpret_prediction(prediction, probability)
+        result = interpret_prediction(prediction, probability, PIPELINE.threshold)
+        if velocity is not None:
+            result['velocity'] = velocity
         
         # Add transaction details to response
         result['transaction'] = transaction_data
@@ -315,7 +348,7 @@ def predict_batch():
         JSON with batch prediction results
     """
     # Check if model is loaded
-    if MODEL is None:
+    if PIPELINE is None:
         return jsonify({
             'error': 'Model not loaded. Please train the model first.'
         }), 500
@@ -336,21 +369,23 @@ def predict_batch():
                 'error': 'Transactions must be a list'
             }), 400
         
-        # Convert to DataFrame
-        df = pd.DataFrame(transactions)
-        
-        # Preprocess all transactions
-        features = preprocess_transaction(df, SCALER, FEATURE_NAMES)
+        # Velocity state is updated in request order
+        enriched = [add_velocity_features(t) for t in transactions]
         
-        # Make predictions
-        predictions = MODEL.predict(features)
-        probabilities = MODEL.predict_proba(features)[:, 1]
+        # Preprocess and score all transactions in one call
+        X = PIPELINE.to_matrix([features for features, _ in enriched])
+        probabilities = PIPELINE.score_matrix(X)
+        if MONITOR is not None:
+            MONITOR.observe(X)
+        predictions = (probabilities >= PIPELINE.threshold).astype(int)
         
         # Prepare results
         results = []
         for i, (pred, prob) in enumerate(zip(predictions, probabilities)):
-            result = interpret_prediction(pred, prob)
+            result = interpret_prediction(int(pred), float(prob), PIPELINE.threshold)
             result['transaction_index'] = i
+            if enriched[i][1] is not None:
+                result['velocity'] = enriched[i][1]
             results.append(result)
         
         # Calculate summary
@@ -373,6 +408,25 @@ def predict_batch():
         }), 500
 
 
+@app.route('/drift', methods=['GET'])
+def drift():
+    """
+    Feature drift of recently scored transactions
+    
+    Returns:
+        JSON with PSI and KS statistic per feature over the live window
+        and the features flagged as drifted
+    """
+    if MONITOR is None:
+        return jsonify({
+            'error': 'Drift monitoring not available. Retrain the model to save a drift reference.'
+        }), 503
+    
+    result = MONITOR.drift()
+    result['monitor'] = MONITOR.stats()
+    return jsonify(result)
+
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
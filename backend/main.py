@@ -7,6 +7,7 @@ This is the main FastAPI application that serves the ML model.
 Endpoints:
     - GET /: Health check
     - POST /predict: Fraud prediction endpoint
+    - GET /drift: Feature drift (PSI/KS) of recent traffic vs training
 """
 
 from fastapi import FastAPI, HTTPException
@@ -19,7 +20,7 @@ import logging
 from pathlib import Path
 
 # Import our custom model loader
-from model_loader import load_models, make_prediction
+from model_loader import load_pipeline, load_drift_monitor
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -46,11 +47,14 @@ app.add_middleware(
 
 # Load ML model on startup
 try:
-    model, scaler = load_models()
+    pipeline = load_pipeline()
     logger.info("✅ Model loaded successfully!")
 except Exception as e:
     logger.error(f"❌ Failed to load model: {e}")
-    model, scaler = None, None
+    pipeline = None
+
+# Live feature histograms of scored transactions, compared with training at /drift
+drift_monitor = load_drift_monitor(pipeline) if pipeline is not None else None
 
 
 # ============================================================================
@@ -141,11 +145,12 @@ async def root():
     return {
         "status": "active",
         "message": "AI Fraud Detection API is running",
-        "model_loaded": model is not None,
+        "model_loaded": pipeline is not None,
         "version": "1.0.0",
         "endpoints": {
             "docs": "/docs",
-            "predict": "/predict"
+            "predict": "/predict",
+            "drift": "/drift"
         }
     }
 
@@ -166,28 +171,19 @@ async def predict_fraud(transaction: TransactionRequest):
     """
     
     # Check if model is loaded
-    if model is None or scaler is None:
+    if pipeline is None:
         raise HTTPException(
             status_code=503,
             detail="Model not loaded. Please check server logs."
         )
     
     try:
-        # Convert request to feature array
-        features = [
-            transaction.Time,
-            transaction.V1, transaction.V2, transaction.V3, transaction.V4,
-            transaction.V5, transaction.V6, transaction.V7, transaction.V8,
-            transaction.V9, transaction.V10, transaction.V11, transaction.V12,
-            transaction.V13, transaction.V14, transaction.V15, transaction.V16,
-            transaction.V17, transaction.V18, transaction.V19, transaction.V20,
-            transaction.V21, transaction.V22, transaction.V23, transaction.V24,
-            transaction.V25, transaction.V26, transaction.V27, transaction.V28,
-            transaction.Amount
-        ]
-        
-        # Make prediction
-        prediction, fraud_prob = make_prediction(model, scaler, features)
+        # Preprocess and score in one call (pipeline knows the feature order)
+        X = pipeline.to_matrix(transaction.model_dump())
+        fraud_prob = float(pipeline.score_matrix(X)[0])
+        if drift_monitor is not None:
+            drift_monitor.observe(X)
+        prediction = int(fraud_prob >= pipeline.threshold)
         
         # Calculate metrics
         genuine_prob = (1 - fraud_prob) * 100
@@ -239,6 +235,29 @@ async def predict_fraud(transaction: TransactionRequest):
         )
 
 
+@app.get("/drift")
+async def feature_drift():
+    """
+    Feature drift of recently scored transactions.
+    
+    Returns:
+        PSI and KS statistic per feature over the live window and the
+        features flagged as drifted
+        
+    Raises:
+        HTTPException: If the model has no drift reference
+    """
+    if drift_monitor is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Drift monitoring not available. Retrain the model to save a drift reference."
+        )
+    
+    result = drift_monitor.drift()
+    result["monitor"] = drift_monitor.stats()
+    return result
+
+
 # ============================================================================
 # RUN SERVER
 # ============================================================================
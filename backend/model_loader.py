@@ -5,14 +5,23 @@ Handles loading and using the trained ML model.
 
 Functions:
     - load_models(): Load fraud detection model and scaler
+    - load_pipeline(): Load the fused preprocessing + model inference pipeline
+    - load_drift_monitor(): Live feature drift monitor for the pipeline's features
     - make_prediction(): Make fraud prediction for a transaction
 """
 
+import sys
 import joblib
 import numpy as np
 from pathlib import Path
 import logging
 
+# Share the inference pipeline implementation with src/
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from inference_pipeline import load_model_bundle  # type: ignore
+from drift_monitor import DriftMonitor, load_drift_reference  # type: ignore
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +66,53 @@ def load_models():
         raise
 
 
+def load_pipeline():
+    """
+    Load the inference pipeline (scaler + feature order + model).
+    
+    Uses inference_pipeline.pkl from backend/models/ when present and
+    otherwise assembles it from fraud_detector.pkl, scaler.pkl and
+    feature_names.pkl.
+    
+    Returns:
+        FraudInferencePipeline
+        
+    Raises:
+        FileNotFoundError: If model files are not found
+    """
+    model_dir = Path(__file__).parent / "models"
+    try:
+        pipeline = load_model_bundle(model_dir)
+    except FileNotFoundError as e:
+        logger.error(f"❌ Model files not found: {e}")
+        raise
+    
+    logger.info(f"✅ Inference pipeline loaded from {model_dir}"
+                f"{' (scaling fused into model)' if pipeline.is_fused else ''}")
+    return pipeline
+
+
+def load_drift_monitor(pipeline):
+    """
+    Create a drift monitor from the reference histograms in backend/models/.
+    
+    Args:
+        pipeline: Loaded FraudInferencePipeline (its feature order is observed)
+        
+    Returns:
+        DriftMonitor, or None if the model has no drift reference
+    """
+    model_dir = Path(__file__).parent / "models"
+    try:
+        reference = load_drift_reference(model_dir)
+    except FileNotFoundError as e:
+        logger.warning(f"⚠️ Drift monitoring disabled: {e}")
+        return None
+    
+    logger.info(f"✅ Drift reference loaded from {model_dir}")
+    return DriftMonitor(reference, pipeline.feature_names)
+
+
 def make_prediction(model, scaler, features):
     """
     Make a fraud prediction for a transaction.
@@ -0,0 +1,403 @@
+"""
+Performance Benchmark Suite
+Team: Three Unknowns (Yagnesh, Bhaskar, Syam) | VRSEC
+
+Times the scoring code paths end to end and gates on regressions against
+a stored baseline.
+
+Cases:
+    preprocess_transaction    - utils.preprocess_transaction (one dict)
+    make_prediction           - backend model_loader.make_prediction (one row)
+    detector_predict_single   - FraudDetector.predict_single
+    detector_predict_batch    - FraudDetector.predict_batch (--batch-size rows)
+    flask_predict             - Flask POST /predict through the test client
+    flask_predict_batch       - Flask POST /predict/batch (--batch-size rows)
+    fastapi_predict           - FastAPI POST /predict through the test client
+
+Each case is called until --min-time seconds have elapsed; latencies are
+per call. Baselines are machine-specific, so record the baseline on the
+machine that runs the comparison.
+
+Usage:
+    python run_benchmarks.py                                   # Run and print results
+    python run_benchmarks.py --output results.json             # Also save them as JSON
+    python run_benchmarks.py --save-baseline                   # Record benchmarks/baseline.json
+    python run_benchmarks.py --compare                         # Run and compare; exits 1 on regressions
+    python run_benchmarks.py --compare-files old.json new.json # Compare two saved runs
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import platform
+import argparse
+import warnings
+import importlib.util
+from contextlib import redirect_stdout
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / 'src'))
+sys.path.insert(0, str(ROOT / 'backend'))
+
+from utils import preprocess_transaction, summarize_latencies  # type: ignore
+from inference_pipeline import load_model_bundle  # type: ignore
+from drift_monitor import DriftMonitor, load_drift_reference  # type: ignore
+from predict import FraudDetector, bench_transactions  # type: ignore
+from model_loader import make_prediction  # type: ignore
+
+
+DEFAULT_MODEL_DIR = ROOT / 'backend' / 'models'
+DEFAULT_BASELINE = Path(__file__).resolve().parent / 'baseline.json'
+
+CASES = [
+    'preprocess_transaction',
+    'make_prediction',
+    'detector_predict_single',
+    'detector_predict_batch',
+    'flask_predict',
+    'flask_predict_batch',
+    'fastapi_predict'
+]
+
+# Latency percentiles checked by compare_benchmarks() (lower is better)
+GATED_METRICS = ['p50_us', 'p95_us']
+
+# Calls per case before timing starts, and minimum timed calls
+WARMUP_CALLS = 20
+MIN_CALLS = 10
+
+
+def _load_script(name: str, path: Path):
+    """Import a script that is not on a package path (api/app.py, backend/main.py)."""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _drift_monitor(model_dir: Path, pipeline):
+    """Drift monitor the servers would run with this model, or None."""
+    try:
+        return DriftMonitor(load_drift_reference(model_dir), pipeline.feature_names)
+    except FileNotFoundError:
+        return None
+
+
+def _check_response(response):
+    """Fail the benchmark instead of timing error responses."""
+    if response.status_code != 200:
+        raise RuntimeError(f"Benchmark request failed with HTTP {response.status_code}")
+    return response
+
+
+def build_cases(model_dir: Path, batch_size: int = 100, seed: int = 42) -> tuple:
+    """
+    Create one zero-argument callable per benchmark case.
+
+    The Flask app and the FastAPI backend load their models from fixed
+    directories at import time; both are pointed at `model_dir` here so
+    every case scores with the same model.
+
+    Args:
+        model_dir: Model directory shared by all cases
+        batch_size: Transactions per batch case
+        seed: Random seed for the synthetic transactions
+
+    Returns:
+        Tuple of (case name -> (callable, rows per call), FraudDetector)
+    """
+    pipeline = load_model_bundle(model_dir)
+    detector = FraudDetector(model_dir)
+
+    transactions = bench_transactions(batch_size, pipeline.feature_names, seed=seed)
+    records = transactions.to_dict(orient='records')
+    record = records[0]
+    row = [record[name] for name in pipeline.feature_names]
+
+    flask_app = _load_script('benchmark_flask_app', ROOT / 'api' / 'app.py')
+    flask_app.PIPELINE = pipeline
+    flask_app.MODEL = pipeline.model
+    flask_app.MONITOR = _drift_monitor(model_dir, pipeline)
+    flask_client = flask_app.app.test_client()
+
+    from fastapi.testclient import TestClient
+    fastapi_app = _load_script('benchmark_fastapi_app', ROOT / 'backend' / 'main.py')
+    fastapi_app.pipeline = pipeline
+    fastapi_app.drift_monitor = _drift_monitor(model_dir, pipeline)
+    fastapi_client = TestClient(fastapi_app.app)
+
+    cases = {
+        'preprocess_transaction': (
+            lambda: preprocess_transaction(record, pipeline.scaler, pipeline.feature_names), 1
+        ),
+        'make_prediction': (
+            lambda: make_prediction(pipeline.model, pipeline.scaler, row), 1
+        ),
+        'detector_predict_single': (
+            lambda: detector.predict_single(record, verbose=False), 1
+        ),
+        'detector_predict_batch': (
+            lambda: detector.predict_batch(transactions, output_mode='separate'), batch_size
+        ),
+        'flask_predict': (
+            lambda: _check_response(flask_client.post('/predict', json=record)), 1
+        ),
+        'flask_predict_batch': (
+            lambda: _check_response(
+                flask_client.post('/predict/batch', json={'transactions': records})
+            ),
+            batch_size
+        ),
+        'fastapi_predict': (
+            lambda: _check_response(fastapi_client.post('/predict', json=record)), 1
+        )
+    }
+    return cases, detector
+
+
+def time_case(func, rows_per_call: int = 1, min_time: float = 0.5) -> dict:
+    """
+    Call `func` repeatedly and summarize the per-call latency.
+
+    Args:
+        func: Zero-argument callable
+        rows_per_call: Transactions scored per call (for rows/s)
+        min_time: Minimum total measured time (seconds)
+
+    Returns:
+        Latency summary (see summarize_latencies) plus rows per call and
+        rows per second at the median latency
+    """
+    for _ in range(WARMUP_CALLS):
+        func()
+
+    samples_ns = []
+    elapsed_ns = 0
+    while elapsed_ns < min_time * 1e9 or len(samples_ns) < MIN_CALLS:
+        t0 = time.perf_counter_ns()
+        func()
+        duration = time.perf_counter_ns() - t0
+        samples_ns.append(duration)
+        elapsed_ns += duration
+
+    result = summarize_latencies(samples_ns)
+    result['rows_per_call'] = rows_per_call
+    result['rows_per_second'] = round(rows_per_call * 1e9 / float(np.median(samples_ns)), 1)
+    return result
+
+
+def run_benchmarks(
+    model_dir: Path = DEFAULT_MODEL_DIR,
+    cases: list = None,
+    batch_size: int = 100,
+    min_time: float = 0.5,
+    seed: int = 42
+) -> dict:
+    """
+    Run the benchmark suite.
+
+    Console output of the code under test (batch summaries, request logs)
+    is discarded while timing, so terminal speed does not leak into the
+    numbers. sklearn's "X does not have valid feature names" warning, raised
+    by make_prediction() on its plain feature list, is silenced for the same
+    reason.
+
+    Args:
+        model_dir: Model directory shared by all cases
+        cases: Case names to run (default: all)
+        batch_size: Transactions per batch case
+        min_time: Minimum measured time per case (seconds)
+        seed: Random seed for the synthetic transactions
+
+    Returns:
+        JSON-serializable dictionary with per-case results and environment metadata
+    """
+    import sklearn
+
+    cases = cases or CASES
+    logging.disable(logging.INFO)
+    try:
+        with open(os.devnull, 'w') as devnull:
+            with redirect_stdout(devnull):
+                callables, detector = build_cases(Path(model_dir), batch_size, seed)
+
+            results = {}
+            for name in cases:
+                func, rows = callables[name]
+                with redirect_stdout(devnull), warnings.catch_warnings():
+                    warnings.filterwarnings(
+                        'ignore', message='X does not have valid feature names', category=UserWarning
+                    )
+                    results[name] = time_case(func, rows, min_time)
+                print(f"   {name:<26} p50 {results[name]['p50_us']:>10,.1f} µs | "
+                      f"p95 {results[name]['p95_us']:>10,.1f} µs | "
+                      f"{results[name]['rows_per_second']:>12,.0f} rows/s")
+    finally:
+        logging.disable(logging.NOTSET)
+
+    return {
+        'benchmark': 'suite',
+        'created_at': pd.Timestamp.now().isoformat(),
+        'model': {
+            'dir': str(model_dir),
+            'type': type(detector.model).__name__,
+            'fused': detector.pipeline.is_fused,
+            'checksum': detector.model_checksum(),
+            'n_features': len(detector.feature_names)
+        },
+        'settings': {
+            'batch_size': batch_size,
+            'min_time': min_time,
+            'seed': seed
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'scikit_learn': sklearn.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count()
+        },
+        'cases': results
+    }
+
+
+def compare_benchmarks(
+    old: dict,
+    new: dict,
+    tolerance: float = 0.2,
+    min_us: float = 5.0
+) -> pd.DataFrame:
+    """
+    Compare two benchmark runs case by case and flag regressions.
+
+    A case regresses when a gated latency percentile (p50, p95) grows by
+    more than `tolerance` (relative) and by more than `min_us`, which
+    keeps microsecond-scale cases from flapping.
+
+    Args:
+        old: Baseline results (see run_benchmarks)
+        new: Candidate results
+        tolerance: Allowed relative increase (0.2 = +20%)
+        min_us: Ignore latency increases smaller than this (microseconds)
+
+    Returns:
+        DataFrame with one row per case
+    """
+    old_cases, new_cases = old['cases'], new['cases']
+    names = list(new_cases) + [name for name in old_cases if name not in new_cases]
+
+    rows = []
+    for name in names:
+        before, after = old_cases.get(name, {}), new_cases.get(name, {})
+        row = {'Case': name}
+        regressions = []
+        for metric in GATED_METRICS:
+            label = metric.split('_')[0]
+            b, a = before.get(metric), after.get(metric)
+            relative = None
+            if b is not None and a is not None:
+                delta = a - b
+                relative = delta / b if b > 0 else (float('inf') if delta > 0 else 0.0)
+                if delta > min_us and relative > tolerance:
+                    regressions.append(label)
+            row[f'{label} old (µs)'] = b
+            row[f'{label} new (µs)'] = a
+            row[f'{label} Δ%'] = None if relative is None else round(100 * relative, 1)
+        row['Rows/s new'] = after.get('rows_per_second')
+        row['Regression'] = ', '.join(regressions)
+        rows.append(row)
+
+    df_diff = pd.DataFrame(rows)
+
+    print(f"\n📊 Benchmark diff (tolerance +{tolerance:.0%}, floor {min_us:g} µs):")
+    changed = [key for key in ('processor', 'cpu_count', 'python', 'numpy', 'scikit_learn')
+               if old.get('environment', {}).get(key) != new.get('environment', {}).get(key)]
+    if changed:
+        print(f"   ⚠️  Environment differs from the baseline ({', '.join(changed)}); "
+              "numbers may not be comparable")
+    if old.get('model', {}).get('checksum') != new.get('model', {}).get('checksum'):
+        print("   ℹ️  Model artifacts differ from the baseline")
+    print(df_diff.to_string(index=False))
+
+    regressed = df_diff.loc[df_diff['Regression'] != '', 'Case'].tolist()
+    if regressed:
+        print(f"\n⚠️  Regressions in: {', '.join(regressed)}")
+    else:
+        print("\n✅ No regressions beyond tolerance")
+
+    return df_diff
+
+
+def _save_json(results: dict, path: Path):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Benchmark results saved to: {path}")
+
+
+def _load_json(path: Path) -> dict:
+    if not Path(path).exists():
+        raise SystemExit(f"❌ Benchmark results not found: {path}")
+    with open(path) as f:
+        return json.load(f)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the scoring paths and gate on regressions',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python run_benchmarks.py --save-baseline                  # On the reference machine
+  python run_benchmarks.py --compare --tolerance 0.2        # Exits 1 on regressions
+  python run_benchmarks.py --cases flask_predict fastapi_predict --min-time 2
+        """
+    )
+    parser.add_argument('--model-dir', type=str, help='Model directory (default: backend/models/)')
+    parser.add_argument('--cases', nargs='+', choices=CASES, help='Cases to run (default: all)')
+    parser.add_argument('--batch-size', type=int, default=100, help='Transactions per batch case')
+    parser.add_argument('--min-time', type=float, default=0.5, help='Minimum timed seconds per case')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the transactions')
+    parser.add_argument('--output', type=str, help='Save the results to this JSON file')
+    parser.add_argument('--baseline', type=str, default=str(DEFAULT_BASELINE),
+                        help='Baseline JSON (default: benchmarks/baseline.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Save the results as the baseline')
+    parser.add_argument('--compare', action='store_true',
+                        help='Compare the results with the baseline; exits 1 on regressions')
+    parser.add_argument('--compare-files', nargs=2, metavar=('OLD', 'NEW'),
+                        help='Compare two saved runs without benchmarking; exits 1 on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed relative latency increase (default: 0.2 = +20%%)')
+    parser.add_argument('--min-us', type=float, default=5.0,
+                        help='Ignore latency increases below this many microseconds')
+    args = parser.parse_args()
+
+    if args.compare_files:
+        old, new = (_load_json(Path(path)) for path in args.compare_files)
+    else:
+        if args.compare:
+            old = _load_json(Path(args.baseline))
+
+        print("\n" + "=" * 70)
+        print("PERFORMANCE BENCHMARK SUITE")
+        print("=" * 70)
+        model_dir = Path(args.model_dir) if args.model_dir else DEFAULT_MODEL_DIR
+        print(f"\n⏱️  Model: {model_dir} | batch size {args.batch_size} | "
+              f"≥{args.min_time:g}s per case\n")
+        new = run_benchmarks(model_dir, args.cases, args.batch_size, args.min_time, args.seed)
+
+        if args.output:
+            _save_json(new, Path(args.output))
+        if args.save_baseline:
+            _save_json(new, Path(args.baseline))
+
+    if args.compare or args.compare_files:
+        df_diff = compare_benchmarks(old, new, tolerance=args.tolerance, min_us=args.min_us)
+        raise SystemExit(1 if (df_diff['Regression'] != '').any() else 0)
@@ -0,0 +1,405 @@
+"""
+Drift Monitor Module
+====================
+Detects when the features seen in serving drift away from training.
+
+At training time build_drift_reference() bins every feature at quantiles
+of the training data and stores the per-bin counts with the model
+(drift_reference.json). In serving, DriftMonitor.observe() only appends
+the scored matrix to a lock-sharded list; once a shard holds enough rows
+each feature column is sorted once and the bin edges are located in it
+with searchsorted. Scored batches cost well under a microsecond per row;
+a one-row call costs about a microsecond, nearly all of it fixed Python
+overhead (the call, the shard lock and concatenating one-row arrays).
+Shard counts are merged periodically into time slices, and drift()
+compares the live histograms of the recent slices with the reference
+using the Population Stability Index (PSI) and a binned
+Kolmogorov-Smirnov statistic.
+
+Author: Team Three Unknowns
+Date: January 2026
+"""
+
+import json
+import itertools
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+
+DRIFT_REFERENCE_FILENAME = 'drift_reference.json'
+
+# Decile bins per feature, as usual for PSI (fewer for features with repeated values)
+DEFAULT_BINS = 10
+
+# Rows used to place the quantile edges; counts always use every row
+REFERENCE_SAMPLE_ROWS = 1_000_000
+
+# PSI rule of thumb: < 0.1 stable, 0.1-0.25 moderate shift, >= 0.25 drift
+PSI_MODERATE = 0.1
+PSI_DRIFT = 0.25
+
+# Live rows needed before a feature's drift status is reported
+MIN_LIVE_ROWS = 500
+
+# Smoothing for empty bins in PSI (proportion added to every bin)
+PSI_EPSILON = 1e-4
+
+
+def build_drift_reference(
+    X,
+    feature_names: List[str],
+    rows: np.ndarray = None,
+    n_bins: int = DEFAULT_BINS,
+    chunk_size: int = 1_000_000,
+    random_state: int = 42
+) -> dict:
+    """
+    Reference histograms of the training features.
+
+    Args:
+        X: Raw (unscaled) training features: DataFrame with the named
+            columns, or an array/memmap with columns in feature_names order
+        feature_names: Features to monitor
+        rows: Row positions of the training split (default: all rows)
+        n_bins: Quantile bins per feature
+        chunk_size: Rows counted at a time (memmaps are read in chunks)
+        random_state: Seed for the edge sample
+
+    Returns:
+        Dictionary with feature names, interior bin edges, counts per bin
+        and the number of rows
+    """
+    n_rows = len(rows) if rows is not None else len(X)
+    rng = np.random.default_rng(random_state)
+    sample = None
+    if n_rows > REFERENCE_SAMPLE_ROWS:
+        sample = np.sort(rng.choice(n_rows, REFERENCE_SAMPLE_ROWS, replace=False))
+
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    edges, counts = [], []
+    for j, name in enumerate(feature_names):
+        column = X[name].to_numpy() if isinstance(X, pd.DataFrame) else X[:, j]
+        if rows is not None:
+            column = column[rows]
+
+        values = column if sample is None else column[sample]
+        feature_edges = np.unique(np.quantile(np.asarray(values, dtype=np.float64), quantiles))
+
+        feature_counts = np.zeros(len(feature_edges) + 1, dtype=np.int64)
+        for start in range(0, n_rows, chunk_size):
+            chunk = np.asarray(column[start:start + chunk_size], dtype=np.float64)
+            feature_counts += np.bincount(
+                np.searchsorted(feature_edges, chunk, side='right'),
+                minlength=len(feature_counts)
+            )
+
+        edges.append(feature_edges.tolist())
+        counts.append(feature_counts.tolist())
+
+    return {
+        'feature_names': list(feature_names),
+        'edges': edges,
+        'counts': counts,
+        'n_rows': int(n_rows)
+    }
+
+
+def save_drift_reference(reference: dict, model_dir: Union[str, Path]) -> Path:
+    """Save reference histograms next to the model."""
+    path = Path(model_dir) / DRIFT_REFERENCE_FILENAME
+    with open(path, 'w') as f:
+        json.dump(reference, f)
+    print(f"💾 Drift reference saved to: {path} ({len(reference['feature_names'])} features)")
+    return path
+
+
+def load_drift_reference(model_dir: Union[str, Path]) -> dict:
+    """
+    Load reference histograms saved with a model.
+
+    Raises:
+        FileNotFoundError: If the model has no drift reference
+    """
+    path = Path(model_dir) / DRIFT_REFERENCE_FILENAME
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Drift reference not found at {path}. Retrain the model to create it."
+        )
+    with open(path) as f:
+        return json.load(f)
+
+
+class _Shard:
+    """Pending rows and bin counts owned by a subset of serving threads."""
+
+    __slots__ = ('lock', 'rows', 'pending', 'counts', 'observed')
+
+    def __init__(self, counts_shape: tuple):
+        self.lock = threading.Lock()
+        self.rows = []
+        self.pending = 0
+        self.counts = np.zeros(counts_shape, dtype=np.int64)
+        self.observed = 0
+
+
+class DriftMonitor:
+    """
+    Rolling live feature histograms compared with the training reference.
+
+    Example:
+        >>> monitor = DriftMonitor(load_drift_reference('models/'), pipeline.feature_names)
+        >>> X = pipeline.to_matrix(transactions)
+        >>> monitor.observe(X)
+        >>> monitor.drift()['features']['Amount']
+        {'psi': 0.013, 'ks': 0.021, 'status': 'stable'}
+    """
+
+    def __init__(
+        self,
+        reference: dict,
+        feature_names: List[str] = None,
+        n_shards: int = 8,
+        buffer_rows: int = 1024,
+        window_seconds: float = 3600.0,
+        slice_seconds: float = 300.0,
+        merge_interval: float = 10.0
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            reference: Output of build_drift_reference()
+            feature_names: Column order of the matrices passed to observe()
+                (default: the reference order); features without a
+                reference are ignored
+            n_shards: Independent locks/buffers (each thread is given one
+                round-robin on its first observe())
+            buffer_rows: Rows a shard collects before binning them
+            window_seconds: Live window compared with the reference
+            slice_seconds: Time granularity of the rolling window
+            merge_interval: Seconds between merges of shard counts
+        """
+        feature_names = list(feature_names or reference['feature_names'])
+        monitored = [name for name in reference['feature_names'] if name in feature_names]
+        if not monitored:
+            raise ValueError("None of the reference features are in feature_names")
+
+        position = {name: i for i, name in enumerate(reference['feature_names'])}
+        self.feature_names = monitored
+        self.columns = np.array([feature_names.index(name) for name in monitored])
+        self._all_columns = np.array_equal(self.columns, np.arange(len(feature_names)))
+
+        self.edges = [np.asarray(reference['edges'][position[name]], dtype=np.float64) for name in monitored]
+        self.n_bins = max(len(e) for e in self.edges) + 1
+        self.reference_counts = np.zeros((len(monitored), self.n_bins), dtype=np.int64)
+        for k, name in enumerate(monitored):
+            ref = reference['counts'][position[name]]
+            self.reference_counts[k, :len(ref)] = ref
+
+        self.buffer_rows = buffer_rows
+        self.window_seconds = window_seconds
+        self.slice_seconds = slice_seconds
+        self.merge_interval = merge_interval
+
+        self._shards = [_Shard(self.reference_counts.shape) for _ in range(n_shards)]
+        self._n_shards = n_shards
+        self._next_shard = itertools.count()  # next() is atomic under the GIL
+        self._local = threading.local()
+        self._slices = deque()  # (slice start, counts), oldest first
+        self._merge_lock = threading.Lock()
+        self._last_merge = time.monotonic()
+
+    def observe(self, X: np.ndarray):
+        """
+        Record scored rows (hot path: a list append, binning is deferred).
+
+        The per-call cost is fixed, so pass whole scored batches where
+        possible: ~0.3 µs per row at 100 rows per call versus ~1 µs for a
+        single row on a Xeon server (absolute figures vary by machine).
+
+        Args:
+            X: Raw feature matrix in feature_names order, e.g. from
+                FraudInferencePipeline.to_matrix(); it is kept by reference
+                until binned, so do not modify it afterwards
+        """
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            # Thread idents are aligned addresses, so ident % n would put
+            # every thread on the same shard; hand out shards in turn instead
+            shard = self._local.shard = self._shards[next(self._next_shard) % self._n_shards]
+        lock = shard.lock
+        lock.acquire()  # Cheaper than a with-block on this path
+        try:
+            shard.rows.append(X)
+            shard.pending += len(X)
+            if shard.pending < self.buffer_rows:
+                return
+            self._flush(shard)
+        finally:
+            lock.release()
+
+        if time.monotonic() - self._last_merge >= self.merge_interval:
+            self.merge()
+
+    def _flush(self, shard: _Shard):
+        """
+        Bin a shard's pending rows (caller holds shard.lock).
+
+        Each feature column is sorted once; the number of values below
+        every edge is then a searchsorted, and bin counts are differences.
+        """
+        if not shard.pending:
+            return
+        X = shard.rows[0] if len(shard.rows) == 1 else np.concatenate(shard.rows)
+        # Sort each feature as a contiguous row (sorting strided columns is slower)
+        columns = np.ascontiguousarray(X.T if self._all_columns else X[:, self.columns].T)
+        columns.sort(axis=1)
+
+        # below[k, j]: values of feature k under its j-th edge (padding: all)
+        n = len(X)
+        below = np.full((len(self.edges), self.n_bins + 1), n, dtype=np.int64)
+        below[:, 0] = 0
+        for k, edges in enumerate(self.edges):
+            below[k, 1:len(edges) + 1] = np.searchsorted(columns[k], edges, side='left')
+        shard.counts += np.diff(below, axis=1)
+
+        shard.observed += n
+        shard.rows = []
+        shard.pending = 0
+
+    def merge(self, flush: bool = False):
+        """
+        Move shard counts into the current time slice and drop old slices.
+
+        Shard locks are taken one at a time, so serving threads are only
+        blocked for the copy of their own shard.
+
+        Args:
+            flush: Also bin rows still pending in shards
+        """
+        if not self._merge_lock.acquire(blocking=flush):
+            return  # Another thread is merging
+        try:
+            now = time.time()
+            slice_start = now - now % self.slice_seconds
+            if not self._slices or self._slices[-1][0] != slice_start:
+                self._slices.append((slice_start, np.zeros_like(self.reference_counts)))
+            current = self._slices[-1][1]
+
+            for shard in self._shards:
+                with shard.lock:
+                    if flush:
+                        self._flush(shard)
+                    current += shard.counts
+                    shard.counts[:] = 0
+
+            while self._slices and self._slices[0][0] + self.slice_seconds <= now - self.window_seconds:
+                self._slices.popleft()
+            self._last_merge = time.monotonic()
+        finally:
+            self._merge_lock.release()
+
+    def live_counts(self) -> np.ndarray:
+        """Live bin counts over the window, shape (n_features, n_bins)."""
+        self.merge(flush=True)
+        cutoff = time.time() - self.window_seconds
+        total = np.zeros_like(self.reference_counts)
+        for slice_start, counts in list(self._slices):
+            if slice_start + self.slice_seconds > cutoff:
+                total += counts
+        return total
+
+    def drift(self) -> dict:
+        """
+        PSI and binned KS statistic per feature over the live window.
+
+        Returns:
+            Dictionary with the live row count, per-feature scores and
+            status ('stable', 'moderate', 'drift' or 'insufficient data'),
+            and the features at 'drift'
+        """
+        live = self.live_counts()
+        n_live = int(live[0].sum())
+
+        expected = self.reference_counts / np.maximum(self.reference_counts.sum(axis=1, keepdims=True), 1)
+        actual = live / max(n_live, 1)
+
+        smoothed_e = expected + PSI_EPSILON
+        smoothed_a = actual + PSI_EPSILON
+        psi = ((smoothed_a - smoothed_e) * np.log(smoothed_a / smoothed_e)).sum(axis=1)
+        ks = np.abs(np.cumsum(actual, axis=1) - np.cumsum(expected, axis=1)).max(axis=1)
+
+        features = {}
+        for name, feature_psi, feature_ks in zip(self.feature_names, psi, ks):
+            if n_live < MIN_LIVE_ROWS:
+                status = 'insufficient data'
+            elif feature_psi >= PSI_DRIFT:
+                status = 'drift'
+            elif feature_psi >= PSI_MODERATE:
+                status = 'moderate'
+            else:
+                status = 'stable'
+            features[name] = {
+                'psi': round(float(feature_psi), 4),
+                'ks': round(float(feature_ks), 4),
+                'status': status
+            }
+
+        return {
+            'n_live': n_live,
+            'window_seconds': self.window_seconds,
+            'max_psi': round(float(psi.max()), 4) if n_live else 0.0,
+            'drifted_features': [name for name, f in features.items() if f['status'] == 'drift'],
+            'features': features
+        }
+
+    def stats(self) -> Dict:
+        """Observed rows (in total and per shard), rows waiting to be binned and live slices."""
+        shard_rows = [shard.observed + shard.pending for shard in self._shards]
+        return {
+            'observed': sum(shard_rows),
+            'pending': sum(shard.pending for shard in self._shards),
+            'shard_rows': shard_rows,
+            'slices': len(self._slices),
+            'features': len(self.feature_names)
+        }
+
+
+if __name__ == '__main__':
+    # Self-check: concurrent observers spread over the shards and no row is lost
+    print("Testing drift monitor...")
+
+    rng = np.random.default_rng(42)
+    names = [f'V{i}' for i in range(1, 6)]
+    monitor = DriftMonitor(
+        build_drift_reference(pd.DataFrame(rng.normal(size=(20_000, 5)), columns=names), names),
+        n_shards=4
+    )
+    rows = rng.normal(size=(8_000, 5))
+    start = threading.Barrier(4)
+
+    def observe_rows(offset: int):
+        start.wait()
+        for i in range(offset, offset + 2_000, 10):
+            monitor.observe(rows[i:i + 10])
+
+    threads = [threading.Thread(target=observe_rows, args=(k * 2_000,)) for k in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = monitor.stats()
+    print(f"\nRows per shard: {stats['shard_rows']}")
+    assert stats['shard_rows'] == [2_000] * 4, "observer threads share a shard"
+    monitor.merge(flush=True)
+    assert int(monitor.live_counts()[0].sum()) == len(rows), "rows lost while merging"
+
+    print("\n✅ Drift monitor working correctly!")
@@ -11,6 +11,8 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 from sklearn.metrics import (
     classification_report, 
     confusion_matrix, 
@@ -19,9 +21,48 @@ from sklearn.metrics import (
     precision_recall_curve,
     average_precision_score
 )
+import os
+import json
+import time
+import base64
+import html
+import tempfile
 import joblib
+from joblib import Parallel, delayed
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
+from typing import Dict, Union
 
+from inference_pipeline import (
+    FraudInferencePipeline, PIPELINE_FILENAME, DECISION_THRESHOLD_FILENAME,
+    load_decision_threshold, load_model_bundle
+)
+from utils import summarize_latencies, write_json_atomic
+
+
+# Default misclassification costs for the cost-optimal threshold: a missed
+# fraud (chargeback + loss) costs far more than reviewing a false alert
+DEFAULT_FP_COST = 1.0
+DEFAULT_FN_COST = 25.0
+
+# Report figures are rendered at a screen resolution; curves are thinned to
+# at most REPORT_CURVE_POINTS points before plotting
+REPORT_DPI = 120
+REPORT_CURVE_POINTS = 2000
+
+# Bootstrap replicates are drawn BOOTSTRAP_BATCH_SIZE at a time as rows of
+# one weight matrix (memory: batch size x test rows x 8 bytes)
+DEFAULT_N_BOOTSTRAP = 1000
+BOOTSTRAP_BATCH_SIZE = 100
+BOOTSTRAP_METRICS = ['ROC-AUC', 'PR-AUC', 'Precision', 'Recall']
+
+# Model comparison: single-row scoring calls timed per bundle
+COMPARE_SINGLE_ROWS = 200
+
+# Streaming evaluation: score histogram resolution and time bucket length
+STREAM_BINS = 1000
+STREAM_BUCKET_SECONDS = 3600
 
 class FraudModelEvaluator:
     """
@@ -37,6 +78,8 @@ class FraudModelEvaluator:
         """
         self.model = None
         self.scaler = None
+        self.model_dir = None
+        self.optimal_threshold = None
         
         if model_path:
             self.load_model(model_path)
@@ -49,6 +92,7 @@ class FraudModelEvaluator:
             model_dir: Directory containing model files
         """
         model_dir = Path(model_dir)
+        self.model_dir = model_dir
         
         # Load model
         model_path = model_dir / 'fraud_detector.pkl'
@@ -87,7 +131,7 @@ class FraudModelEvaluator:
         
         return df_report
     
-    def plot_confusion_matrix(self, y_true, y_pred, save_path: str = None):
+    def plot_confusion_matrix(self, y_true, y_pred, save_path: str = None, show: bool = True):
         """
         Plot and optionally save confusion matrix.
         
@@ -95,29 +139,14 @@ class FraudModelEvaluator:
             y_true: True labels
             y_pred: Predicted labels
             save_path: Path to save figure (optional)
+            show: Display the figure (False for headless runs)
         """
         cm = confusion_matrix(y_true, y_pred)
         
-        plt.figure(figsize=(8, 6))
-        sns.heatmap(
-            cm, 
-            annot=True, 
-            fmt='d', 
-            cmap='Blues',
-            xticklabels=['Genuine', 'Fraud'],
-            yticklabels=['Genuine', 'Fraud']
-        )
-        plt.title('Confusion Matrix - Fraud Detection', fontsize=14, fontweight='bold')
-        plt.ylabel('Actual', fontsize=12)
-        plt.xlabel('Predicted', fontsize=12)
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"💾 Confusion matrix saved to: {save_path}")
-        
-        plt.show()
+        fig = _draw_figure('confusion_matrix', cm)
+        _finish_figure(fig, save_path, show, 'Confusion matrix')
     
-    def plot_roc_curve(self, y_true, y_pred_proba, save_path: str = None):
+    def plot_roc_curve(self, y_true, y_pred_proba, save_path: str = None, show: bool = True):
         """
         Plot ROC curve.
         
@@ -125,31 +154,16 @@ class FraudModelEvaluator:
             y_true: True labels
             y_pred_proba: Predicted probabilities for positive class
             save_path: Path to save figure (optional)
+            show: Display the figure (False for headless runs)
         """
         # Calculate ROC curve
         fpr, tpr, thresholds = roc_curve(y_true, y_pred_proba)
         roc_auc = roc_auc_score(y_true, y_pred_proba)
         
-        # Plot
-        plt.figure(figsize=(10, 6))
-        plt.plot(fpr, tpr, color='darkblue', lw=2, label=f'ROC Curve (AUC = {roc_auc:.4f})')
-        plt.plot([0, 1], [0, 1], color='gray', lw=1, linestyle='--', label='Random Classifier')
-        
-        plt.xlim([0.0, 1.0])
-        plt.ylim([0.0, 1.05])
-        plt.xlabel('False Positive Rate', fontsize=12)
-        plt.ylabel('True Positive Rate (Recall)', fontsize=12)
-        plt.title('ROC Curve - Fraud Detection Model', fontsize=14, fontweight='bold')
-        plt.legend(loc='lower right', fontsize=11)
-        plt.grid(alpha=0.3)
-        
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"💾 ROC curve saved to: {save_path}")
-        
-        plt.show()
+        fig = _draw_figure('roc', fpr, tpr, roc_auc)
+        _finish_figure(fig, save_path, show, 'ROC curve')
     
-    def plot_precision_recall_curve(self, y_true, y_pred_proba, save_path: str = None):
+    def plot_precision_recall_curve(self, y_true, y_pred_proba, save_path: str = None, show: bool = True):
         """
         Plot Precision-Recall curve.
         
@@ -157,44 +171,257 @@ class FraudModelEvaluator:
             y_true: True labels
             y_pred_proba: Predicted probabilities
             save_path: Path to save figure (optional)
+            show: Display the figure (False for headless runs)
         """
         precision, recall, thresholds = precision_recall_curve(y_true, y_pred_proba)
         avg_precision = average_precision_score(y_true, y_pred_proba)
         
-        plt.figure(figsize=(10, 6))
-        plt.plot(recall, precision, color='darkgreen', lw=2, 
-                label=f'PR Curve (AP = {avg_precision:.4f})')
+        fig = _draw_figure('precision_recall', recall, precision, avg_precision)
+        _finish_figure(fig, save_path, show, 'PR curve')
+    
+    def threshold_sweep(
+        self,
+        y_true,
+        y_pred_proba,
+        fp_cost: float = DEFAULT_FP_COST,
+        fn_cost: float = DEFAULT_FN_COST
+    ) -> pd.DataFrame:
+        """
+        Exact metrics at every distinct threshold in one pass.
+        
+        Scores are sorted once and TP/FP counts accumulated, so all
+        thresholds cost O(n log n) instead of one confusion matrix each.
+        A transaction is flagged when its probability is >= Threshold; the
+        first row flags nothing.
+        
+        Args:
+            y_true: True labels
+            y_pred_proba: Predicted probabilities
+            fp_cost: Cost of one false alert
+            fn_cost: Cost of one missed fraud
+            
+        Returns:
+            DataFrame with counts, Precision, Recall, F1-Score, FPR and Cost
+            per threshold (descending thresholds)
+            
+        Raises:
+            ValueError: If there are no scores to sweep
+        """
+        if len(y_pred_proba) == 0:
+            raise ValueError("Cannot sweep thresholds over an empty set of scores")
+        thresholds, tp, fp = _sorted_cumulative_counts(y_true, y_pred_proba)
         
-        plt.xlabel('Recall', fontsize=12)
-        plt.ylabel('Precision', fontsize=12)
-        plt.title('Precision-Recall Curve', fontsize=14, fontweight='bold')
-        plt.legend(loc='upper right', fontsize=11)
-        plt.grid(alpha=0.3)
+        # Prepend "flag nothing" so the sweep covers every possible decision
+        thresholds = np.concatenate(([np.nextafter(thresholds[0], np.inf)], thresholds))
+        return _sweep_frame(thresholds, np.concatenate(([0], tp)), np.concatenate(([0], fp)), fp_cost, fn_cost)
+    
+    def find_optimal_threshold(
+        self,
+        y_true,
+        y_pred_proba,
+        fp_cost: float = DEFAULT_FP_COST,
+        fn_cost: float = DEFAULT_FN_COST,
+        sweep: pd.DataFrame = None
+    ) -> dict:
+        """
+        Cost-optimal decision threshold from an exact threshold sweep.
         
-        if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"💾 PR curve saved to: {save_path}")
+        Every threshold between two adjacent scores gives the same decisions,
+        and neighbouring cutoffs often tie on cost. The threshold returned is
+        the midpoint of the minimum-cost range, not one of its ends, so it
+        does not sit exactly on a score seen here. Tune it on validation
+        rows rather than on the test rows whose metrics are reported.
         
-        plt.show()
+        Args:
+            y_true: True labels
+            y_pred_proba: Predicted probabilities
+            fp_cost: Cost of one false alert
+            fn_cost: Cost of one missed fraud
+            sweep: threshold_sweep() output for the same costs, if already computed
+            
+        Returns:
+            Dictionary with the threshold, its cost and metrics, and the costs used
+        """
+        if sweep is None:
+            sweep = self.threshold_sweep(y_true, y_pred_proba, fp_cost, fn_cost)
+        
+        thresholds = sweep['Threshold'].to_numpy()
+        costs = sweep['Cost'].to_numpy()
+        first = int(costs.argmin())
+        last = first
+        while last + 1 < len(costs) and costs[last + 1] == costs[first]:
+            last += 1
+        
+        # Thresholds in (thresholds[last + 1], thresholds[first]] all have the
+        # minimum cost (row 0 flags nothing, so it extends up to 1.0)
+        upper = thresholds[first] if first > 0 else max(thresholds[0], 1.0)
+        lower = thresholds[last + 1] if last + 1 < len(thresholds) else 0.0
+        threshold = (upper + lower) / 2
+        if not lower < threshold <= upper:
+            threshold = thresholds[first]  # No representable midpoint
+        best = sweep.iloc[_sweep_index(thresholds, threshold)]
+        at_default = sweep.iloc[_sweep_index(thresholds, 0.5)]
+        
+        result = {
+            'threshold': float(threshold),
+            'cost': float(best['Cost']),
+            'cost_at_0.5': float(at_default['Cost']),
+            'precision': float(best['Precision']),
+            'recall': float(best['Recall']),
+            'f1_score': float(best['F1-Score']),
+            'fpr': float(best['FPR']),
+            'false_positives': int(best['False Positives']),
+            'false_negatives': int(best['False Negatives']),
+            'fp_cost': fp_cost,
+            'fn_cost': fn_cost,
+            'n_samples': int(len(np.asarray(y_true)))
+        }
+        
+        print(f"\n🎯 Cost-optimal threshold (FP cost {fp_cost:g}, FN cost {fn_cost:g}): "
+              f"{result['threshold']:.6f}")
+        print(f"   Cost: {result['cost']:,.1f} (at 0.5: {result['cost_at_0.5']:,.1f}) | "
+              f"Precision: {result['precision']:.4f} | Recall: {result['recall']:.4f}")
+        
+        return result
+    
+    def _tune_threshold(self, y_test, y_pred_proba, X_val, y_val, fp_cost, fn_cost, sweep=None) -> dict:
+        """Optimal threshold on the validation rows, or on the test rows without them."""
+        if X_val is None:
+            result = self.find_optimal_threshold(y_test, y_pred_proba, fp_cost, fn_cost, sweep=sweep)
+            print("   ⚠️  Tuned on the test set; its reported metrics are optimistic at this threshold")
+            result['tuned_on'] = 'test'
+        else:
+            val_proba = self.model.predict_proba(X_val)[:, 1]
+            result = self.find_optimal_threshold(y_val, val_proba, fp_cost, fn_cost)
+            result['tuned_on'] = 'validation'
+        return result
+    
+    def bootstrap_confidence_intervals(
+        self,
+        y_true,
+        y_pred_proba,
+        threshold: float = 0.5,
+        n_bootstrap: int = DEFAULT_N_BOOTSTRAP,
+        confidence: float = 0.95,
+        batch_size: int = BOOTSTRAP_BATCH_SIZE,
+        n_jobs: int = -1,
+        random_state: int = 42
+    ) -> pd.DataFrame:
+        """
+        Percentile bootstrap confidence intervals for ROC-AUC, PR-AUC
+        (average precision), and precision/recall at a threshold.
+        
+        Each replicate is a row of multiplicity weights (how often each
+        test row was drawn), so a whole batch of replicates is scored from
+        one sort with cumulative weighted TP/FP counts. Batches run in
+        parallel; each gets its own SeedSequence child, so results do not
+        depend on n_jobs.
+        
+        Args:
+            y_true: True labels
+            y_pred_proba: Predicted probabilities
+            threshold: Decision threshold for precision and recall
+            n_bootstrap: Number of bootstrap replicates
+            confidence: Confidence level of the intervals
+            batch_size: Replicates per batch
+            n_jobs: Parallel processes (-1 = all cores)
+            random_state: Seed for the replicates
+            
+        Returns:
+            DataFrame with the point estimate, interval and standard error
+            per metric
+        """
+        y_true = np.asarray(y_true).ravel()
+        y_pred_proba = np.asarray(y_pred_proba, dtype=np.float64).ravel()
+        
+        start = time.perf_counter()
+        estimate = _curve_metrics(*_sorted_cumulative_counts(y_true, y_pred_proba), threshold)
+        
+        sizes = [batch_size] * (n_bootstrap // batch_size)
+        if n_bootstrap % batch_size:
+            sizes.append(n_bootstrap % batch_size)
+        seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+        batches = Parallel(n_jobs=n_jobs)(
+            delayed(_bootstrap_batch)(y_true, y_pred_proba, threshold, size, seed)
+            for size, seed in zip(sizes, seeds)
+        )
+        replicates = np.concatenate(batches, axis=1)
+        
+        alpha = (1 - confidence) / 2
+        with np.errstate(all='ignore'):
+            lower, upper = np.nanquantile(replicates, [alpha, 1 - alpha], axis=1)
+            std_error = np.nanstd(replicates, axis=1, ddof=1)
+        
+        df_ci = pd.DataFrame({
+            'Metric': BOOTSTRAP_METRICS,
+            'Estimate': estimate,
+            'CI Lower': lower,
+            'CI Upper': upper,
+            'Std Error': std_error,
+            'Replicates': np.isfinite(replicates).sum(axis=1)
+        })
+        
+        print(f"\n📏 Bootstrap {confidence:.0%} confidence intervals "
+              f"({n_bootstrap} replicates, threshold {threshold:.4f}, "
+              f"{time.perf_counter() - start:.2f}s):")
+        print(df_ci.to_string(index=False))
+        
+        return df_ci
     
-    def evaluate_at_different_thresholds(self, y_true, y_pred_proba):
+    def save_decision_threshold(self, threshold_info: dict, model_dir: str = None) -> Path:
+        """
+        Store the chosen threshold with the model for serving.
+        
+        Writes decision_threshold.json and sets the threshold inside the
+        inference pipeline, which predict.py and both APIs use instead of
+        the fixed 0.5.
+        
+        Args:
+            threshold_info: Result of find_optimal_threshold()
+            model_dir: Model directory (default: the loaded model's directory)
+            
+        Returns:
+            Path: decision_threshold.json path
+        """
+        model_dir = Path(model_dir) if model_dir else self.model_dir
+        if model_dir is None:
+            raise ValueError("No model directory. Pass model_dir or use load_model() first.")
+        
+        threshold_path = model_dir / DECISION_THRESHOLD_FILENAME
+        write_json_atomic(threshold_path, threshold_info)
+        print(f"💾 Decision threshold saved to: {threshold_path}")
+        
+        pipeline_path = model_dir / PIPELINE_FILENAME
+        if pipeline_path.exists():
+            pipeline = FraudInferencePipeline.load(pipeline_path)
+            pipeline.threshold = threshold_info['threshold']
+            pipeline.save(pipeline_path)
+        
+        return threshold_path
+    
+    def evaluate_at_different_thresholds(self, y_true, y_pred_proba, thresholds: list = None):
         """
         Evaluate model performance at different probability thresholds.
         
+        Counts are read off one sorted pass over the scores (see
+        threshold_sweep) rather than a confusion matrix per threshold.
+        
         Args:
             y_true: True labels
             y_pred_proba: Predicted probabilities
+            thresholds: Thresholds to report (default: 0.3 to 0.9)
             
         Returns:
             DataFrame with metrics at different thresholds
         """
-        thresholds = [0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+        thresholds = thresholds or [0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+        sweep = self.threshold_sweep(y_true, y_pred_proba)
+        sweep_thresholds = sweep['Threshold'].to_numpy()
         results = []
         
         for threshold in thresholds:
-            y_pred_threshold = (y_pred_proba >= threshold).astype(int)
-            cm = confusion_matrix(y_true, y_pred_threshold)
-            tn, fp, fn, tp = cm.ravel()
+            row = sweep.iloc[_sweep_index(sweep_thresholds, threshold)]
+            tp, fp, fn = (int(row[col]) for col in ('True Positives', 'False Positives', 'False Negatives'))
             
             precision = tp / (tp + fp) if (tp + fp) > 0 else 0
             recall = tp / (tp + fn) if (tp + fn) > 0 else 0
@@ -216,7 +443,83 @@ class FraudModelEvaluator:
         
         return df_results
     
-    def comprehensive_evaluation(self, X_test, y_test, output_dir: str = None):
+    def compare_models(
+        self,
+        model_dirs: list,
+        X_test,
+        y_test,
+        feature_names: list,
+        threshold: float = None,
+        n_single: int = COMPARE_SINGLE_ROWS,
+        n_jobs: int = -1,
+        random_state: int = 42
+    ) -> pd.DataFrame:
+        """
+        Score several model bundles on one test set, side by side.
+        
+        The raw test matrix is written once to a .npy file (unless it is
+        already a memmap) and every worker process maps the same file, so
+        N bundles share one copy through the page cache. Each worker loads
+        its bundle with load_model_bundle() and measures what serving sees:
+        load time, artifact size, single-transaction latency (dict in,
+        probability out) and batch throughput, plus quality metrics. Keep
+        n_jobs at or below the physical core count, or bundles will slow
+        each other's timings down.
+        
+        Args:
+            model_dirs: Model directories (e.g. models/, models/versions/v3)
+            X_test: Raw (unscaled) test features; each bundle applies its own scaler
+            y_test: Test labels
+            feature_names: Column order of X_test
+            threshold: Decision threshold for precision/recall (default: each
+                bundle's own threshold)
+            n_single: Single-row scoring calls timed per bundle
+            n_jobs: Parallel processes (-1 = all cores)
+            random_state: Seed for the timed rows
+            
+        Returns:
+            DataFrame with one row per bundle
+        """
+        y_test = np.asarray(y_test).ravel()
+        labels = [Path(d).name or str(d) for d in model_dirs]
+        if len(set(labels)) < len(labels):
+            labels = [str(d) for d in model_dirs]
+        
+        print(f"\n⚖️  Comparing {len(model_dirs)} model bundles on {len(y_test):,} test rows...")
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            if not isinstance(X_test, np.memmap):
+                test_path = Path(tmp_dir) / 'X_test.npy'
+                np.save(test_path, np.asarray(X_test, dtype=np.float32))
+                X_test = np.load(test_path, mmap_mode='r')
+            
+            rows = Parallel(n_jobs=min(n_jobs if n_jobs > 0 else (os.cpu_count() or 1), len(model_dirs)))(
+                delayed(_evaluate_bundle)(
+                    model_dir, X_test, y_test, list(feature_names), threshold, n_single, random_state
+                )
+                for model_dir in model_dirs
+            )
+        
+        df_results = pd.DataFrame(rows)
+        df_results.insert(0, 'Model', labels)
+        
+        print("\n📊 Model Bundle Comparison:")
+        print(df_results.to_string(index=False))
+        
+        return df_results
+    
+    def comprehensive_evaluation(
+        self,
+        X_test,
+        y_test,
+        output_dir: str = None,
+        fp_cost: float = DEFAULT_FP_COST,
+        fn_cost: float = DEFAULT_FN_COST,
+        show: bool = True,
+        n_bootstrap: int = DEFAULT_N_BOOTSTRAP,
+        X_val=None,
+        y_val=None
+    ):
         """
         Run complete evaluation pipeline with visualizations.
         
@@ -224,6 +527,13 @@ class FraudModelEvaluator:
             X_test: Test features
             y_test: Test labels
             output_dir: Directory to save plots (optional)
+            fp_cost: Cost of a false alert (for the optimal threshold)
+            fn_cost: Cost of a missed fraud (for the optimal threshold)
+            show: Display each figure (False for headless runs; see generate_report)
+            n_bootstrap: Bootstrap replicates for confidence intervals (0 = skip)
+            X_val: Validation features to tune the optimal threshold on
+                (default: the test set)
+            y_val: Validation labels
         """
         if self.model is None:
             raise ValueError("Model not loaded. Use load_model() first.")
@@ -232,9 +542,9 @@ class FraudModelEvaluator:
         print("🔍 COMPREHENSIVE MODEL EVALUATION")
         print("=" * 70)
         
-        # Make predictions
-        y_pred = self.model.predict(X_test)
+        # Make predictions (score once; labels use the serving rule proba >= 0.5)
         y_pred_proba = self.model.predict_proba(X_test)[:, 1]
+        y_pred = (y_pred_proba >= 0.5).astype(int)
         
         # 1. Classification Report
         self.generate_classification_report(y_test, y_pred)
@@ -246,53 +556,1071 @@ class FraudModelEvaluator:
             cm_path = output_dir / 'confusion_matrix.png'
         else:
             cm_path = None
-        self.plot_confusion_matrix(y_test, y_pred, save_path=cm_path)
+        self.plot_confusion_matrix(y_test, y_pred, save_path=cm_path, show=show)
         
         # 3. ROC Curve
         if output_dir:
             roc_path = output_dir / 'roc_curve.png'
         else:
             roc_path = None
-        self.plot_roc_curve(y_test, y_pred_proba, save_path=roc_path)
+        self.plot_roc_curve(y_test, y_pred_proba, save_path=roc_path, show=show)
         
         # 4. Precision-Recall Curve
         if output_dir:
             pr_path = output_dir / 'precision_recall_curve.png'
         else:
             pr_path = None
-        self.plot_precision_recall_curve(y_test, y_pred_proba, save_path=pr_path)
+        self.plot_precision_recall_curve(y_test, y_pred_proba, save_path=pr_path, show=show)
         
         # 5. Threshold Analysis
         self.evaluate_at_different_thresholds(y_test, y_pred_proba)
         
+        # 6. Cost-optimal threshold
+        self.optimal_threshold = self._tune_threshold(
+            y_test, y_pred_proba, X_val, y_val, fp_cost, fn_cost
+        )
+        
+        # 7. Confidence intervals at the optimal threshold
+        if n_bootstrap > 0:
+            self.bootstrap_confidence_intervals(
+                y_test, y_pred_proba, threshold=self.optimal_threshold['threshold'],
+                n_bootstrap=n_bootstrap
+            )
+        
         print("\n✅ Evaluation complete!")
+    
+    def generate_report(
+        self,
+        X_test,
+        y_test,
+        output_dir: str = 'evaluation_results',
+        fp_cost: float = DEFAULT_FP_COST,
+        fn_cost: float = DEFAULT_FN_COST,
+        n_jobs: int = -1,
+        dpi: int = REPORT_DPI,
+        n_bootstrap: int = DEFAULT_N_BOOTSTRAP,
+        X_val=None,
+        y_val=None
+    ) -> dict:
+        """
+        Headless evaluation report: one HTML page and one JSON file.
+        
+        The model is scored once and every metric and curve is read off a
+        single threshold sweep. Figures are drawn from thinned curves on
+        the Agg backend in worker processes while the tables are built, and
+        embedded in report.html, so nothing ever opens a window.
+        
+        Args:
+            X_test: Test features
+            y_test: Test labels
+            output_dir: Directory for report.html, report.json and the PNGs
+            fp_cost: Cost of a false alert (for the optimal threshold)
+            fn_cost: Cost of a missed fraud (for the optimal threshold)
+            n_jobs: Rendering processes (-1 = all cores, 1 = render in-process)
+            dpi: Figure resolution
+            n_bootstrap: Bootstrap replicates for confidence intervals (0 = skip)
+            X_val: Validation features to tune the optimal threshold on
+                (default: the test set)
+            y_val: Validation labels
+            
+        Returns:
+            Report dictionary (as written to report.json)
+        """
+        if self.model is None:
+            raise ValueError("Model not loaded. Use load_model() first.")
+        
+        print("\n" + "=" * 70)
+        print("📝 EVALUATION REPORT (headless)")
+        print("=" * 70)
+        
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        timings = {}
+        start = time.perf_counter()
+        
+        # 1. Score once
+        y_test = np.asarray(y_test).ravel()
+        y_pred_proba = self.model.predict_proba(X_test)[:, 1]
+        timings['scoring'] = time.perf_counter() - start
+        
+        # 2. One sweep gives ROC, PR and every thresholded metric
+        mark = time.perf_counter()
+        sweep = self.threshold_sweep(y_test, y_pred_proba, fp_cost, fn_cost)
+        fpr = sweep['FPR'].to_numpy()
+        recall = sweep['Recall'].to_numpy()
+        precision = sweep['Precision'].to_numpy()
+        roc_auc = float(np.sum(np.diff(fpr) * (recall[1:] + recall[:-1])) / 2)
+        average_precision = float(np.sum(np.diff(recall) * precision[1:]))
+        timings['sweep'] = time.perf_counter() - mark
+        
+        # 3. Render figures in the background
+        mark = time.perf_counter()
+        at_default = sweep.iloc[_sweep_index(sweep['Threshold'].to_numpy(), 0.5)]
+        cm = np.array([
+            [int(at_default['True Negatives']), int(at_default['False Positives'])],
+            [int(at_default['False Negatives']), int(at_default['True Positives'])]
+        ])
+        roc_idx = _thin_curve(fpr, recall)
+        pr_idx = _thin_curve(recall, precision)
+        cost_idx = _thin_curve(sweep['Threshold'].to_numpy(), sweep['Cost'].to_numpy(), normalize=True)
+        figures = {
+            'confusion_matrix': ('confusion_matrix', (cm,)),
+            'roc_curve': ('roc', (fpr[roc_idx], recall[roc_idx], roc_auc)),
+            'precision_recall_curve': ('precision_recall', (recall[pr_idx], precision[pr_idx], average_precision)),
+            'threshold_cost': ('threshold_cost', (
+                sweep['Threshold'].to_numpy()[cost_idx], sweep['Cost'].to_numpy()[cost_idx]
+            ))
+        }
+        jobs = [
+            (kind, data, str(output_dir / f'{name}.png'), dpi)
+            for name, (kind, data) in figures.items()
+        ]
+        n_workers = min(len(jobs), os.cpu_count() or 1) if n_jobs in (None, -1) else n_jobs
+        pool = ProcessPoolExecutor(max_workers=n_workers) if n_workers > 1 else None
+        if pool is not None:
+            rendering = [pool.submit(_render_figure, *job) for job in jobs]
+        
+        # 4. Tables while the figures render
+        report = _classification_report_from_counts(cm)
+        thresholds = [0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+        threshold_rows = sweep.iloc[[_sweep_index(sweep['Threshold'].to_numpy(), t) for t in thresholds]]
+        threshold_table = pd.DataFrame({
+            'Threshold': thresholds,
+            'Precision': threshold_rows['Precision'].to_numpy(),
+            'Recall': threshold_rows['Recall'].to_numpy(),
+            'F1-Score': threshold_rows['F1-Score'].to_numpy(),
+            'False Positives': threshold_rows['False Positives'].to_numpy(),
+            'False Negatives': threshold_rows['False Negatives'].to_numpy()
+        })
+        self.optimal_threshold = self._tune_threshold(
+            y_test, y_pred_proba, X_val, y_val, fp_cost, fn_cost, sweep=sweep
+        )
+        
+        if pool is None:
+            paths = [_render_figure(*job) for job in jobs]
+        else:
+            paths = [future.result() for future in rendering]
+            pool.shutdown()
+        timings['figures'] = time.perf_counter() - mark
+        
+        # 5. Confidence intervals once the rendering processes are done
+        confidence_intervals = None
+        if n_bootstrap > 0:
+            mark = time.perf_counter()
+            confidence_intervals = self.bootstrap_confidence_intervals(
+                y_test, y_pred_proba, threshold=self.optimal_threshold['threshold'],
+                n_bootstrap=n_bootstrap, n_jobs=n_jobs
+            ).to_dict(orient='records')
+            timings['bootstrap'] = time.perf_counter() - mark
+        timings['total'] = time.perf_counter() - start
+        
+        result = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'model_dir': str(self.model_dir) if self.model_dir else None,
+            'model_type': type(self.model).__name__,
+            'n_samples': int(len(y_test)),
+            'n_fraud': int((y_test == 1).sum()),
+            'roc_auc': roc_auc,
+            'average_precision': average_precision,
+            'confusion_matrix': cm.tolist(),
+            'classification_report': report,
+            'thresholds': threshold_table.to_dict(orient='records'),
+            'optimal_threshold': self.optimal_threshold,
+            'confidence_intervals': confidence_intervals,
+            'figures': {name: Path(path).name for name, path in zip(figures, paths)},
+            'timings_seconds': {stage: round(seconds, 3) for stage, seconds in timings.items()}
+        }
+        
+        json_path = output_dir / 'report.json'
+        with open(json_path, 'w') as f:
+            json.dump(result, f, indent=2)
+        html_path = output_dir / 'report.html'
+        html_path.write_text(_report_html(result, dict(zip(figures, paths))), encoding='utf-8')
+        
+        print(f"\n📊 ROC-AUC: {roc_auc:.4f} | Average precision: {average_precision:.4f}")
+        print(f"⏱️  Report generated in {timings['total']:.2f}s "
+              f"(scoring {timings['scoring']:.2f}s, figures {timings['figures']:.2f}s)")
+        print(f"💾 Report saved to: {html_path} and {json_path.name}")
+        
+        return result
+
+
+class StreamingEvaluator:
+    """
+    Bounded-memory evaluation of logged predictions.
+    
+    Keeps one fixed-bin score histogram per class for each time bucket
+    instead of the predictions themselves, so memory is O(bins x buckets)
+    however large the logs are. Metrics come from the same cumulative-count
+    sweep as FraudModelEvaluator, with the bin edges as thresholds: they are
+    exact for scores rounded down to the bin grid, which moves ROC-AUC and
+    PR-AUC by at most about 1/n_bins. States from shards or days can be
+    merged, and metrics queried over any range of buckets.
+    
+    Example:
+        >>> stream = StreamingEvaluator()
+        >>> stream.update_from_log('data/predictions_log.csv', labels='data/labels.csv')
+        >>> stream.metrics(start='2026-01-01', end='2026-01-08')
+    """
+    
+    def __init__(self, n_bins: int = STREAM_BINS, bucket_seconds: int = STREAM_BUCKET_SECONDS):
+        """
+        Initialize an empty evaluator.
+        
+        Args:
+            n_bins: Score histogram bins over [0, 1] (thresholds on multiples of 1/n_bins are exact)
+            bucket_seconds: Time bucket length; windows are resolved to whole buckets
+        """
+        self.n_bins = int(n_bins)
+        self.bucket_seconds = int(bucket_seconds)
+        # Bucket start (epoch seconds) -> counts of shape (2, n_bins): genuine, fraud
+        self.buckets: Dict[int, np.ndarray] = {}
+        self.n_unlabeled = 0
+    
+    def update(self, y_true, y_pred_proba, timestamps=None) -> 'StreamingEvaluator':
+        """
+        Add labeled predictions.
+        
+        Args:
+            y_true: True labels
+            y_pred_proba: Logged fraud probabilities
+            timestamps: Prediction times (datetimes, ISO strings or epoch
+                seconds); default: now
+            
+        Returns:
+            self
+        """
+        is_fraud = (np.asarray(y_true).ravel() == 1).astype(np.int64)
+        scores = np.asarray(y_pred_proba, dtype=np.float64).ravel()
+        if timestamps is None:
+            seconds = np.full(len(scores), int(time.time()), dtype=np.int64)
+        else:
+            seconds = _epoch_seconds(timestamps)
+        
+        valid = np.isfinite(scores)
+        is_fraud, scores, seconds = is_fraud[valid], scores[valid], seconds[valid]
+        bins = np.clip((scores * self.n_bins).astype(np.int64), 0, self.n_bins - 1)
+        
+        # One bincount over (bucket, class, bin) for the whole batch
+        keys, bucket_index = np.unique(seconds // self.bucket_seconds, return_inverse=True)
+        counts = np.bincount(
+            (bucket_index * 2 + is_fraud) * self.n_bins + bins,
+            minlength=len(keys) * 2 * self.n_bins
+        ).reshape(len(keys), 2, self.n_bins)
+        
+        for key, bucket_counts in zip(keys, counts):
+            start = int(key) * self.bucket_seconds
+            if start in self.buckets:
+                self.buckets[start] += bucket_counts
+            else:
+                self.buckets[start] = bucket_counts.copy()
+        return self
+    
+    def update_from_log(
+        self,
+        log_file: Union[str, Path],
+        labels=None,
+        id_column: str = 'transaction_id',
+        label_column: str = 'Class',
+        score_column: str = 'fraud_probability',
+        time_column: str = 'timestamp',
+        chunksize: int = 500_000
+    ) -> 'StreamingEvaluator':
+        """
+        Stream a prediction log (see utils.save_prediction_log) in chunks.
+        
+        Args:
+            log_file: Prediction log CSV
+            labels: Late-arriving labels as a CSV path, DataFrame (id_column,
+                label_column) or Series indexed by id; None if the log already
+                has label_column. Predictions without a label yet are counted
+                in n_unlabeled and skipped.
+            id_column: Column joining log and labels (save_prediction_log
+                records 'transaction_id'; use the id field of your own
+                transactions for other logs)
+            label_column: Label column (1 = fraud)
+            score_column: Logged fraud probability column
+            time_column: Prediction time column
+            chunksize: Log rows read at a time
+            
+        Returns:
+            self
+        """
+        # Ids are read as strings on both sides: the two files cannot be
+        # parsed to different types (int vs str), and '0042' stays '0042'
+        if isinstance(labels, (str, Path)):
+            labels = pd.read_csv(labels, usecols=[id_column, label_column], dtype={id_column: str})
+        if isinstance(labels, pd.DataFrame):
+            labels = labels.drop_duplicates(id_column, keep='last').set_index(id_column)[label_column]
+        if labels is not None:
+            labels = labels.set_axis(labels.index.astype(str))
+        
+        join_column = label_column if labels is None else id_column
+        n_rows = 0
+        for chunk in pd.read_csv(
+            log_file, usecols=[time_column, score_column, join_column],
+            dtype={id_column: str}, chunksize=chunksize
+        ):
+            y = chunk[label_column] if labels is None else chunk[id_column].map(labels)
+            labeled = y.notna().to_numpy()
+            self.n_unlabeled += int((~labeled).sum())
+            n_rows += len(chunk)
+            self.update(
+                y.to_numpy()[labeled].astype(np.int64),
+                chunk[score_column].to_numpy()[labeled],
+                chunk[time_column].to_numpy()[labeled]
+            )
+        
+        print(f"📥 Streamed {n_rows:,} logged predictions from {log_file} "
+              f"({self.n_unlabeled:,} without labels so far)")
+        return self
+    
+    def merge(self, other: 'StreamingEvaluator') -> 'StreamingEvaluator':
+        """
+        Add another evaluator's counts (e.g. another shard or day).
+        
+        Raises:
+            ValueError: If the bins or bucket lengths differ
+        """
+        if (other.n_bins, other.bucket_seconds) != (self.n_bins, self.bucket_seconds):
+            raise ValueError(
+                f"Cannot merge evaluators with {other.n_bins} bins / {other.bucket_seconds}s buckets "
+                f"into {self.n_bins} bins / {self.bucket_seconds}s buckets"
+            )
+        for start, counts in other.buckets.items():
+            if start in self.buckets:
+                self.buckets[start] += counts
+            else:
+                self.buckets[start] = counts.copy()
+        self.n_unlabeled += other.n_unlabeled
+        return self
+    
+    def histogram(self, start=None, end=None) -> np.ndarray:
+        """
+        Score histograms summed over the buckets starting in [start, end).
+        
+        Args:
+            start: Window start (datetime, ISO string or epoch seconds; None = all)
+            end: Window end (exclusive; None = all)
+            
+        Returns:
+            Array of shape (2, n_bins): genuine counts, fraud counts
+        """
+        lo = -np.inf if start is None else int(_epoch_seconds(start)[0])
+        hi = np.inf if end is None else int(_epoch_seconds(end)[0])
+        total = np.zeros((2, self.n_bins), dtype=np.int64)
+        for bucket_start, counts in self.buckets.items():
+            if lo <= bucket_start < hi:
+                total += counts
+        return total
+    
+    def _cumulative_counts(self, start=None, end=None):
+        """Bin lower edges (descending) with TP/FP counts at or above each."""
+        genuine, fraud = self.histogram(start, end)
+        thresholds = np.arange(self.n_bins - 1, -1, -1) / self.n_bins
+        return thresholds, np.cumsum(fraud[::-1]), np.cumsum(genuine[::-1])
+    
+    def threshold_sweep(
+        self,
+        start=None,
+        end=None,
+        fp_cost: float = DEFAULT_FP_COST,
+        fn_cost: float = DEFAULT_FN_COST
+    ) -> pd.DataFrame:
+        """
+        Metrics at every bin edge over a time window (see
+        FraudModelEvaluator.threshold_sweep; first row flags nothing).
+        """
+        thresholds, tp, fp = self._cumulative_counts(start, end)
+        thresholds = np.concatenate(([np.nextafter(1.0, np.inf)], thresholds))
+        return _sweep_frame(thresholds, np.concatenate(([0], tp)), np.concatenate(([0], fp)), fp_cost, fn_cost)
+    
+    def metrics(self, start=None, end=None, threshold: float = 0.5) -> dict:
+        """
+        Approximate ROC-AUC, PR-AUC, and precision/recall at a threshold
+        over a time window.
+        
+        Args:
+            start: Window start (None = all)
+            end: Window end, exclusive (None = all)
+            threshold: Decision threshold (exact on multiples of 1/n_bins)
+            
+        Returns:
+            Dictionary of metrics and counts (NaN AUCs if a class is missing)
+        """
+        thresholds, tp, fp = self._cumulative_counts(start, end)
+        n_fraud, n_genuine = int(tp[-1]), int(fp[-1])
+        roc_auc, pr_auc, precision, recall = _curve_metrics(thresholds, tp, fp, threshold)
+        if n_fraud == 0 or n_genuine == 0:
+            roc_auc = pr_auc = float('nan')
+        
+        result = {
+            'start': None if start is None else str(start),
+            'end': None if end is None else str(end),
+            'n_samples': n_fraud + n_genuine,
+            'n_fraud': n_fraud,
+            'threshold': threshold,
+            'roc_auc': float(roc_auc),
+            'pr_auc': float(pr_auc),
+            'precision': float(precision),
+            'recall': float(recall) if n_fraud > 0 else float('nan')
+        }
+        
+        window = f"{result['start'] or 'beginning'} → {result['end'] or 'now'}"
+        print(f"\n📈 Streaming metrics ({window}): {result['n_samples']:,} predictions, "
+              f"{n_fraud:,} fraud")
+        print(f"   ROC-AUC: {result['roc_auc']:.4f} | PR-AUC: {result['pr_auc']:.4f} | "
+              f"Precision@{threshold:g}: {result['precision']:.4f} | Recall@{threshold:g}: {result['recall']:.4f}")
+        
+        return result
+    
+    def save(self, filepath: Union[str, Path]):
+        """Save the evaluator state (histograms only) to an .npz file."""
+        starts = np.array(sorted(self.buckets), dtype=np.int64)
+        counts = (np.stack([self.buckets[int(start)] for start in starts])
+                  if len(starts) else np.zeros((0, 2, self.n_bins), dtype=np.int64))
+        np.savez_compressed(
+            filepath,
+            starts=starts,
+            counts=counts,
+            n_bins=self.n_bins,
+            bucket_seconds=self.bucket_seconds,
+            n_unlabeled=self.n_unlabeled
+        )
+        print(f"💾 Streaming evaluation state saved to: {filepath} ({len(starts)} buckets)")
+    
+    @classmethod
+    def load(cls, filepath: Union[str, Path]) -> 'StreamingEvaluator':
+        """Load a state written by save()."""
+        with np.load(filepath) as state:
+            evaluator = cls(n_bins=int(state['n_bins']), bucket_seconds=int(state['bucket_seconds']))
+            evaluator.n_unlabeled = int(state['n_unlabeled'])
+            for start, counts in zip(state['starts'], state['counts']):
+                evaluator.buckets[int(start)] = counts.astype(np.int64)
+        return evaluator
+
+
+def _epoch_seconds(timestamps) -> np.ndarray:
+    """Epoch seconds (int64) from datetimes, ISO strings or numbers."""
+    values = np.atleast_1d(np.asarray(timestamps))
+    if np.issubdtype(values.dtype, np.number):
+        return np.floor(values).astype(np.int64)
+    return pd.to_datetime(values).to_numpy(dtype='datetime64[s]').astype(np.int64)
+
+
+def _sorted_cumulative_counts(y_true, scores, sample_weight=None):
+    """
+    Cumulative TP/FP counts at every distinct score, from one sort.
+    
+    Args:
+        y_true: True labels (1 = fraud)
+        scores: Predicted probabilities
+        sample_weight: Optional weights of shape (n,) or (n_sets, n), e.g.
+            bootstrap resampling counts; each row is accumulated separately
+            
+    Returns:
+        (thresholds, tp, fp): distinct scores in descending order and the
+        (weighted) counts of positives/negatives scoring >= each threshold.
+        tp and fp have shape (k,) or (n_sets, k).
+    """
+    scores = np.asarray(scores, dtype=np.float64).ravel()
+    is_fraud = np.asarray(y_true).ravel() == 1
+    
+    order = np.argsort(scores, kind='mergesort')[::-1]
+    scores_sorted = scores[order]
+    fraud_sorted = is_fraud[order]
+    
+    # Last position of each run of equal scores
+    last = np.concatenate((np.flatnonzero(np.diff(scores_sorted)), [len(scores_sorted) - 1]))
+    thresholds = scores_sorted[last]
+    
+    if sample_weight is None:
+        tp = np.cumsum(fraud_sorted)[last]
+        fp = (last + 1) - tp
+    else:
+        # Fraud is rare: accumulate positives over fraud columns only and
+        # get negatives as total minus positives
+        weights = np.asarray(sample_weight)[..., order]
+        total = np.cumsum(weights, axis=-1)[..., last]
+        fraud_positions = np.flatnonzero(fraud_sorted)
+        fraud_cum = np.cumsum(weights[..., fraud_positions], axis=-1)
+        fraud_cum = np.concatenate((np.zeros(fraud_cum.shape[:-1] + (1,), dtype=fraud_cum.dtype), fraud_cum), axis=-1)
+        tp = fraud_cum[..., np.searchsorted(fraud_positions, last, side='right')]
+        fp = total - tp
+    
+    return thresholds, tp, fp
+
+
+def _sweep_frame(thresholds, tp, fp, fp_cost: float, fn_cost: float) -> pd.DataFrame:
+    """
+    Threshold sweep table from descending thresholds and cumulative counts
+    (first row flagging nothing, last row flagging everything).
+    """
+    positives, negatives = tp[-1], fp[-1]
+    fn = positives - tp
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.where(tp + fp > 0, tp / (tp + fp), 0.0)
+        recall = tp / positives if positives > 0 else np.zeros(len(tp))
+        f1 = np.where(tp > 0, 2 * tp / (2 * tp + fp + fn), 0.0)
+        fpr = fp / negatives if negatives > 0 else np.zeros(len(fp))
+    
+    return pd.DataFrame({
+        'Threshold': thresholds,
+        'True Positives': tp,
+        'False Positives': fp,
+        'False Negatives': fn,
+        'True Negatives': negatives - fp,
+        'Precision': precision,
+        'Recall': recall,
+        'F1-Score': f1,
+        'FPR': fpr,
+        'Cost': fp_cost * fp + fn_cost * fn
+    })
+
+
+def _sweep_index(thresholds_desc: np.ndarray, threshold: float) -> int:
+    """Row of a descending sweep whose decision equals `proba >= threshold`."""
+    # Smallest swept threshold that is still >= threshold flags the same rows
+    n_at_or_above = len(thresholds_desc) - np.searchsorted(thresholds_desc[::-1], threshold, side='left')
+    return max(int(n_at_or_above) - 1, 0)
+
+
+def _curve_metrics(thresholds, tp, fp, threshold: float) -> np.ndarray:
+    """
+    ROC-AUC, PR-AUC, precision and recall from cumulative counts.
+    
+    Args:
+        thresholds, tp, fp: _sorted_cumulative_counts() output; tp and fp
+            may be (k,) or (n_sets, k)
+        threshold: Decision threshold for precision and recall
+        
+    Returns:
+        Array of shape (4,) or (4, n_sets) in BOOTSTRAP_METRICS order (NaN
+        where a replicate has no positives or no negatives)
+    """
+    positives = tp[..., -1]
+    negatives = fp[..., -1]
+    k = tp.shape[-1]
+    
+    # Recall only changes where tp steps, so both areas are integrated over
+    # recall at those thresholds alone (ROC-AUC = 1 - integral of FPR dTPR)
+    zeros = np.zeros(tp.shape[:-1] + (1,), dtype=tp.dtype)
+    tp0 = np.concatenate((zeros, tp), axis=-1)
+    fp0 = np.concatenate((zeros, fp), axis=-1)
+    steps = np.flatnonzero((np.diff(tp0, axis=-1) != 0).reshape(-1, k).any(axis=0)) + 1
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d_recall = (tp0[..., steps] - tp0[..., steps - 1]) / positives[..., None]
+        fpr_sum = (fp0[..., steps] + fp0[..., steps - 1]) / negatives[..., None]
+        flagged = tp0[..., steps] + fp0[..., steps]
+        precision = np.where(flagged > 0, tp0[..., steps] / flagged, 0.0)
+        
+        roc_auc = 1 - np.sum(d_recall * fpr_sum, axis=-1) / 2
+        pr_auc = np.sum(d_recall * precision, axis=-1)
+        
+        # Rows flagged at `proba >= threshold` (none if n_flagged == 0)
+        n_flagged = len(thresholds) - np.searchsorted(thresholds[::-1], threshold, side='left')
+        tp_at = tp0[..., n_flagged]
+        fp_at = fp0[..., n_flagged]
+        precision_at = np.where(tp_at + fp_at > 0, tp_at / (tp_at + fp_at), 0.0)
+        recall_at = tp_at / positives
+    
+    return np.array([roc_auc, pr_auc, precision_at, recall_at], dtype=np.float64)
+
+
+def _bootstrap_batch(y_true, y_pred_proba, threshold: float, size: int, seed) -> np.ndarray:
+    """
+    Metrics of `size` bootstrap replicates (worker function).
+    
+    Multiplicity weights for every replicate come from one bincount over
+    row indices offset by replicate, instead of fancy-indexing copies.
+    
+    Returns:
+        Array of shape (4, size)
+    """
+    n = len(y_true)
+    rng = np.random.default_rng(seed)
+    draws = rng.integers(0, n, size=(size, n))
+    draws += (np.arange(size) * n)[:, None]
+    weights = np.bincount(draws.ravel(), minlength=size * n).reshape(size, n)
+    
+    thresholds, tp, fp = _sorted_cumulative_counts(y_true, y_pred_proba, sample_weight=weights)
+    
+    metrics = _curve_metrics(thresholds, tp, fp, threshold)
+    # A replicate without both classes has no ROC/PR curve
+    degenerate = (tp[:, -1] == 0) | (fp[:, -1] == 0)
+    metrics[:, degenerate] = np.nan
+    return metrics
+
+
+def _evaluate_bundle(
+    model_dir,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    feature_names: list,
+    threshold: float,
+    n_single: int,
+    random_state: int
+) -> dict:
+    """
+    Quality, latency, throughput, size and load time of one bundle
+    (compare_models worker).
+    """
+    model_dir = Path(model_dir)
+    # Time a second load, so a fresh worker's module imports are not charged to the bundle
+    load_model_bundle(model_dir)
+    start = time.perf_counter()
+    pipeline = load_model_bundle(model_dir)
+    load_seconds = time.perf_counter() - start
+    
+    artifacts = [model_dir / PIPELINE_FILENAME]
+    if not artifacts[0].exists():
+        artifacts = [model_dir / name for name in ('fraud_detector.pkl', 'scaler.pkl', 'feature_names.pkl')]
+    size_mb = sum(path.stat().st_size for path in artifacts) / 1024**2
+    
+    # Bundle feature order (a column view of the shared map if it matches)
+    missing = [name for name in pipeline.feature_names if name not in feature_names]
+    if missing:
+        raise ValueError(f"{model_dir}: test set lacks features {missing}")
+    if pipeline.feature_names == feature_names:
+        X = X_test
+    else:
+        X = X_test[:, [feature_names.index(name) for name in pipeline.feature_names]]
+    
+    # Single transactions as the APIs receive them, after one warm-up call
+    rng = np.random.default_rng(random_state)
+    transactions = [
+        dict(zip(pipeline.feature_names, X[i].tolist()))
+        for i in rng.integers(0, len(X), n_single)
+    ]
+    pipeline.score(transactions[0])
+    samples_ns = []
+    for transaction in transactions:
+        start = time.perf_counter_ns()
+        pipeline.score(transaction)
+        samples_ns.append(time.perf_counter_ns() - start)
+    latency = summarize_latencies(samples_ns)
+    
+    start = time.perf_counter()
+    proba = pipeline.score(X)
+    batch_seconds = time.perf_counter() - start
+    
+    threshold = pipeline.threshold if threshold is None else threshold
+    roc_auc, pr_auc, precision, recall = _curve_metrics(
+        *_sorted_cumulative_counts(y_test, proba), threshold
+    )
+    f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
+    
+    return {
+        'Type': type(pipeline.model).__name__,
+        'ROC-AUC': round(float(roc_auc), 4),
+        'PR-AUC': round(float(pr_auc), 4),
+        'Threshold': round(float(threshold), 4),
+        'Precision': round(float(precision), 4),
+        'Recall': round(float(recall), 4),
+        'F1-Score': round(float(f1), 4),
+        'Single p50 (µs)': latency['p50_us'],
+        'Single p99 (µs)': latency['p99_us'],
+        'Batch (rows/s)': int(len(X) / batch_seconds) if batch_seconds > 0 else None,
+        'Size (MB)': round(size_mb, 3),
+        'Load (ms)': round(load_seconds * 1000, 1)
+    }
+
+
+def _classification_report_from_counts(cm: np.ndarray) -> dict:
+    """
+    classification_report(output_dict=True) computed from a 2x2 confusion
+    matrix instead of from the label arrays.
+    """
+    cm = np.asarray(cm, dtype=np.float64)
+    support = cm.sum(axis=1)
+    predicted = cm.sum(axis=0)
+    correct = np.diag(cm)
+    
+    report = {}
+    for k, name in enumerate(['Genuine', 'Fraud']):
+        precision = correct[k] / predicted[k] if predicted[k] > 0 else 0.0
+        recall = correct[k] / support[k] if support[k] > 0 else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
+        report[name] = {
+            'precision': float(precision),
+            'recall': float(recall),
+            'f1-score': float(f1),
+            'support': float(support[k])
+        }
+    
+    total = support.sum()
+    report['accuracy'] = float(correct.sum() / total) if total > 0 else 0.0
+    per_class = [report['Genuine'], report['Fraud']]
+    for name, weights in (('macro avg', np.ones(2)), ('weighted avg', support)):
+        weights = weights / weights.sum() if weights.sum() > 0 else np.zeros(2)
+        report[name] = {
+            metric: float(sum(w * row[metric] for w, row in zip(weights, per_class)))
+            for metric in ('precision', 'recall', 'f1-score')
+        }
+        report[name]['support'] = float(total)
+    return report
+
+
+def _draw_confusion_matrix(ax, cm):
+    sns.heatmap(
+        cm, 
+        annot=True, 
+        fmt='d', 
+        cmap='Blues',
+        xticklabels=['Genuine', 'Fraud'],
+        yticklabels=['Genuine', 'Fraud'],
+        ax=ax
+    )
+    ax.set_title('Confusion Matrix - Fraud Detection', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Actual', fontsize=12)
+    ax.set_xlabel('Predicted', fontsize=12)
+
+
+def _draw_roc(ax, fpr, tpr, roc_auc):
+    ax.plot(fpr, tpr, color='darkblue', lw=2, label=f'ROC Curve (AUC = {roc_auc:.4f})')
+    ax.plot([0, 1], [0, 1], color='gray', lw=1, linestyle='--', label='Random Classifier')
+    ax.set_xlim([0.0, 1.0])
+    ax.set_ylim([0.0, 1.05])
+    ax.set_xlabel('False Positive Rate', fontsize=12)
+    ax.set_ylabel('True Positive Rate (Recall)', fontsize=12)
+    ax.set_title('ROC Curve - Fraud Detection Model', fontsize=14, fontweight='bold')
+    ax.legend(loc='lower right', fontsize=11)
+    ax.grid(alpha=0.3)
+
+
+def _draw_precision_recall(ax, recall, precision, avg_precision):
+    ax.plot(recall, precision, color='darkgreen', lw=2, label=f'PR Curve (AP = {avg_precision:.4f})')
+    ax.set_xlabel('Recall', fontsize=12)
+    ax.set_ylabel('Precision', fontsize=12)
+    ax.set_title('Precision-Recall Curve', fontsize=14, fontweight='bold')
+    ax.legend(loc='upper right', fontsize=11)
+    ax.grid(alpha=0.3)
+
+
+def _draw_threshold_cost(ax, thresholds, cost):
+    best = int(np.argmin(cost))
+    ax.plot(thresholds, cost, color='darkred', lw=2)
+    ax.axvline(thresholds[best], color='gray', lw=1, linestyle='--',
+               label=f'Optimal threshold ({thresholds[best]:.4f})')
+    ax.set_xlim([0.0, 1.0])
+    ax.set_xlabel('Threshold', fontsize=12)
+    ax.set_ylabel('Misclassification Cost', fontsize=12)
+    ax.set_title('Cost by Decision Threshold', fontsize=14, fontweight='bold')
+    ax.legend(loc='upper right', fontsize=11)
+    ax.grid(alpha=0.3)
+
+
+# Figure kind -> (drawing function, figure size)
+_FIGURES = {
+    'confusion_matrix': (_draw_confusion_matrix, (8, 6)),
+    'roc': (_draw_roc, (10, 6)),
+    'precision_recall': (_draw_precision_recall, (10, 6)),
+    'threshold_cost': (_draw_threshold_cost, (10, 6))
+}
+
+
+def _draw_figure(kind: str, *data):
+    """Interactive (pyplot) figure of the given kind."""
+    draw, figsize = _FIGURES[kind]
+    fig, ax = plt.subplots(figsize=figsize)
+    draw(ax, *data)
+    return fig
+
+
+def _finish_figure(fig, save_path, show: bool, label: str):
+    """Save a pyplot figure if requested, then show or close it."""
+    if save_path:
+        fig.savefig(save_path, dpi=300, bbox_inches='tight')
+        print(f"💾 {label} saved to: {save_path}")
+    
+    if show:
+        plt.show()
+    else:
+        plt.close(fig)
+
+
+def _render_figure(kind: str, data: tuple, path: str, dpi: int) -> str:
+    """
+    Draw one report figure on an Agg canvas and save it.
+    
+    Runs in report worker processes. The figure never touches pyplot, so
+    no display or GUI backend is needed and the caller's backend is unchanged.
+    """
+    draw, figsize = _FIGURES[kind]
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    draw(fig.subplots(), *data)
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    return path
+
+
+def _thin_curve(x, y, max_points: int = REPORT_CURVE_POINTS, normalize: bool = False) -> np.ndarray:
+    """
+    Indices of a curve worth plotting: the first point in each cell of a
+    grid over the plot, plus both ends (at most about max_points).
+    
+    Args:
+        x, y: Curve coordinates (in [0, 1] unless normalize)
+        max_points: Target number of points
+        normalize: Rescale x and y to [0, 1] first
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) <= max_points:
+        return np.arange(len(x))
+    
+    if normalize:
+        x = (x - x.min()) / (np.ptp(x) or 1.0)
+        y = (y - y.min()) / (np.ptp(y) or 1.0)
+    
+    resolution = max_points // 2
+    cells = (np.floor(x * resolution).astype(np.int64) * (resolution + 1)
+             + np.floor(y * resolution).astype(np.int64))
+    keep = np.unique(np.concatenate(([0], np.flatnonzero(np.diff(cells)) + 1, [len(x) - 1])))
+    if len(keep) > max_points:
+        keep = keep[np.linspace(0, len(keep) - 1, max_points).astype(np.int64)]
+    return keep
+
+
+def _report_html(report: dict, figure_paths: dict) -> str:
+    """Self-contained HTML page for a report (figures embedded as base64 PNGs)."""
+    def table(df: pd.DataFrame) -> str:
+        return df.to_html(float_format=lambda v: f'{v:.4f}', border=0, classes='metrics')
+    
+    optimal = report['optimal_threshold']
+    summary = pd.DataFrame({
+        'Value': [
+            report['model_type'], report['n_samples'], report['n_fraud'],
+            f"{report['roc_auc']:.4f}", f"{report['average_precision']:.4f}",
+            f"{optimal['threshold']:.6f}", f"{optimal['cost']:,.1f}", f"{optimal['cost_at_0.5']:,.1f}"
+        ]
+    }, index=[
+        'Model', 'Test transactions', 'Fraud cases', 'ROC-AUC', 'Average precision',
+        f"Cost-optimal threshold (FP {optimal['fp_cost']:g} / FN {optimal['fn_cost']:g})",
+        'Cost at optimal threshold', 'Cost at 0.5'
+    ])
+    
+    intervals = ''
+    if report['confidence_intervals']:
+        intervals = (
+            f"<h2>Bootstrap 95% Confidence Intervals (threshold {optimal['threshold']:.4f})</h2>\n"
+            f"{table(pd.DataFrame(report['confidence_intervals']).set_index('Metric'))}\n"
+        )
+    
+    figures = []
+    for name, path in figure_paths.items():
+        encoded = base64.b64encode(Path(path).read_bytes()).decode('ascii')
+        figures.append(f'<img alt="{html.escape(name)}" src="data:image/png;base64,{encoded}">')
+    
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Fraud Detection Evaluation Report</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em auto; max-width: 1100px; color: #222; }}
+table.metrics {{ border-collapse: collapse; margin-bottom: 1.5em; }}
+table.metrics th, table.metrics td {{ padding: 4px 12px; text-align: right; border-bottom: 1px solid #ddd; }}
+img {{ max-width: 100%; margin-bottom: 1em; }}
+</style>
+</head>
+<body>
+<h1>Fraud Detection Evaluation Report</h1>
+<p>Generated {html.escape(report['generated_at'])} from {html.escape(str(report['model_dir']))}
+in {report['timings_seconds']['total']:.2f}s.</p>
+<h2>Summary</h2>
+{table(summary)}
+{intervals}<h2>Classification Report (threshold 0.5)</h2>
+{table(pd.DataFrame(report['classification_report']).transpose())}
+<h2>Performance at Different Thresholds</h2>
+{table(pd.DataFrame(report['thresholds']))}
+<h2>Figures</h2>
+{''.join(figures)}
+</body>
+</html>
+"""
 
 
 # Evaluation script
 if __name__ == "__main__":
+    import argparse
     from data_loader import FraudDataLoader
     from preprocessing import FraudPreprocessor
     
+    parser = argparse.ArgumentParser(description='Evaluate the trained fraud detection model')
+    parser.add_argument(
+        '--store',
+        type=str,
+        help='Evaluate on a memory-mapped feature store instead of creditcard.csv'
+    )
+    parser.add_argument('--fp-cost', type=float, default=DEFAULT_FP_COST, help='Cost of a false alert')
+    parser.add_argument('--fn-cost', type=float, default=DEFAULT_FN_COST, help='Cost of a missed fraud')
+    parser.add_argument(
+        '--save-threshold',
+        action='store_true',
+        help='Save the cost-optimal threshold with the model for serving'
+    )
+    parser.add_argument(
+        '--validation-size',
+        type=float,
+        default=0.5,
+        help='Share of the held-out rows used to tune the optimal threshold; metrics are '
+             'reported on the rest (default: 0.5)'
+    )
+    parser.add_argument(
+        '--report',
+        action='store_true',
+        help='Write a headless HTML/JSON report (figures rendered in parallel, no windows)'
+    )
+    parser.add_argument('--no-show', action='store_true', help='Save figures without displaying them')
+    parser.add_argument('--output-dir', type=str, default='evaluation_results', help='Where to write plots/report')
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Report/bootstrap processes (-1 = all cores)')
+    parser.add_argument(
+        '--bootstrap',
+        type=int,
+        default=DEFAULT_N_BOOTSTRAP,
+        help='Bootstrap replicates for confidence intervals (0 = skip)'
+    )
+    parser.add_argument(
+        '--compare',
+        type=str,
+        nargs='+',
+        metavar='MODEL_DIR',
+        help='Compare model bundles side by side on one shared test set'
+    )
+    parser.add_argument(
+        '--stream-log',
+        type=str,
+        nargs='+',
+        help='Evaluate logged predictions (streamed in chunks) instead of the test set'
+    )
+    parser.add_argument('--labels', type=str, help='Late-arriving labels CSV (id column, Class) for --stream-log')
+    parser.add_argument(
+        '--id-column',
+        type=str,
+        default='transaction_id',
+        help='Column joining --stream-log and --labels (default: transaction_id)'
+    )
+    parser.add_argument(
+        '--state',
+        type=str,
+        help='Streaming evaluation state (.npz): loaded if present, saved after --stream-log'
+    )
+    parser.add_argument('--merge-states', type=str, nargs='+', help='Streaming states to merge (shards/days)')
+    parser.add_argument('--since', type=str, help='Streaming window start (e.g. 2026-01-01)')
+    parser.add_argument('--until', type=str, help='Streaming window end, exclusive')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        help='Decision threshold for --stream-log/--compare (default: the threshold saved with each model)'
+    )
+    args = parser.parse_args()
+    
+    model_dir = Path(__file__).parent.parent / 'models'
+    
+    if args.stream_log or args.state or args.merge_states:
+        # Bounded-memory evaluation of prediction logs; no test set needed
+        if args.state and Path(args.state).exists():
+            stream = StreamingEvaluator.load(args.state)
+        else:
+            stream = StreamingEvaluator()
+        for state_path in args.merge_states or []:
+            stream.merge(StreamingEvaluator.load(state_path))
+        for log_path in args.stream_log or []:
+            stream.update_from_log(log_path, labels=args.labels, id_column=args.id_column)
+        if args.state:
+            stream.save(args.state)
+        
+        threshold = args.threshold if args.threshold is not None else load_decision_threshold(model_dir)
+        stream.metrics(start=args.since, end=args.until, threshold=threshold)
+        raise SystemExit(0)
+    
     print("\n🔍 Loading test data and model...")
     
     # Load and prepare test data
     loader = FraudDataLoader()
-    try:
-        df = loader.load_creditcard_data()
-    except FileNotFoundError:
-        df = loader.load_sample_data()
+    if args.store:
+        df = loader.load_feature_store(args.store)
+    else:
+        try:
+            df = loader.load_creditcard_data()
+        except FileNotFoundError:
+            df = loader.load_sample_data()
+    
+    if args.compare:
+        # Raw holdout rows, split as train_model.py splits them; bundles scale it themselves
+        from sklearn.model_selection import train_test_split
+        
+        preprocessor = FraudPreprocessor(test_size=0.2, random_state=42)
+        if args.store:
+            # Time-ordered holdout: the most recent rows (a contiguous memmap slice)
+            X, y, feature_names = df['X'], np.asarray(df['y']), list(df['feature_names'])
+            split = int(len(y) * (1 - preprocessor.test_size))
+            X_test, y_test = X[split:], y[split:]
+        else:
+            # Stratified random split with training's seed
+            X_df, y_series = preprocessor.split_features_target(df)
+            X, y, feature_names = X_df.to_numpy(dtype=np.float32), y_series.to_numpy(), list(X_df.columns)
+            _, test_index = train_test_split(
+                np.arange(len(y)),
+                test_size=preprocessor.test_size,
+                random_state=preprocessor.random_state,
+                stratify=y
+            )
+            test_index.sort()
+            X_test, y_test = X[test_index], y[test_index]
+        
+        comparison = FraudModelEvaluator().compare_models(
+            args.compare, X_test, y_test, feature_names,
+            threshold=args.threshold, n_jobs=args.n_jobs
+        )
+        output_dir = Path(args.output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        comparison.to_csv(output_dir / 'model_comparison.csv', index=False)
+        print(f"💾 Comparison saved to: {output_dir / 'model_comparison.csv'}")
+        raise SystemExit(0)
     
     # Preprocess
     preprocessor = FraudPreprocessor(test_size=0.2, random_state=42)
     processed_data = preprocessor.full_preprocessing_pipeline(df, apply_smote=False)
     
     # Evaluate
-    model_dir = Path(__file__).parent.parent / 'models'
     evaluator = FraudModelEvaluator(model_path=model_dir)
     
-    # Run comprehensive evaluation
-    evaluator.comprehensive_evaluation(
-        processed_data['X_test'], 
-        processed_data['y_test'],
-        output_dir='evaluation_results'
+    # Tune the threshold on part of the holdout and report on the rest
+    from sklearn.model_selection import train_test_split
+    X_val, X_test, y_val, y_test = train_test_split(
+        processed_data['X_test'], processed_data['y_test'],
+        train_size=args.validation_size, random_state=42, stratify=processed_data['y_test']
     )
+    
+    if args.report:
+        evaluator.generate_report(
+            X_test,
+            y_test,
+            output_dir=args.output_dir,
+            fp_cost=args.fp_cost,
+            fn_cost=args.fn_cost,
+            n_jobs=args.n_jobs,
+            n_bootstrap=args.bootstrap,
+            X_val=X_val,
+            y_val=y_val
+        )
+    else:
+        # Run comprehensive evaluation
+        evaluator.comprehensive_evaluation(
+            X_test, 
+            y_test,
+            output_dir=args.output_dir,
+            fp_cost=args.fp_cost,
+            fn_cost=args.fn_cost,
+            show=not args.no_show,
+            n_bootstrap=args.bootstrap,
+            X_val=X_val,
+            y_val=y_val
+        )
+    
+    if args.save_threshold:
+        evaluator.save_decision_threshold(evaluator.optimal_threshold)
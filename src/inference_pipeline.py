@@ -0,0 +1,254 @@
+"""
+Inference Pipeline Module
+=========================
+One object that turns raw named transaction features into fraud probabilities.
+
+The scaler, feature order and model used to be separate artifacts glued
+together by every consumer. FraudInferencePipeline bundles them: it takes
+dicts, lists of dicts, DataFrames or arrays in training order, and scores
+them in one call. For linear models (LogisticRegression, log-loss
+SGDClassifier) the StandardScaler is folded into the weights, so scoring
+is a single matrix-vector product.
+
+Author: Team Three Unknowns
+Date: January 2026
+"""
+
+import json
+import numpy as np
+import pandas as pd
+import joblib
+from pathlib import Path
+from scipy.special import expit
+from typing import Dict, List, Union
+
+
+PIPELINE_FILENAME = 'inference_pipeline.pkl'
+DECISION_THRESHOLD_FILENAME = 'decision_threshold.json'
+PIPELINE_FORMAT_VERSION = 1
+
+
+class FraudInferencePipeline:
+    """
+    Fused preprocessing + model for serving.
+
+    Saved as a plain dictionary of sklearn/NumPy objects, so loading it
+    does not depend on how this module was imported.
+    """
+
+    def __init__(
+        self,
+        feature_names: List[str],
+        scaler=None,
+        model=None,
+        threshold: float = 0.5
+    ):
+        """
+        Build a pipeline from training artifacts.
+
+        Args:
+            feature_names: Feature order used during training
+            scaler: Fitted StandardScaler (None if the model takes raw features)
+            model: Fitted classifier with predict_proba
+            threshold: Fraud probability at or above which a transaction is flagged
+        """
+        self.feature_names = list(feature_names)
+        self.scaler = scaler
+        self.model = model
+        self.threshold = threshold
+
+        self._mean = None
+        self._scale = None
+        if scaler is not None:
+            n_features = len(self.feature_names)
+            mean = getattr(scaler, 'mean_', None)
+            scale = getattr(scaler, 'scale_', None)
+            self._mean = np.zeros(n_features) if mean is None else np.asarray(mean, dtype=np.float64)
+            self._scale = np.ones(n_features) if scale is None else np.asarray(scale, dtype=np.float64)
+
+        self.coef_ = None
+        self.intercept_ = None
+        if _is_fusable(model):
+            coef = np.asarray(model.coef_, dtype=np.float64).ravel()
+            intercept = float(np.ravel(model.intercept_)[0])
+            if self._mean is not None:
+                # w·((x - mean) / scale) + b  ==  (w / scale)·x + (b - w·mean / scale)
+                coef = coef / self._scale
+                intercept = intercept - float(coef @ self._mean)
+            self.coef_ = coef
+            self.intercept_ = intercept
+
+    @property
+    def is_fused(self) -> bool:
+        """Whether scaling is folded into a linear model."""
+        return self.coef_ is not None
+
+    def to_matrix(self, data: Union[Dict, List[Dict], pd.DataFrame, np.ndarray]) -> np.ndarray:
+        """
+        Arrange raw features in training order (missing features become 0).
+
+        Args:
+            data: One transaction (dict), a list of dicts, a DataFrame, or
+                an array already in training feature order
+
+        Returns:
+            float64 array of shape (n_transactions, n_features)
+        """
+        if isinstance(data, dict):
+            data = [data]
+
+        if isinstance(data, list):
+            return np.array(
+                [[_as_float(row.get(name)) for name in self.feature_names] for row in data],
+                dtype=np.float64
+            ).reshape(len(data), len(self.feature_names))
+
+        if isinstance(data, pd.DataFrame):
+            if list(data.columns) != self.feature_names:
+                data = data.reindex(columns=self.feature_names, fill_value=0)
+            return data.to_numpy(dtype=np.float64)
+
+        X = np.asarray(data, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != len(self.feature_names):
+            raise ValueError(
+                f"X has {X.shape[1]} features but the pipeline expects {len(self.feature_names)}"
+            )
+        return X
+
+    def score_matrix(self, X: np.ndarray) -> np.ndarray:
+        """
+        Fraud probabilities for a raw feature matrix in training order.
+
+        Args:
+            X: Array of shape (n_transactions, n_features)
+
+        Returns:
+            1-D array of fraud probabilities
+        """
+        if self.is_fused:
+            return expit(X @ self.coef_ + self.intercept_)
+
+        if self._mean is not None:
+            X = (X - self._mean) / self._scale
+        return self.model.predict_proba(X)[:, 1]
+
+    def score(self, data) -> np.ndarray:
+        """
+        Fraud probabilities for raw named features.
+
+        Args:
+            data: dict, list of dicts, DataFrame or array (see to_matrix)
+
+        Returns:
+            1-D array of fraud probabilities
+        """
+        return self.score_matrix(self.to_matrix(data))
+
+    def predict(self, data) -> np.ndarray:
+        """Fraud labels (1 = fraud) at the pipeline threshold."""
+        return (self.score(data) >= self.threshold).astype(int)
+
+    def to_dict(self) -> dict:
+        """Serializable representation (sklearn/NumPy objects only)."""
+        return {
+            'format_version': PIPELINE_FORMAT_VERSION,
+            'feature_names': self.feature_names,
+            'scaler': self.scaler,
+            'model': self.model,
+            'threshold': self.threshold
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FraudInferencePipeline':
+        """Rebuild a pipeline from to_dict() output."""
+        return cls(
+            data['feature_names'],
+            scaler=data.get('scaler'),
+            model=data['model'],
+            threshold=data.get('threshold', 0.5)
+        )
+
+    def save(self, filepath: Union[str, Path]):
+        """Save the pipeline to disk."""
+        joblib.dump(self.to_dict(), filepath)
+        print(f"💾 Inference pipeline saved to: {filepath}"
+              f"{' (scaling fused into linear model)' if self.is_fused else ''}")
+
+    @classmethod
+    def load(cls, filepath: Union[str, Path]) -> 'FraudInferencePipeline':
+        """
+        Load a saved pipeline.
+
+        Raises:
+            FileNotFoundError: If the pipeline file does not exist
+        """
+        try:
+            return cls.from_dict(joblib.load(filepath))
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"Inference pipeline not found at {filepath}. "
+                "Please train the model first."
+            )
+
+
+def load_model_bundle(model_dir: Union[str, Path]) -> FraudInferencePipeline:
+    """
+    Load the inference pipeline from a model directory.
+
+    Falls back to assembling it from fraud_detector.pkl, scaler.pkl and
+    feature_names.pkl for model directories written before the pipeline
+    artifact existed (using decision_threshold.json, if present, for the
+    threshold).
+
+    Args:
+        model_dir: Directory containing the model artifacts
+
+    Returns:
+        FraudInferencePipeline
+
+    Raises:
+        FileNotFoundError: If neither the pipeline nor the model files exist
+    """
+    model_dir = Path(model_dir)
+    pipeline_path = model_dir / PIPELINE_FILENAME
+    if pipeline_path.exists():
+        return FraudInferencePipeline.load(pipeline_path)
+
+    for filename in ('fraud_detector.pkl', 'scaler.pkl', 'feature_names.pkl'):
+        if not (model_dir / filename).exists():
+            raise FileNotFoundError(
+                f"{filename} not found in {model_dir}. Please train the model first."
+            )
+
+    return FraudInferencePipeline(
+        joblib.load(model_dir / 'feature_names.pkl'),
+        scaler=joblib.load(model_dir / 'scaler.pkl'),
+        model=joblib.load(model_dir / 'fraud_detector.pkl'),
+        threshold=load_decision_threshold(model_dir)
+    )
+
+
+def load_decision_threshold(model_dir: Union[str, Path], default: float = 0.5) -> float:
+    """Threshold saved in decision_threshold.json, or default if there is none."""
+    threshold_path = Path(model_dir) / DECISION_THRESHOLD_FILENAME
+    if not threshold_path.exists():
+        return default
+    with open(threshold_path) as f:
+        return float(json.load(f)['threshold'])
+
+
+def _is_fusable(model) -> bool:
+    """Binary linear model whose probabilities are sigmoid(w·x + b)."""
+    if model is None or not hasattr(model, 'coef_') or len(getattr(model, 'classes_', [])) != 2:
+        return False
+    name = type(model).__name__
+    if name == 'LogisticRegression':
+        return True
+    return name == 'SGDClassifier' and getattr(model, 'loss', None) == 'log_loss'
+
+
+def _as_float(value) -> float:
+    """Missing (None) features are treated as 0, like preprocess_transaction."""
+    return 0.0 if value is None else float(value)
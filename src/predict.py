@@ -7,13 +7,21 @@ This script loads the trained model and makes predictions on new transactions.
 Usage:
     python predict.py                    # Interactive mode
     python predict.py --batch <file>     # Batch prediction mode
+    python predict.py --batch <store>    # Batch mode over a memory-mapped feature store
+    python predict.py --bench            # Latency/throughput benchmark (JSON)
 """
 
+import os
 import sys
+import json
+import time
+import shutil
+import platform
 import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from typing import Tuple
 
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent))
@@ -22,11 +30,16 @@ from utils import (
     load_model,
     load_scaler,
     load_feature_names,
-    preprocess_transaction,
     interpret_prediction,
+    build_batch_results,
+    file_checksum,
+    write_json_atomic,
+    summarize_latencies,
     print_prediction_report,
     save_prediction_log
 )
+from data_loader import FraudDataLoader
+from inference_pipeline import FraudInferencePipeline, PIPELINE_FILENAME, load_decision_threshold
 
 
 class FraudDetector:
@@ -36,12 +49,14 @@ class FraudDetector:
     Loads trained model and makes predictions on new transactions.
     """
     
-    def __init__(self, model_dir: str = None):
+    def __init__(self, model_dir: str = None, threshold: float = None):
         """
         Initialize fraud detector by loading model and preprocessing components.
         
         Args:
             model_dir: Directory containing saved model files (defaults to project models/)
+            threshold: Fraud probability at or above which a transaction is
+                flagged (defaults to the threshold saved with the model, else 0.5)
         """
         # Use absolute path relative to script location
         if model_dir is None:
@@ -53,10 +68,22 @@ class FraudDetector:
         print("🔧 Loading fraud detection system...")
         
         try:
-            # Load model components
-            self.model = load_model(str(self.model_dir / 'fraud_detector.pkl'))
-            self.scaler = load_scaler(str(self.model_dir / 'scaler.pkl'))
-            self.feature_names = load_feature_names(str(self.model_dir / 'feature_names.pkl'))
+            # Load the exported inference pipeline, or assemble it from the
+            # separate model components of older model directories
+            pipeline_path = self.model_dir / PIPELINE_FILENAME
+            if pipeline_path.exists():
+                self.pipeline = FraudInferencePipeline.load(pipeline_path)
+            else:
+                self.pipeline = FraudInferencePipeline(
+                    load_feature_names(str(self.model_dir / 'feature_names.pkl')),
+                    scaler=load_scaler(str(self.model_dir / 'scaler.pkl')),
+                    model=load_model(str(self.model_dir / 'fraud_detector.pkl')),
+                    threshold=load_decision_threshold(self.model_dir)
+                )
+            self.model = self.pipeline.model
+            self.scaler = self.pipeline.scaler
+            self.feature_names = self.pipeline.feature_names
+            self.threshold = threshold if threshold is not None else self.pipeline.threshold
             
             print(f"✅ Model loaded successfully!")
             print(f"📊 Features required: {len(self.feature_names)}")
@@ -79,19 +106,12 @@ class FraudDetector:
         Returns:
             Dictionary with prediction results
         """
-        # Preprocess transaction
-        features = preprocess_transaction(
-            transaction_data,
-            self.scaler,
-            self.feature_names
-        )
-        
-        # Make prediction
-        prediction = self.model.predict(features)[0]
-        probability = self.model.predict_proba(features)[0, 1]
+        # Score once and derive the label from the probability
+        probability = float(self.pipeline.score(transaction_data)[0])
+        prediction = int(probability >= self.threshold)
         
         # Interpret results
-        result = interpret_prediction(prediction, probability)
+        result = interpret_prediction(prediction, probability, self.threshold)
         
         # Print report if verbose
         if verbose:
@@ -99,42 +119,34 @@ class FraudDetector:
         
         return result
     
-    def predict_batch(self, data: pd.DataFrame, output_file: str = None) -> pd.DataFrame:
+    def predict_batch(
+        self,
+        data: pd.DataFrame,
+        output_file: str = None,
+        output_mode: str = 'attach',
+        id_column: str = None
+    ) -> pd.DataFrame:
         """
         Predict fraud for multiple transactions.
         
         Args:
             data: DataFrame with transaction data
             output_file: Optional path to save results
+            output_mode: How results are returned:
+                - 'attach': add result columns to `data` in place (no copy)
+                - 'separate': return only the result columns, aligned with `data`
+                - 'scores': return only transaction IDs and fraud probabilities
+            id_column: Column identifying transactions in 'separate'/'scores'
+                mode (defaults to the DataFrame index)
             
         Returns:
             DataFrame with predictions
         """
         print(f"\n🔄 Processing {len(data)} transactions...")
         
-        # Preprocess all transactions
-        features = preprocess_transaction(
-            data,
-            self.scaler,
-            self.feature_names
-        )
-        
-        # Make predictions
-        predictions = self.model.predict(features)
-        probabilities = self.model.predict_proba(features)[:, 1]
-        
-        # Add results to dataframe
-        results = data.copy()
-        results['Prediction'] = ['FRAUD' if p == 1 else 'GENUINE' for p in predictions]
-        results['Fraud_Probability'] = probabilities
-        results['Risk_Level'] = pd.cut(
-            probabilities,
-            bins=[0, 0.3, 0.5, 0.8, 1.0],
-            labels=['VERY LOW', 'LOW', 'MEDIUM', 'HIGH']
-        )
+        results, fraud_count = self._score_frame(data, output_mode, id_column)
         
         # Summary
-        fraud_count = (predictions == 1).sum()
         print(f"\n✅ Batch prediction completed!")
         print(f"   - Total transactions: {len(data)}")
         print(f"   - Predicted as FRAUD: {fraud_count} ({fraud_count/len(data)*100:.2f}%)")
@@ -146,6 +158,237 @@ class FraudDetector:
             print(f"\n💾 Results saved to: {output_file}")
         
         return results
+    
+    def _score_frame(
+        self,
+        data: pd.DataFrame,
+        output_mode: str = 'attach',
+        id_column: str = None
+    ) -> Tuple[pd.DataFrame, int]:
+        """
+        Score a frame and assemble its result columns.
+        
+        Args:
+            data: DataFrame with transaction data
+            output_mode: 'attach', 'separate' or 'scores' (see predict_batch)
+            id_column: Transaction ID column (defaults to the index)
+            
+        Returns:
+            Tuple of (results DataFrame, number of transactions flagged as fraud)
+        """
+        if output_mode not in ('attach', 'separate', 'scores'):
+            raise ValueError(f"Unknown output mode: {output_mode}")
+        
+        # Score once; labels and risk levels are derived from probabilities
+        probabilities = self.pipeline.score(data) if len(data) else np.empty(0)
+        
+        if output_mode == 'attach':
+            scored = build_batch_results(probabilities, self.threshold, index=data.index)
+            for column in scored.columns:
+                data[column] = scored[column]
+            results = data
+        else:
+            ids = data[id_column] if id_column else data.index
+            results = build_batch_results(
+                probabilities,
+                self.threshold,
+                index=data.index,
+                ids=ids,
+                id_column=id_column or 'id',
+                scores_only=(output_mode == 'scores')
+            )
+        
+        fraud_count = int((probabilities >= self.threshold).sum())
+        return results, fraud_count
+    
+    def model_checksum(self) -> str:
+        """SHA-256 of the model artifacts on disk."""
+        filenames = [PIPELINE_FILENAME, 'fraud_detector.pkl', 'scaler.pkl', 'feature_names.pkl']
+        return file_checksum(*[
+            self.model_dir / name for name in filenames if (self.model_dir / name).exists()
+        ])
+    
+    def predict_batch_resumable(
+        self,
+        input_file: str,
+        output_file: str,
+        chunk_size: int = 100_000,
+        resume: bool = False,
+        output_mode: str = 'attach',
+        id_column: str = None
+    ) -> dict:
+        """
+        Score a large file chunk by chunk with resumable progress checkpoints.
+        
+        Each scored chunk is written as an output shard next to a state file
+        (<output>.checkpoint/state.json) recording the next row to score and
+        the model checksum. With resume=True a failed run continues from the
+        last committed chunk; the shards are concatenated into output_file at
+        the end, byte-identical to an uninterrupted run. Once every chunk is
+        committed the state is marked complete, so a run that stopped while
+        assembling resumes without reading the input again.
+        
+        Args:
+            input_file: CSV file or feature store directory
+            output_file: Path of the final CSV output
+            chunk_size: Rows scored per checkpointed chunk
+            resume: Continue from an existing checkpoint
+            output_mode: 'attach', 'separate' or 'scores' (see predict_batch)
+            id_column: Transaction ID column (defaults to the row number)
+            
+        Returns:
+            Dictionary with run summary (rows, fraud_count, chunks)
+            
+        Raises:
+            ValueError: If the checkpoint belongs to a different model,
+                input file or run configuration
+        """
+        checkpoint_dir = Path(f"{output_file}.checkpoint")
+        state_path = checkpoint_dir / 'state.json'
+        
+        config = {
+            'input_file': str(Path(input_file).resolve()),
+            'input_files': _input_fingerprint(input_file),
+            'model_checksum': self.model_checksum(),
+            'chunk_size': chunk_size,
+            'output_mode': output_mode,
+            'id_column': id_column,
+            'threshold': self.threshold
+        }
+        
+        if resume and state_path.exists():
+            with open(state_path) as f:
+                state = json.load(f)
+            
+            if state['model_checksum'] != config['model_checksum']:
+                raise ValueError(
+                    "Model changed since the checkpoint was written. "
+                    "Refusing to resume; rerun without --resume."
+                )
+            mismatched = [
+                key for key in config
+                if key != 'model_checksum' and state.get(key) != config[key]
+            ]
+            if mismatched:
+                raise ValueError(
+                    f"Checkpoint was written with different settings ({', '.join(mismatched)}). "
+                    "Refusing to resume; rerun without --resume."
+                )
+            print(f"⏩ Resuming from row {state['next_row']:,} "
+                  f"({len(state['shards'])} chunks committed)")
+        else:
+            if checkpoint_dir.exists():
+                shutil.rmtree(checkpoint_dir)
+            checkpoint_dir.mkdir(parents=True)
+            state = {**config, 'next_row': 0, 'fraud_count': 0, 'shards': [], 'complete': False}
+            write_json_atomic(state_path, state)
+        
+        if state['complete']:
+            # Every chunk was committed before the run stopped; only assemble
+            print(f"⏩ All {len(state['shards'])} chunks already scored")
+        else:
+            print(f"\n🔄 Scoring {input_file} in chunks of {chunk_size:,} rows...")
+            
+            for chunk in _iter_input_chunks(input_file, chunk_size, state['next_row']):
+                results, fraud_count = self._score_frame(chunk, output_mode, id_column)
+                
+                # Commit the shard first, then the state that points past it
+                shard_name = f"part-{len(state['shards']):05d}.csv"
+                tmp_path = checkpoint_dir / f"{shard_name}.tmp"
+                results.to_csv(tmp_path, index=False, header=(state['next_row'] == 0))
+                os.replace(tmp_path, checkpoint_dir / shard_name)
+                
+                state['shards'].append(shard_name)
+                state['next_row'] += len(chunk)
+                state['fraud_count'] += fraud_count
+                write_json_atomic(state_path, state)
+                
+                print(f"   ✅ Committed chunk {len(state['shards'])} "
+                      f"(rows scored: {state['next_row']:,})")
+            
+            state['complete'] = True
+            write_json_atomic(state_path, state)
+        
+        # Assemble the final output from the committed shards
+        tmp_output = Path(f"{output_file}.tmp")
+        with open(tmp_output, 'wb') as out:
+            for shard_name in state['shards']:
+                with open(checkpoint_dir / shard_name, 'rb') as shard:
+                    shutil.copyfileobj(shard, out)
+        os.replace(tmp_output, output_file)
+        shutil.rmtree(checkpoint_dir)
+        
+        total = state['next_row']
+        fraud_count = state['fraud_count']
+        print(f"\n✅ Batch prediction completed!")
+        print(f"   - Total transactions: {total}")
+        if total:
+            print(f"   - Predicted as FRAUD: {fraud_count} ({fraud_count/total*100:.2f}%)")
+        print(f"   - Predicted as GENUINE: {total - fraud_count}")
+        print(f"\n💾 Results saved to: {output_file}")
+        
+        return {
+            'rows': total,
+            'fraud_count': fraud_count,
+            'chunks': len(state['shards'])
+        }
+
+
+def _iter_input_chunks(input_file: str, chunk_size: int, start_row: int = 0):
+    """
+    Yield DataFrame chunks of a CSV file or feature store from start_row.
+    
+    Chunks carry a global RangeIndex so row numbers stay stable on resume.
+    An input without rows yields one empty chunk, so the output still gets
+    its header.
+    """
+    if Path(input_file).is_dir():
+        store = FraudDataLoader().load_feature_store(input_file)
+        X = store['X']
+        if X.shape[0] == 0 and start_row == 0:
+            yield pd.DataFrame(X, columns=store['feature_names'])
+        for start in range(start_row, X.shape[0], chunk_size):
+            stop = min(start + chunk_size, X.shape[0])
+            yield pd.DataFrame(
+                X[start:stop],
+                columns=store['feature_names'],
+                index=pd.RangeIndex(start, stop),
+                copy=False
+            )
+        return
+    
+    start = start_row
+    yielded = False
+    reader = pd.read_csv(
+        input_file,
+        chunksize=chunk_size,
+        skiprows=range(1, start_row + 1)
+    )
+    for chunk in reader:
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yielded = True
+        yield chunk
+    if not yielded and start_row == 0:
+        yield pd.read_csv(input_file, nrows=0)
+
+
+def _input_fingerprint(input_file: str) -> list:
+    """
+    Name, size and modification time of every data file of an input.
+    
+    For a feature store directory these are the files inside it: the
+    directory's own mtime does not change when features.npy is rewritten
+    in place.
+    """
+    path = Path(input_file)
+    files = sorted(p for p in path.rglob('*') if p.is_file()) if path.is_dir() else [path]
+    fingerprint = []
+    for file in files:
+        stat = file.stat()
+        fingerprint.append([str(file.relative_to(path)) if path.is_dir() else file.name,
+                            stat.st_size, stat.st_mtime_ns])
+    return fingerprint
 
 
 def interactive_mode():
@@ -219,13 +462,28 @@ def interactive_mode():
     print("\n👋 Thank you for using the Fraud Detection System!")
 
 
-def batch_mode(input_file: str, output_file: str = None):
+def batch_mode(
+    input_file: str,
+    output_file: str = None,
+    output_mode: str = 'attach',
+    id_column: str = None,
+    chunk_size: int = 100_000,
+    resume: bool = False
+):
     """
-    Batch mode: Process transactions from CSV file.
+    Batch mode: Process transactions from a CSV file or feature store.
+    
+    When an output file is given, the input is scored in checkpointed
+    chunks so that an interrupted run can be continued with resume=True.
     
     Args:
-        input_file: Path to CSV file with transactions
+        input_file: Path to CSV file with transactions, or a feature store
+            directory written by FraudDataLoader.save_feature_store()
         output_file: Path to save results (optional)
+        output_mode: 'attach', 'separate' or 'scores' (see predict_batch)
+        id_column: Transaction ID column for 'separate'/'scores' output
+        chunk_size: Rows per checkpointed chunk (with output_file)
+        resume: Continue an interrupted run from its last committed chunk
     """
     print("\n" + "=" * 70)
     print("BATCH FRAUD DETECTION")
@@ -234,9 +492,34 @@ def batch_mode(input_file: str, output_file: str = None):
     # Initialize detector
     detector = FraudDetector()
     
+    if not Path(input_file).exists():
+        print(f"❌ Error: File not found - {input_file}")
+        return
+    
+    if output_file:
+        try:
+            detector.predict_batch_resumable(
+                input_file, output_file, chunk_size, resume, output_mode, id_column
+            )
+        except (ValueError, FileNotFoundError) as e:
+            print(f"❌ Error: {e}")
+            return
+        
+        results = pd.read_csv(output_file, nrows=10)
+        print("\n📊 Sample Results (first 10):")
+        display_cols = [id_column or 'id', 'Amount', 'Prediction', 'Fraud_Probability', 'Risk_Level']
+        available_cols = [col for col in display_cols if col in results.columns]
+        print(results[available_cols].to_string(index=False))
+        return
+    
     # Load data
     try:
-        data = pd.read_csv(input_file)
+        if Path(input_file).is_dir():
+            # Memory-mapped store: wrap the mapped matrix without copying it
+            store = FraudDataLoader().load_feature_store(input_file)
+            data = pd.DataFrame(store['X'], columns=store['feature_names'], copy=False)
+        else:
+            data = pd.read_csv(input_file)
         print(f"\n✅ Loaded {len(data)} transactions from {input_file}")
     except FileNotFoundError:
         print(f"❌ Error: File not found - {input_file}")
@@ -246,15 +529,212 @@ def batch_mode(input_file: str, output_file: str = None):
         return
     
     # Make predictions
-    results = detector.predict_batch(data, output_file)
+    results = detector.predict_batch(data, output_file, output_mode, id_column)
     
     # Show sample results
     print("\n📊 Sample Results (first 10):")
-    display_cols = ['Amount', 'Prediction', 'Fraud_Probability', 'Risk_Level']
+    display_cols = [id_column or 'id', 'Amount', 'Prediction', 'Fraud_Probability', 'Risk_Level']
     available_cols = [col for col in display_cols if col in results.columns]
     print(results[available_cols].head(10).to_string(index=False))
 
 
+DEFAULT_BENCH_BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+
+
+def bench_transactions(
+    n_rows: int,
+    feature_names: list,
+    sample_file: str = None,
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Build benchmark transactions, sampled from a CSV file or synthetic.
+    
+    Args:
+        n_rows: Number of transactions
+        feature_names: Model feature order
+        sample_file: CSV to sample rows from (with replacement); synthetic if None
+        seed: Random seed
+        
+    Returns:
+        DataFrame with the model features
+    """
+    rng = np.random.default_rng(seed)
+    
+    if sample_file:
+        source = pd.read_csv(sample_file)
+        source = source.reindex(columns=feature_names, fill_value=0)
+        rows = rng.integers(0, len(source), n_rows)
+        return source.iloc[rows].reset_index(drop=True)
+    
+    data = {}
+    for feature in feature_names:
+        if feature == 'Time':
+            data[feature] = rng.uniform(0, 172800, n_rows)
+        elif feature == 'Amount':
+            data[feature] = rng.lognormal(3.5, 1.2, n_rows)
+        else:
+            data[feature] = rng.standard_normal(n_rows)
+    return pd.DataFrame(data)
+
+
+def run_benchmark(
+    detector: FraudDetector,
+    sample_file: str = None,
+    n_single: int = 1_000,
+    batch_sizes: list = None,
+    min_time: float = 0.5,
+    seed: int = 42
+) -> dict:
+    """
+    Measure single-row latency and batch throughput of the scoring path.
+    
+    Single-row latency is split into preprocessing (arranging raw features
+    in training order), the model call (scaling + classifier, fused for
+    linear models) and interpret_prediction. Batch throughput is measured per batch size,
+    repeating each size until at least `min_time` seconds have elapsed.
+    
+    Args:
+        detector: Loaded FraudDetector
+        sample_file: CSV to sample transactions from (synthetic if None)
+        n_single: Number of single-row predictions to time
+        batch_sizes: Batch sizes to measure (default 1..100k)
+        min_time: Minimum measured time per batch size (seconds)
+        seed: Random seed for the benchmark transactions
+        
+    Returns:
+        JSON-serializable dictionary with results and environment metadata
+        
+    Raises:
+        ValueError: If n_single or a batch size is below 1
+    """
+    import sklearn
+    
+    batch_sizes = batch_sizes or DEFAULT_BENCH_BATCH_SIZES
+    if n_single < 1:
+        raise ValueError(f"n_single must be at least 1, got {n_single}")
+    if min(batch_sizes) < 1:
+        raise ValueError(f"Batch sizes must be at least 1, got {batch_sizes}")
+    pool = bench_transactions(
+        max(max(batch_sizes), n_single), detector.feature_names, sample_file, seed
+    )
+    
+    # Single-row latency, stage by stage
+    records = pool.head(n_single).to_dict(orient='records')
+    for record in records[:min(20, n_single)]:  # Warm-up
+        detector.predict_single(record, verbose=False)
+    
+    stage_ns = {'preprocess': [], 'model': [], 'interpret': [], 'total': []}
+    for record in records:
+        t0 = time.perf_counter_ns()
+        features = detector.pipeline.to_matrix(record)
+        t1 = time.perf_counter_ns()
+        probability = float(detector.pipeline.score_matrix(features)[0])
+        t2 = time.perf_counter_ns()
+        interpret_prediction(int(probability >= detector.threshold), probability, detector.threshold)
+        t3 = time.perf_counter_ns()
+        stage_ns['preprocess'].append(t1 - t0)
+        stage_ns['model'].append(t2 - t1)
+        stage_ns['interpret'].append(t3 - t2)
+        stage_ns['total'].append(t3 - t0)
+    
+    single_row = {stage: summarize_latencies(samples) for stage, samples in stage_ns.items()}
+    
+    # Batch throughput
+    batch_results = []
+    for size in batch_sizes:
+        batch = pool.head(size)
+        timings = {'preprocess': [], 'model': [], 'assemble': [], 'total': []}
+        elapsed = 0.0
+        while elapsed < min_time or not timings['total']:
+            t0 = time.perf_counter()
+            features = detector.pipeline.to_matrix(batch)
+            t1 = time.perf_counter()
+            probabilities = detector.pipeline.score_matrix(features)
+            t2 = time.perf_counter()
+            build_batch_results(probabilities, detector.threshold, index=batch.index)
+            t3 = time.perf_counter()
+            timings['preprocess'].append(t1 - t0)
+            timings['model'].append(t2 - t1)
+            timings['assemble'].append(t3 - t2)
+            timings['total'].append(t3 - t0)
+            elapsed += t3 - t0
+        
+        median = {stage: float(np.median(values)) for stage, values in timings.items()}
+        batch_results.append({
+            'batch_size': size,
+            'repeats': len(timings['total']),
+            'median_seconds': {stage: round(value, 6) for stage, value in median.items()},
+            'rows_per_second': round(size / median['total'], 1)
+        })
+    
+    return {
+        'benchmark': 'predict',
+        'created_at': pd.Timestamp.now().isoformat(),
+        'model': {
+            'dir': str(detector.model_dir),
+            'type': type(detector.model).__name__,
+            'fused': detector.pipeline.is_fused,
+            'checksum': detector.model_checksum(),
+            'n_features': len(detector.feature_names),
+            'threshold': detector.threshold
+        },
+        'data': 'sampled' if sample_file else 'synthetic',
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'scikit_learn': sklearn.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count()
+        },
+        'single_row_latency': single_row,
+        'batch_throughput': batch_results
+    }
+
+
+def bench_mode(
+    sample_file: str = None,
+    output_file: str = None,
+    n_single: int = 1_000,
+    batch_sizes: list = None,
+    model_dir: str = None
+):
+    """
+    Bench mode: Measure scoring latency and throughput and emit JSON.
+    
+    Args:
+        sample_file: CSV to sample transactions from (synthetic if None)
+        output_file: Path to save the JSON results (printed if None)
+        n_single: Number of single-row predictions to time
+        batch_sizes: Batch sizes to measure
+        model_dir: Model directory (defaults to project models/)
+    """
+    print("\n" + "=" * 70)
+    print("SCORING BENCHMARK")
+    print("=" * 70)
+    
+    detector = FraudDetector(model_dir)
+    print(f"\n⏱️  Timing {n_single:,} single-row predictions and "
+          f"{len(batch_sizes or DEFAULT_BENCH_BATCH_SIZES)} batch sizes...")
+    results = run_benchmark(detector, sample_file, n_single, batch_sizes)
+    
+    total = results['single_row_latency']['total']
+    print(f"\n✅ Single-row latency: p50 {total['p50_us']:.1f} µs | "
+          f"p99 {total['p99_us']:.1f} µs | max {total['max_us']:.1f} µs")
+    for entry in results['batch_throughput']:
+        print(f"   Batch {entry['batch_size']:>7,}: {entry['rows_per_second']:>14,.0f} rows/s")
+    
+    report = json.dumps(results, indent=2)
+    if output_file:
+        with open(output_file, 'w') as f:
+            f.write(report)
+        print(f"\n💾 Benchmark results saved to: {output_file}")
+    else:
+        print(report)
+
+
 def demo_mode():
     """
     Demo mode: Show example predictions with pre-defined transactions.
@@ -322,19 +802,81 @@ Examples:
   python predict.py --demo                   # Demo mode with examples
   python predict.py --batch input.csv        # Batch prediction
   python predict.py --batch input.csv --output results.csv
+  python predict.py --batch input.csv --output scores.csv --output-mode scores --id-column id
+  python predict.py --batch big.csv --output results.csv --resume   # Continue a failed run
+  python predict.py --bench --output bench.json                # Benchmark to JSON
+  python predict.py --batch ../data/processed/creditcard   # Feature store
         """
     )
     
     parser.add_argument(
         '--batch',
         type=str,
-        help='Batch mode: Path to CSV file with transactions'
+        help='Batch mode: Path to CSV file or feature store directory'
     )
     
     parser.add_argument(
         '--output',
         type=str,
-        help='Output file for batch predictions (CSV)'
+        help='Output file for batch predictions (CSV) or benchmark results (JSON)'
+    )
+    
+    parser.add_argument(
+        '--output-mode',
+        choices=['attach', 'separate', 'scores'],
+        default='attach',
+        help='Batch output: input plus results, results only, or IDs plus scores'
+    )
+    
+    parser.add_argument(
+        '--id-column',
+        type=str,
+        help='Transaction ID column used with --output-mode separate/scores'
+    )
+    
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=100_000,
+        help='Rows per checkpointed chunk when writing batch output (default: 100000)'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume an interrupted batch run from its last committed chunk'
+    )
+    
+    parser.add_argument(
+        '--bench',
+        action='store_true',
+        help='Benchmark mode: measure latency/throughput and emit JSON'
+    )
+    
+    parser.add_argument(
+        '--bench-data',
+        type=str,
+        help='CSV to sample benchmark transactions from (default: synthetic)'
+    )
+    
+    parser.add_argument(
+        '--bench-rows',
+        type=int,
+        default=1_000,
+        help='Number of single-row predictions to time (default: 1000)'
+    )
+    
+    parser.add_argument(
+        '--batch-sizes',
+        type=int,
+        nargs='+',
+        help='Batch sizes to benchmark (default: 1 10 100 1000 10000 100000)'
+    )
+    
+    parser.add_argument(
+        '--model-dir',
+        type=str,
+        help='Model directory for bench mode (default: project models/)'
     )
     
     parser.add_argument(
@@ -346,10 +888,21 @@ Examples:
     args = parser.parse_args()
     
     # Determine mode
-    if args.demo:
+    if args.bench:
+        if args.bench_rows < 1:
+            parser.error('--bench-rows must be at least 1')
+        if args.batch_sizes is not None and (not args.batch_sizes or min(args.batch_sizes) < 1):
+            parser.error('--batch-sizes must be at least 1')
+        bench_mode(args.bench_data, args.output, args.bench_rows, args.batch_sizes, args.model_dir)
+    elif args.demo:
         demo_mode()
     elif args.batch:
-        batch_mode(args.batch, args.output)
+        if args.resume and not args.output:
+            parser.error('--resume requires --output')
+        batch_mode(
+            args.batch, args.output, args.output_mode, args.id_column,
+            args.chunk_size, args.resume
+        )
     else:
         interactive_mode()
 
@@ -11,11 +11,22 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
+from sklearn.neighbors import NearestNeighbors
+from sklearn.utils.class_weight import compute_sample_weight
 from imblearn.over_sampling import SMOTE
 from typing import Tuple
+import time
+import tracemalloc
 import joblib
 from pathlib import Path
 
+from utils import StageProfiler
+from velocity_features import backfill_velocity_features
+
+
+# Class-imbalance strategies accepted by FraudPreprocessor.handle_imbalance
+RESAMPLING_STRATEGIES = ['smote', 'smote_sample', 'undersample', 'class_weight']
+
 
 class FraudPreprocessor:
     """
@@ -24,32 +35,57 @@ class FraudPreprocessor:
     Includes:
     - Feature scaling
     - Train-test split
-    - SMOTE for handling class imbalance
+    - Class imbalance handling (SMOTE, negative downsampling, class weights)
     """
     
-    def __init__(self, test_size: float = 0.2, random_state: int = 42):
+    def __init__(
+        self,
+        test_size: float = 0.2,
+        random_state: int = 42,
+        resampling: str = 'smote',
+        n_jobs: int = None,
+        entity_column: str = None
+    ):
         """
         Initialize preprocessor.
         
         Args:
             test_size: Proportion of data for testing (0.0-1.0)
             random_state: Random seed for reproducibility
+            resampling: Imbalance strategy used by the pipeline:
+                'smote', 'smote_sample', 'undersample' or 'class_weight'
+            n_jobs: Parallel jobs for neighbor searches (-1 = all cores)
+            entity_column: Card/customer id column; when present, per-entity
+                velocity features are backfilled and the id column is dropped
         """
+        if resampling not in RESAMPLING_STRATEGIES:
+            raise ValueError(f"Unknown resampling strategy: {resampling}")
+        
         self.test_size = test_size
         self.random_state = random_state
+        self.resampling = resampling
+        self.n_jobs = n_jobs
+        self.entity_column = entity_column
         self.scaler = StandardScaler()
         self.feature_columns = None
+        self.sample_weight = None
         
     def split_features_target(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
         """
         Separate features (X) from target (y).
         
         Args:
-            df: Full dataset with 'Class' column
+            df: Full dataset with 'Class' column, or a feature store opened
+                with FraudDataLoader.load_feature_store()
             
         Returns:
             Tuple of (X, y)
         """
+        if isinstance(df, dict):
+            return self.split_feature_store(df)
+        
+        df = self.add_velocity_features(df)
+        
         # Target column
         y = df['Class']
         
@@ -64,6 +100,50 @@ class FraudPreprocessor:
         
         return X, y
     
+    def add_velocity_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Replace the entity id column with per-entity velocity features.
+        
+        Uses the same windows and arithmetic as the online
+        VelocityFeatureStore, so training and serving features match.
+        
+        Args:
+            df: Dataset, possibly containing `entity_column`
+            
+        Returns:
+            DataFrame with velocity features (df unchanged if there is no entity column)
+        """
+        if self.entity_column is None or self.entity_column not in df.columns:
+            return df
+        
+        velocity = backfill_velocity_features(df, self.entity_column)
+        print(f"🏃 Velocity features from '{self.entity_column}': {', '.join(velocity.columns)}")
+        return pd.concat([df.drop(columns=self.entity_column), velocity], axis=1)
+    
+    def split_feature_store(self, store: dict) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Take features and target from a memory-mapped feature store.
+        
+        No data is copied here: X and y stay backed by the store files.
+        
+        Args:
+            store: Dictionary returned by FraudDataLoader.load_feature_store()
+            
+        Returns:
+            Tuple of (X, y) as memory-mapped arrays
+        """
+        if store['y'] is None:
+            raise ValueError(f"Feature store {store['path']} has no labels")
+        
+        X, y = store['X'], store['y']
+        self.feature_columns = list(store['feature_names'])
+        
+        counts = np.bincount(y, minlength=2)
+        print(f"📊 Features: {len(self.feature_columns)} (memory-mapped)")
+        print(f"   Target distribution: {{0: {counts[0]}, 1: {counts[1]}}}")
+        
+        return X, y
+    
     def train_test_split_data(
         self, 
         X: pd.DataFrame, 
@@ -119,98 +199,459 @@ class FraudPreprocessor:
         X_test_scaled = self.scaler.transform(X_test)
         
         print(f"   ✅ Features scaled (mean=0, std=1)")
-        print(f"   Example - Before: {X_train.iloc[0, 0]:.4f}")
+        first_value = X_train.iloc[0, 0] if isinstance(X_train, pd.DataFrame) else X_train[0, 0]
+        print(f"   Example - Before: {first_value:.4f}")
         print(f"   Example - After:  {X_train_scaled[0, 0]:.4f}")
         
         return X_train_scaled, X_test_scaled
     
+    def fit_scaler_incremental(self, chunks, feature_names: list = None) -> StandardScaler:
+        """
+        Fit the scaler out-of-core with partial_fit over data chunks.
+        
+        Args:
+            chunks: Iterable of DataFrames (e.g. FraudDataLoader.iter_chunks())
+            feature_names: Feature order (defaults to all non-'Class' columns)
+            
+        Returns:
+            Fitted StandardScaler (rows seen are kept in self.n_rows_fitted)
+        """
+        print("\n⚖️  Fitting scaler incrementally...")
+        
+        self.scaler = StandardScaler()
+        self.n_rows_fitted = 0
+        n_chunks = 0
+        
+        for chunk in chunks:
+            if feature_names is None:
+                feature_names = [col for col in chunk.columns if col != 'Class']
+            self.scaler.partial_fit(chunk[feature_names])
+            self.n_rows_fitted += len(chunk)
+            n_chunks += 1
+        
+        self.feature_columns = list(feature_names)
+        print(f"   ✅ Scaler fitted on {self.n_rows_fitted:,} rows in {n_chunks} chunks")
+        
+        return self.scaler
+    
+    def scale_to_store(
+        self,
+        loader,
+        source,
+        store_name: str,
+        chunksize: int = 100_000,
+        fit: bool = True
+    ) -> Path:
+        """
+        Scale a dataset chunk by chunk into a float32 feature store.
+        
+        The first pass fits the scaler with partial_fit (with fit=False, e.g.
+        to transform a test set with the training scaler, only the row count
+        is read via loader.count_rows()); the second pass transforms each
+        chunk and writes it into a memory-mapped store. Only one chunk is in memory at a time, and the
+        result matches the in-memory scale_features() path to float32
+        precision.
+        
+        Args:
+            loader: FraudDataLoader used to stream the source
+            source: CSV/Parquet file or feature store directory
+            store_name: Output feature store name (or directory)
+            chunksize: Rows per chunk
+            fit: Fit the scaler on this source before transforming
+            
+        Returns:
+            Path: Scaled feature store directory
+        """
+        if fit:
+            self.fit_scaler_incremental(loader.iter_chunks(source, chunksize))
+            n_rows = self.n_rows_fitted
+        else:
+            if not hasattr(self.scaler, 'mean_'):
+                raise ValueError("Scaler is not fitted. Use fit=True or load_scaler() first.")
+            n_rows = loader.count_rows(source)
+        
+        feature_names = self.feature_columns or getattr(self.scaler, 'feature_names_in_', None)
+        if feature_names is None:
+            raise ValueError(
+                "Feature order is unknown: the scaler was fitted without column names. "
+                "Set feature_columns before calling scale_to_store()."
+            )
+        feature_names = list(feature_names)
+        
+        print(f"\n💾 Writing scaled features to store '{store_name}'...")
+        store = None
+        start = 0
+        for chunk in loader.iter_chunks(source, chunksize):
+            if store is None:
+                has_labels = 'Class' in chunk.columns
+                store = loader.create_feature_store(
+                    store_name, n_rows, feature_names, 'Class' if has_labels else None
+                )
+            stop = start + len(chunk)
+            if stop > n_rows:
+                raise ValueError(f"{source} has more rows than the {n_rows:,} counted")
+            store['X'][start:stop] = self.scaler.transform(chunk[feature_names])
+            if store['y'] is not None:
+                store['y'][start:stop] = chunk['Class'].to_numpy()
+            start = stop
+        
+        if store is None:
+            raise ValueError(f"No rows found in {source}")
+        if start != n_rows:
+            raise ValueError(f"{source} has {start:,} rows, expected {n_rows:,}")
+        
+        store['X'].flush()
+        if store['y'] is not None:
+            store['y'].flush()
+        
+        print(f"   ✅ Scaled {start:,} rows into: {store['path']}")
+        return store['path']
+    
     def handle_imbalance(
         self, 
         X_train: np.ndarray, 
         y_train: pd.Series,
-        sampling_strategy: str = 'auto'
+        sampling_strategy: str = 'auto',
+        strategy: str = None,
+        majority_ratio: float = 10.0
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Apply SMOTE to handle class imbalance.
+        Handle class imbalance with the configured strategy.
+        
+        Strategies:
+        - 'smote': SMOTE over the full training set (50-50 balance)
+        - 'smote_sample': downsample genuine rows to `majority_ratio` x fraud,
+          then SMOTE on that sample (same balance, far fewer rows)
+        - 'undersample': keep all fraud rows and `majority_ratio` x as many
+          genuine rows; genuine rows get importance weights so the
+          weighted data matches the original class mass
+        - 'class_weight': no resampling; balanced per-row sample weights
+        
+        Sample weights (or None) are stored in self.sample_weight and
+        should be passed to the model's fit() with class_weight=None; they
+        already carry the class balance.
         
         Args:
             X_train: Training features (scaled)
             y_train: Training target
-            sampling_strategy: 'auto' for 50-50 balance
+            sampling_strategy: SMOTE sampling strategy ('auto' for 50-50 balance)
+            strategy: Override for self.resampling
+            majority_ratio: Genuine rows kept per fraud row when downsampling
             
         Returns:
             X_resampled, y_resampled
         """
-        print("\n🔄 Applying SMOTE (Synthetic Minority Over-sampling)...")
+        strategy = strategy or self.resampling
+        if strategy not in RESAMPLING_STRATEGIES:
+            raise ValueError(f"Unknown resampling strategy: {strategy}")
+        
+        y_train = np.asarray(y_train)
+        self.sample_weight = None
+        
+        print(f"\n🔄 Handling class imbalance (strategy: {strategy})...")
         
         # Check original distribution
-        original_dist = pd.Series(y_train).value_counts()
-        print(f"   Before SMOTE:")
-        print(f"      Genuine (0): {original_dist.get(0, 0):,}")
-        print(f"      Fraud (1): {original_dist.get(1, 0):,}")
+        original_dist = np.bincount(y_train, minlength=2)
+        print(f"   Before:")
+        print(f"      Genuine (0): {original_dist[0]:,}")
+        print(f"      Fraud (1): {original_dist[1]:,}")
+        
+        if strategy == 'class_weight':
+            X_resampled, y_resampled = X_train, y_train
+            self.sample_weight = compute_sample_weight('balanced', y_train)
         
-        # Apply SMOTE
-        smote = SMOTE(random_state=self.random_state, sampling_strategy=sampling_strategy)
-        X_resampled, y_resampled = smote.fit_resample(X_train, y_train)
+        else:
+            if strategy in ('undersample', 'smote_sample'):
+                keep, majority_weight = self._downsample_majority(y_train, majority_ratio)
+                X_resampled, y_resampled = X_train[keep], y_train[keep]
+            else:
+                X_resampled, y_resampled = X_train, y_train
+            
+            if strategy == 'undersample':
+                self.sample_weight = np.where(y_resampled == 0, majority_weight, 1.0)
+            else:
+                X_resampled, y_resampled = self._apply_smote(
+                    X_resampled, y_resampled, sampling_strategy
+                )
         
         # Check new distribution
-        new_dist = pd.Series(y_resampled).value_counts()
-        print(f"\n   After SMOTE:")
-        print(f"      Genuine (0): {new_dist.get(0, 0):,}")
-        print(f"      Fraud (1): {new_dist.get(1, 0):,}")
-        print(f"   ✅ Dataset balanced!")
+        new_dist = np.bincount(y_resampled, minlength=2)
+        print(f"\n   After:")
+        print(f"      Genuine (0): {new_dist[0]:,}")
+        print(f"      Fraud (1): {new_dist[1]:,}")
+        if self.sample_weight is not None:
+            print(f"      Weighted genuine:fraud = "
+                  f"{self.sample_weight[y_resampled == 0].sum():,.0f}:"
+                  f"{self.sample_weight[y_resampled == 1].sum():,.0f}")
+        print(f"   ✅ Imbalance handled!")
         
         return X_resampled, y_resampled
     
+    def _downsample_majority(
+        self,
+        y: np.ndarray,
+        majority_ratio: float
+    ) -> Tuple[np.ndarray, float]:
+        """
+        Pick all fraud rows plus a random sample of genuine rows.
+        
+        Returns:
+            Sorted row indices to keep, and the importance weight of a
+            kept genuine row (original genuine count / kept genuine count)
+        """
+        rng = np.random.default_rng(self.random_state)
+        majority = np.flatnonzero(y == 0)
+        minority = np.flatnonzero(y == 1)
+        
+        n_keep = min(len(majority), max(1, int(round(len(minority) * majority_ratio))))
+        kept_majority = rng.choice(majority, size=n_keep, replace=False)
+        
+        keep = np.sort(np.concatenate([kept_majority, minority]))
+        return keep, len(majority) / n_keep
+    
+    def _apply_smote(self, X: np.ndarray, y: np.ndarray, sampling_strategy='auto'):
+        """Run SMOTE with a (parallel) nearest-neighbor search."""
+        k_neighbors = min(5, int((y == 1).sum()) - 1)
+        if k_neighbors < 1:
+            print("   ⚠️  Too few fraud samples for SMOTE; skipping oversampling")
+            return X, y
+        
+        smote = SMOTE(
+            random_state=self.random_state,
+            sampling_strategy=sampling_strategy,
+            k_neighbors=NearestNeighbors(n_neighbors=k_neighbors + 1, n_jobs=self.n_jobs)
+        )
+        return smote.fit_resample(X, y)
+    
+    def benchmark_imbalance_strategies(
+        self,
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        X_test: np.ndarray,
+        y_test: np.ndarray,
+        strategies: list = None,
+        estimator=None
+    ) -> pd.DataFrame:
+        """
+        Compare imbalance strategies on wall time, peak memory and PR-AUC.
+        
+        Each strategy resamples the (scaled) training data, fits a fresh
+        copy of `estimator` with the strategy's sample weights (and
+        class_weight=None, so the balance is not applied twice), and is
+        scored on the untouched test set. Peak memory is the largest
+        traced allocation (tracemalloc, includes NumPy buffers) during
+        resampling and fitting.
+        
+        Args:
+            X_train, y_train: Scaled training data
+            X_test, y_test: Scaled test data
+            strategies: Strategies to compare (default: all)
+            estimator: sklearn classifier (default: balanced LogisticRegression)
+            
+        Returns:
+            DataFrame with one row per strategy
+        """
+        from sklearn.base import clone
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.metrics import average_precision_score
+        
+        if estimator is None:
+            estimator = LogisticRegression(
+                max_iter=1000, class_weight='balanced', random_state=self.random_state
+            )
+        
+        results = []
+        for strategy in strategies or RESAMPLING_STRATEGIES:
+            tracemalloc.start()
+            try:
+                start = time.perf_counter()
+                X_res, y_res = self.handle_imbalance(X_train, y_train, strategy=strategy)
+                resample_time = time.perf_counter() - start
+                
+                model = clone(estimator)
+                if self.sample_weight is not None and 'class_weight' in model.get_params():
+                    model.set_params(class_weight=None)
+                model.fit(X_res, y_res, sample_weight=self.sample_weight)
+                total_time = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                # Tracing slows every allocation; never leave it on after a failure
+                tracemalloc.stop()
+            
+            pr_auc = average_precision_score(y_test, model.predict_proba(X_test)[:, 1])
+            results.append({
+                'Strategy': strategy,
+                'Training Rows': len(y_res),
+                'Resample Time (s)': round(resample_time, 3),
+                'Total Time (s)': round(total_time, 3),
+                'Peak Memory (MB)': round(peak / 1024**2, 1),
+                'PR-AUC': round(pr_auc, 4)
+            })
+            del X_res, y_res, model
+        
+        self.sample_weight = None
+        df_results = pd.DataFrame(results)
+        
+        print("\n📊 Imbalance Strategy Benchmark:")
+        print(df_results.to_string(index=False))
+        
+        return df_results
+    
     def full_preprocessing_pipeline(
         self, 
         df: pd.DataFrame,
-        apply_smote: bool = True
+        apply_smote: bool = True,
+        lean: bool = False,
+        profiler: StageProfiler = None
     ) -> dict:
         """
         Run complete preprocessing pipeline.
         
         Args:
-            df: Raw dataset with 'Class' column
-            apply_smote: Whether to apply SMOTE for balancing
+            df: Raw dataset with 'Class' column, or a memory-mapped
+                feature store from FraudDataLoader.load_feature_store()
+            apply_smote: Whether to handle class imbalance (with the
+                strategy given by `resampling`)
+            lean: Low-memory mode: split by index arrays, gather and scale
+                in place into preallocated float32 buffers, and drop
+                intermediates as soon as they are no longer needed
+            profiler: StageProfiler to record stages into (e.g. the training
+                script's run profile); a new one is used by default
             
         Returns:
-            Dictionary with all processed data
+            Dictionary with all processed data, including a per-stage
+            wall time / peak RSS profile under 'memory_profile'
         """
         print("=" * 70)
-        print("🔧 STARTING PREPROCESSING PIPELINE")
+        print("🔧 STARTING PREPROCESSING PIPELINE" + (" (lean mode)" if lean else ""))
         print("=" * 70)
         
-        # Step 1: Split features and target
-        X, y = self.split_features_target(df)
-        
-        # Step 2: Train-test split
-        X_train, X_test, y_train, y_test = self.train_test_split_data(X, y)
+        profiler = profiler if profiler is not None else StageProfiler()
+        n_stages_before = len(profiler.stages)
         
-        # Step 3: Scale features
-        X_train_scaled, X_test_scaled = self.scale_features(X_train, X_test)
+        if lean:
+            X_train_scaled, X_test_scaled, y_train, y_test, split_indices = (
+                self._lean_split_and_scale(df, profiler)
+            )
+        else:
+            split_indices = None
+            
+            # Step 1: Split features and target
+            with profiler.stage('split'):
+                X, y = self.split_features_target(df)
+                
+                # Step 2: Train-test split
+                X_train, X_test, y_train, y_test = self.train_test_split_data(X, y)
+                profiler.record_arrays(X_train=X_train, X_test=X_test)
+            
+            # Step 3: Scale features
+            with profiler.stage('scale'):
+                X_train_scaled, X_test_scaled = self.scale_features(X_train, X_test)
+                profiler.record_arrays(X_train=X_train_scaled, X_test=X_test_scaled)
         
         # Step 4: Handle imbalance (optional)
-        if apply_smote:
-            X_train_balanced, y_train_balanced = self.handle_imbalance(
-                X_train_scaled, y_train
+        with profiler.stage('resample'):
+            if apply_smote:
+                X_train_balanced, y_train_balanced = self.handle_imbalance(
+                    X_train_scaled, y_train
+                )
+            else:
+                X_train_balanced = X_train_scaled
+                y_train_balanced = y_train
+                self.sample_weight = None
+            profiler.record_arrays(
+                X_train=X_train_balanced, y_train=y_train_balanced, sample_weight=self.sample_weight
             )
-        else:
-            X_train_balanced = X_train_scaled
-            y_train_balanced = y_train
+            
+            if lean:
+                del X_train_scaled  # Release the pre-resampling buffer
+        
+        stage_profile = profiler.to_dict()[n_stages_before:]
+        profiler.report('Preprocessing stage profile', stage_profile)
         
         print("\n" + "=" * 70)
         print("✅ PREPROCESSING COMPLETE")
         print("=" * 70)
         
-        return {
+        result = {
             'X_train': X_train_balanced,
             'X_test': X_test_scaled,
             'y_train': y_train_balanced,
             'y_test': y_test,
+            'sample_weight': self.sample_weight,
             'feature_names': self.feature_columns,
-            'scaler': self.scaler
+            'scaler': self.scaler,
+            'memory_profile': stage_profile
         }
+        if split_indices is not None:
+            result['train_index'], result['test_index'] = split_indices
+        
+        return result
+    
+    def _lean_split_and_scale(self, df, profiler: StageProfiler):
+        """
+        Split, gather and scale with minimal intermediate copies.
+        
+        Rows are assigned to train/test by index arrays; each feature
+        column is gathered straight into a preallocated float32 buffer and
+        standardized in place, so no float64 copy of X, X_train or X_test
+        is ever materialized.
+        
+        Returns:
+            X_train, X_test (float32), y_train, y_test, (train_index, test_index)
+        """
+        with profiler.stage('split'):
+            if isinstance(df, dict):
+                source = df['X']
+                y = np.asarray(df['y'])
+                self.feature_columns = list(df['feature_names'])
+            else:
+                source = self.add_velocity_features(df)
+                y = source['Class'].to_numpy()
+                self.feature_columns = [col for col in source.columns if col != 'Class']
+            
+            train_index, test_index = train_test_split(
+                np.arange(len(y)),
+                test_size=self.test_size,
+                random_state=self.random_state,
+                stratify=y
+            )
+            y_train, y_test = y[train_index], y[test_index]
+            
+            print(f"📊 Features: {len(self.feature_columns)}")
+            print(f"\n✂️  Train-Test Split (by index):")
+            print(f"   Training samples: {len(train_index):,}")
+            print(f"   Testing samples: {len(test_index):,}")
+        
+        with profiler.stage('gather'):
+            n_features = len(self.feature_columns)
+            X_train = np.empty((len(train_index), n_features), dtype=np.float32)
+            X_test = np.empty((len(test_index), n_features), dtype=np.float32)
+            
+            if isinstance(df, dict):
+                np.take(source, train_index, axis=0, out=X_train)
+                np.take(source, test_index, axis=0, out=X_test)
+            else:
+                for j, col in enumerate(self.feature_columns):
+                    column = source[col].to_numpy(dtype=np.float32)  # No copy if already float32
+                    np.take(column, train_index, out=X_train[:, j])
+                    np.take(column, test_index, out=X_test[:, j])
+            profiler.record_arrays(X_train=X_train, X_test=X_test)
+        
+        with profiler.stage('scale'):
+            print("\n⚖️  Scaling features in place (float32)...")
+            # Wrapping the buffer keeps feature names on the scaler without a copy
+            self.scaler = StandardScaler().fit(
+                pd.DataFrame(X_train, columns=self.feature_columns, copy=False)
+            )
+            mean = self.scaler.mean_.astype(np.float32)
+            scale = self.scaler.scale_.astype(np.float32)
+            for buffer in (X_train, X_test):
+                buffer -= mean
+                buffer /= scale
+            print(f"   ✅ Features scaled (mean=0, std=1)")
+        
+        return X_train, X_test, y_train, y_test, (train_index, test_index)
     
     def save_scaler(self, filepath: str):
         """Save fitted scaler to disk."""
@@ -225,8 +666,34 @@ class FraudPreprocessor:
 
 # Quick usage example
 if __name__ == "__main__":
+    import argparse
     from data_loader import FraudDataLoader
     
+    parser = argparse.ArgumentParser(description='Preprocess the fraud detection dataset')
+    parser.add_argument(
+        '--resampling',
+        choices=RESAMPLING_STRATEGIES,
+        default='smote',
+        help='Class imbalance strategy (default: smote)'
+    )
+    parser.add_argument('--n-jobs', type=int, default=-1, help='Parallel jobs (default: all cores)')
+    parser.add_argument(
+        '--lean',
+        action='store_true',
+        help='Low-memory pipeline: index splits and in-place float32 scaling'
+    )
+    parser.add_argument(
+        '--entity-column',
+        default=None,
+        help='Card/customer id column to derive per-entity velocity features from'
+    )
+    parser.add_argument(
+        '--benchmark-imbalance',
+        action='store_true',
+        help='Compare wall time, peak memory and PR-AUC of all imbalance strategies'
+    )
+    args = parser.parse_args()
+    
     # Load data
     loader = FraudDataLoader()
     try:
@@ -235,8 +702,19 @@ if __name__ == "__main__":
         df = loader.load_sample_data()
     
     # Preprocess
-    preprocessor = FraudPreprocessor(test_size=0.2, random_state=42)
-    processed_data = preprocessor.full_preprocessing_pipeline(df, apply_smote=True)
+    preprocessor = FraudPreprocessor(
+        test_size=0.2, random_state=42, resampling=args.resampling, n_jobs=args.n_jobs,
+        entity_column=args.entity_column
+    )
+    
+    if args.benchmark_imbalance:
+        data = preprocessor.full_preprocessing_pipeline(df, apply_smote=False)
+        preprocessor.benchmark_imbalance_strategies(
+            data['X_train'], data['y_train'], data['X_test'], data['y_test']
+        )
+        raise SystemExit(0)
+    
+    processed_data = preprocessor.full_preprocessing_pipeline(df, apply_smote=True, lean=args.lean)
     
     print("\n📦 Processed data ready for modeling:")
     print(f"   X_train shape: {processed_data['X_train'].shape}")
@@ -9,13 +9,86 @@ Date: January 2026
 
 import numpy as np
 import pandas as pd
-from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import classification_report, confusion_matrix, roc_auc_score
+from scipy.stats import loguniform, randint
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingRandomSearchCV, StratifiedKFold, train_test_split
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.metrics import (
+    classification_report, confusion_matrix, roc_auc_score,
+    average_precision_score, log_loss
+)
+import io
+import os
+import copy
+import json
+import time
+import shutil
+import platform
+import warnings
 import joblib
+import sklearn
 from pathlib import Path
 from datetime import datetime
 
+from utils import StageProfiler, summarize_latencies, write_json_atomic
+from inference_pipeline import (
+    FraudInferencePipeline, PIPELINE_FILENAME, DECISION_THRESHOLD_FILENAME, load_model_bundle
+)
+from drift_monitor import DRIFT_REFERENCE_FILENAME, build_drift_reference, save_drift_reference
+
+
+MODEL_TYPES = ['logistic', 'random_forest', 'sgd_logistic', 'hist_gb']
+
+# Search spaces for FraudModelTrainer.tune()
+PARAM_DISTRIBUTIONS = {
+    'logistic': {
+        'C': loguniform(1e-3, 1e2)
+    },
+    'random_forest': {
+        'n_estimators': randint(50, 301),
+        'max_depth': [6, 8, 10, 14, None],
+        'min_samples_split': randint(2, 21),
+        'max_features': ['sqrt', 0.5]
+    },
+    'sgd_logistic': {
+        'alpha': loguniform(1e-6, 1e-2)
+    },
+    'hist_gb': {
+        'learning_rate': loguniform(0.02, 0.3),
+        'max_leaf_nodes': randint(15, 64),
+        'min_samples_leaf': randint(10, 101),
+        'l2_regularization': loguniform(1e-4, 10)
+    }
+}
+
+DEFAULT_TUNING_CACHE = Path(__file__).parent.parent / 'data' / 'processed' / 'tuning_cache'
+
+# JSON sidecar of the run profile, next to training_history.pkl
+PROFILE_FILENAME = 'training_profile.json'
+
+# Files that make up one model version (models/ and models/versions/vN/)
+MODEL_ARTIFACTS = [
+    'fraud_detector.pkl', 'scaler.pkl', 'feature_names.pkl',
+    'training_history.pkl', PIPELINE_FILENAME, PROFILE_FILENAME, DECISION_THRESHOLD_FILENAME,
+    DRIFT_REFERENCE_FILENAME
+]
+
+# Incremental updates: the newest share of the new rows is held out, and the
+# updated model is promoted only if its PR-AUC there is at most this much
+# below the served model's
+UPDATE_HOLDOUT_SIZE = 0.2
+UPDATE_MAX_PR_AUC_DROP = 0.01
+
+# Estimator class -> model type, for bundles without a training history
+_MODEL_TYPE_BY_CLASS = {
+    'LogisticRegression': 'logistic',
+    'RandomForestClassifier': 'random_forest',
+    'SGDClassifier': 'sgd_logistic',
+    'HistGradientBoostingClassifier': 'hist_gb'
+}
+
 
 class FraudModelTrainer:
     """
@@ -24,6 +97,8 @@ class FraudModelTrainer:
     Supports:
     - Logistic Regression (baseline)
     - Random Forest (advanced)
+    - SGD Logistic Regression (out-of-core, trained chunk by chunk)
+    - Histogram Gradient Boosting (fast, compact tree ensemble)
     """
     
     def __init__(self, model_type: str = 'logistic', random_state: int = 42):
@@ -31,13 +106,14 @@ class FraudModelTrainer:
         Initialize model trainer.
         
         Args:
-            model_type: 'logistic' or 'random_forest'
+            model_type: 'logistic', 'random_forest', 'sgd_logistic' or 'hist_gb'
             random_state: Random seed for reproducibility
         """
         self.model_type = model_type
         self.random_state = random_state
         self.model = None
         self.training_history = {}
+        self.tuning = None
         
         # Initialize model
         self._initialize_model()
@@ -64,16 +140,54 @@ class FraudModelTrainer:
             )
             print("🌲 Initialized Random Forest model (100 trees)")
             
+        elif self.model_type == 'sgd_logistic':
+            self.model = SGDClassifier(
+                loss='log_loss',
+                alpha=1e-4,
+                random_state=self.random_state,
+                class_weight='balanced'  # Replaced by explicit weights in train_incremental
+            )
+            print("📉 Initialized SGD Logistic Regression model (partial_fit)")
+            
+        elif self.model_type == 'hist_gb':
+            self.model = HistGradientBoostingClassifier(
+                max_iter=300,
+                learning_rate=0.1,
+                max_leaf_nodes=31,
+                early_stopping=True,  # Stops on a 10% internal validation split
+                validation_fraction=0.1,
+                n_iter_no_change=10,
+                scoring='loss',
+                class_weight='balanced',
+                random_state=self.random_state
+            )
+            print("📶 Initialized Histogram Gradient Boosting model (early stopping)")
+            
         else:
             raise ValueError(f"Unknown model type: {self.model_type}")
     
-    def train(self, X_train: np.ndarray, y_train: np.ndarray):
+    def _drop_class_weight(self, sample_weight):
+        """
+        Turn off the model's class weights when explicit sample weights are given.
+        
+        The 'class_weight' and 'undersample' imbalance strategies already
+        encode the class balance in their sample weights; 'balanced' class
+        weights on top would square the fraud/genuine ratio (or cancel the
+        undersampling importance weights).
+        """
+        if sample_weight is not None:
+            self.model.set_params(class_weight=None)
+    
+    def train(self, X_train: np.ndarray, y_train: np.ndarray, sample_weight: np.ndarray = None):
         """
         Train the model on provided data.
         
         Args:
             X_train: Training features
             y_train: Training labels
+            sample_weight: Optional per-row weights (e.g. importance weights
+                from negative downsampling); they replace the model's
+                'balanced' class weights
         """
         print("\n" + "=" * 70)
         print("🎯 TRAINING MODEL")
@@ -88,7 +202,8 @@ class FraudModelTrainer:
         
         # Train model
         print(f"\n⏳ Training {self.model_type} model...")
-        self.model.fit(X_train, y_train)
+        self._drop_class_weight(sample_weight)
+        self.model.fit(X_train, y_train, sample_weight=sample_weight)
         
         # Record training end
         end_time = datetime.now()
@@ -101,12 +216,430 @@ class FraudModelTrainer:
             'model_type': self.model_type,
             'n_samples': len(X_train),
             'n_features': X_train.shape[1],
+            'weighted': sample_weight is not None,
             'training_time_seconds': training_time,
             'trained_at': end_time.isoformat()
         }
+        if self.model_type == 'hist_gb':
+            self.training_history['n_iterations'] = int(self.model.n_iter_)
+            print(f"   Boosting iterations: {self.model.n_iter_} (early stopping)")
+        if self.tuning is not None:
+            self.training_history['tuning'] = self.tuning
         
         return self.model
     
+    def train_incremental(
+        self,
+        X,
+        y,
+        chunk_size: int = 100_000,
+        epochs: int = 5,
+        X_val=None,
+        y_val=None,
+        scaler=None,
+        sample_weight: np.ndarray = None
+    ):
+        """
+        Train out-of-core with partial_fit over chunks of the training data.
+        
+        Only one chunk is materialized at a time, so X can be a memory-mapped
+        feature store covering far more rows than fit RAM. Each epoch visits
+        the chunks in a new random order (rows are shuffled within a chunk),
+        and the holdout set, if given, is scored after every epoch.
+        
+        Args:
+            X: Training features (array or memmap, rows x features)
+            y: Training labels
+            chunk_size: Rows per partial_fit call
+            epochs: Passes over the training data
+            X_val: Optional holdout features (same layout as X)
+            y_val: Optional holdout labels
+            scaler: Fitted StandardScaler applied to each chunk (None if X is
+                already scaled, e.g. a store written by scale_to_store)
+            sample_weight: Optional per-row weights (replace the balanced
+                class weights)
+            
+        Returns:
+            Trained model
+        """
+        if not hasattr(self.model, 'partial_fit'):
+            raise ValueError(
+                f"Model type '{self.model_type}' does not support incremental training. "
+                "Use 'sgd_logistic'."
+            )
+        
+        print("\n" + "=" * 70)
+        print("🎯 TRAINING MODEL (incremental)")
+        print("=" * 70)
+        
+        n_samples = len(y)
+        classes = np.array([0, 1])
+        
+        # partial_fit cannot compute 'balanced' weights from one chunk
+        class_weight = _balanced_class_weight(y) if sample_weight is None else None
+        self.model.set_params(class_weight=class_weight)
+        
+        chunk_starts = np.arange(0, n_samples, chunk_size)
+        print(f"\n📊 Training data:")
+        print(f"   Samples: {n_samples:,} in {len(chunk_starts)} chunks of {chunk_size:,}")
+        print(f"   Features: {X.shape[1]}")
+        if class_weight is not None:
+            print(f"   Class weights: {{0: {class_weight[0]:.3f}, 1: {class_weight[1]:.3f}}}")
+        else:
+            print(f"   Class weights: none (sample weights given)")
+        
+        rng = np.random.default_rng(self.random_state)
+        epoch_metrics = []
+        start_time = datetime.now()
+        
+        print(f"\n⏳ Training {self.model_type} model for {epochs} epoch(s)...")
+        for epoch in range(1, epochs + 1):
+            epoch_start = datetime.now()
+            for start in rng.permutation(chunk_starts):
+                stop = min(start + chunk_size, n_samples)
+                order = rng.permutation(stop - start)
+                X_chunk = _standardize(X[start:stop], scaler)[order]
+                y_chunk = np.asarray(y[start:stop])[order]
+                weights = None if sample_weight is None else np.asarray(sample_weight[start:stop])[order]
+                self.model.partial_fit(X_chunk, y_chunk, classes=classes, sample_weight=weights)
+            
+            epoch_time = (datetime.now() - epoch_start).total_seconds()
+            line = f"   Epoch {epoch}/{epochs}: {epoch_time:.2f}s"
+            
+            if X_val is not None and y_val is not None:
+                metrics = self._holdout_metrics(X_val, y_val, chunk_size, scaler)
+                metrics['epoch'] = epoch
+                metrics['seconds'] = epoch_time
+                epoch_metrics.append(metrics)
+                line += (f" | holdout PR-AUC {metrics['pr_auc']:.4f}"
+                         f" | ROC-AUC {metrics['roc_auc']:.4f}"
+                         f" | log-loss {metrics['log_loss']:.4f}")
+            print(line)
+        
+        end_time = datetime.now()
+        training_time = (end_time - start_time).total_seconds()
+        print(f"✅ Training complete in {training_time:.2f} seconds")
+        
+        self.training_history = {
+            'model_type': self.model_type,
+            'n_samples': n_samples,
+            'n_features': X.shape[1],
+            'weighted': sample_weight is not None,
+            'incremental': True,
+            'epochs': epochs,
+            'chunk_size': chunk_size,
+            'class_weight': class_weight,
+            'epoch_metrics': epoch_metrics,
+            'training_time_seconds': training_time,
+            'trained_at': end_time.isoformat()
+        }
+        if self.tuning is not None:
+            self.training_history['tuning'] = self.tuning
+        
+        return self.model
+    
+    def tune(
+        self,
+        X_train,
+        y_train,
+        n_candidates: int = 20,
+        cv: int = 3,
+        resampling: str = 'smote',
+        n_jobs: int = -1,
+        cache_dir: str = None
+    ) -> dict:
+        """
+        Hyperparameter search with successive halving on cached CV folds.
+        
+        Each fold's scaled + resampled training part and scaled validation
+        part are computed once, stacked into one array and cached on disk
+        (joblib.Memory, reopened memory-mapped), so no candidate repeats
+        scaling or SMOTE and parallel workers share the arrays without
+        copies. HalvingRandomSearchCV then evaluates candidates on growing
+        subsamples across all cores. The best parameters are set on
+        self.model (unfitted); train() records the search under
+        training_history['tuning'].
+        
+        Args:
+            X_train: Unscaled training features (DataFrame or array)
+            y_train: Training labels
+            n_candidates: Candidates sampled in the first halving round
+            cv: Number of stratified folds
+            resampling: Imbalance strategy applied to each training fold
+            n_jobs: Parallel jobs for the search (-1 = all cores)
+            cache_dir: Fold cache directory (default: data/processed/tuning_cache)
+            
+        Returns:
+            Dictionary describing the search (best params, score, wall time)
+        """
+        print("\n" + "=" * 70)
+        print(f"🔍 TUNING {self.model_type.upper()} (successive halving)")
+        print("=" * 70)
+        
+        cache_dir = Path(cache_dir) if cache_dir else DEFAULT_TUNING_CACHE
+        memory = joblib.Memory(cache_dir, mmap_mode='r', verbose=0)
+        build_folds = memory.cache(_build_cv_folds)
+        
+        X = np.asarray(X_train, dtype=np.float64)
+        y = np.asarray(y_train)
+        fold_args = (X, y, cv, resampling, self.random_state)
+        cached = build_folds.check_call_in_cache(*fold_args)
+        
+        start = time.perf_counter()
+        X_folds, y_folds, w_folds, splits = build_folds(*fold_args)
+        fold_time = time.perf_counter() - start
+        print(f"\n📦 CV folds {'loaded from cache' if cached else 'built and cached'} "
+              f"in {fold_time:.2f}s ({len(y_folds):,} stacked rows, {cache_dir})")
+        
+        # Parallelism goes to the search, not to each candidate
+        estimator = self.model
+        if 'n_jobs' in estimator.get_params():
+            estimator = estimator.set_params(n_jobs=1)
+        
+        search = HalvingRandomSearchCV(
+            estimator,
+            PARAM_DISTRIBUTIONS[self.model_type],
+            n_candidates=n_candidates,
+            factor=3,
+            resource='n_samples',
+            min_resources='exhaust',
+            cv=splits,
+            scoring='average_precision',
+            refit=False,  # Stacked folds hold duplicates; refit happens in train()
+            n_jobs=n_jobs,
+            random_state=self.random_state
+        )
+        
+        fit_params = {} if w_folds is None else {'sample_weight': w_folds}
+        if w_folds is not None:
+            estimator = estimator.set_params(class_weight=None)  # Fold weights carry the balance
+        start = time.perf_counter()
+        search.fit(X_folds, y_folds, **fit_params)
+        search_time = time.perf_counter() - start
+        
+        self._initialize_model()
+        self.model.set_params(**search.best_params_)
+        
+        self.tuning = {
+            'method': 'HalvingRandomSearchCV',
+            'scoring': 'average_precision',
+            'best_params': {k: _plain(v) for k, v in search.best_params_.items()},
+            'best_score': float(search.best_score_),
+            'n_candidates': int(search.n_candidates_[0]),
+            'n_iterations': int(search.n_iterations_),
+            'n_resources': [int(n) for n in search.n_resources_],
+            'cv_folds': cv,
+            'resampling': resampling,
+            'folds_cached': bool(cached),
+            'fold_time_seconds': fold_time,
+            'search_time_seconds': search_time
+        }
+        
+        print(f"\n✅ Search complete in {search_time:.2f}s "
+              f"({self.tuning['n_candidates']} candidates, {self.tuning['n_iterations']} rounds)")
+        print(f"   Best CV PR-AUC: {self.tuning['best_score']:.4f}")
+        print(f"   Best params: {self.tuning['best_params']}")
+        
+        return self.tuning
+    
+    def train_with_budget(
+        self,
+        X_train: np.ndarray,
+        y_train: np.ndarray,
+        X_val: np.ndarray,
+        y_val: np.ndarray,
+        time_budget: float,
+        sample_weight: np.ndarray = None,
+        patience: int = 5,
+        chunk_size: int = 100_000
+    ):
+        """
+        Train in warm-start steps within a wall-clock budget (anytime training).
+        
+        Each step grows the model (logistic: 10 L-BFGS iterations,
+        sgd_logistic: one epoch, random_forest: 10 trees, hist_gb: 10
+        boosting iterations), scores PR-AUC on the holdout and checkpoints
+        the best model so far. Training stops before a step would overrun
+        the budget (estimated from the last step), when the model has
+        converged, or after `patience` steps without improvement. The best
+        checkpoint is returned; the first step always runs.
+        
+        Args:
+            X_train, y_train: Scaled training data
+            X_val, y_val: Scaled holdout used for checkpoint selection
+            time_budget: Wall-clock budget in seconds
+            sample_weight: Optional per-row weights (replace the balanced
+                class weights)
+            patience: Steps without holdout improvement before stopping
+            chunk_size: Rows per partial_fit call (sgd_logistic)
+            
+        Returns:
+            Best model (also set as self.model)
+        """
+        print("\n" + "=" * 70)
+        print(f"🎯 TRAINING MODEL (time budget {time_budget:.1f}s)")
+        print("=" * 70)
+        print(f"\n📊 Training samples: {len(X_train):,} | holdout: {len(y_val):,}")
+        
+        self._drop_class_weight(sample_weight)
+        step_fn = self._budget_step(X_train, y_train, sample_weight, chunk_size)
+        phases = {'fit': 0.0, 'validate': 0.0, 'checkpoint': 0.0}
+        steps = []
+        best_score, best_step, best_model = -np.inf, 0, None
+        
+        start = time.perf_counter()
+        deadline = start + time_budget
+        step = 0
+        while True:
+            step += 1
+            t0 = time.perf_counter()
+            converged = step_fn()
+            t1 = time.perf_counter()
+            score = average_precision_score(y_val, self.model.predict_proba(X_val)[:, 1])
+            t2 = time.perf_counter()
+            
+            improved = score > best_score
+            if improved:
+                best_score, best_step = score, step
+                if self.model_type == 'random_forest':
+                    best_model = len(self.model.estimators_)  # Truncate instead of copying trees
+                else:
+                    best_model = copy.deepcopy(self.model)
+            t3 = time.perf_counter()
+            
+            phases['fit'] += t1 - t0
+            phases['validate'] += t2 - t1
+            phases['checkpoint'] += t3 - t2
+            steps.append({
+                'step': step,
+                'elapsed_seconds': round(t3 - start, 4),
+                'pr_auc': round(float(score), 6),
+                'size': _model_size(self.model)
+            })
+            print(f"   Step {step:>3}: {t3 - start:7.2f}s | holdout PR-AUC {score:.4f}"
+                  f"{' ✓ checkpoint' if improved else ''}")
+            
+            if converged:
+                stop_reason = 'converged'
+                break
+            if step - best_step >= patience:
+                stop_reason = 'no_improvement'
+                break
+            if time.perf_counter() + (t3 - t0) > deadline:
+                stop_reason = 'budget'
+                break
+        
+        # Restore the best checkpoint
+        if self.model_type == 'random_forest':
+            self.model.estimators_ = self.model.estimators_[:best_model]
+            self.model.n_estimators = best_model
+        else:
+            self.model = best_model
+        self.model.set_params(warm_start=False)
+        
+        end_time = datetime.now()
+        used = time.perf_counter() - start
+        phases['overhead'] = max(used - sum(phases.values()), 0.0)
+        
+        print(f"✅ Stopped after {step} steps ({stop_reason}) in {used:.2f}s "
+              f"of {time_budget:.1f}s; best step {best_step} (PR-AUC {best_score:.4f})")
+        
+        self.training_history = {
+            'model_type': self.model_type,
+            'n_samples': len(X_train),
+            'n_features': X_train.shape[1],
+            'weighted': sample_weight is not None,
+            'training_time_seconds': used,
+            'trained_at': end_time.isoformat(),
+            'time_budget': {
+                'budget_seconds': time_budget,
+                'used_seconds': used,
+                'stop_reason': stop_reason,
+                'best_step': best_step,
+                'best_pr_auc': float(best_score),
+                'phases': {
+                    name: {'seconds': round(seconds, 4), 'budget_fraction': round(seconds / time_budget, 4)}
+                    for name, seconds in phases.items()
+                },
+                'steps': steps
+            }
+        }
+        if self.tuning is not None:
+            self.training_history['tuning'] = self.tuning
+        
+        return self.model
+    
+    def _budget_step(self, X, y, sample_weight, chunk_size):
+        """Return a callable that grows the model by one step (True = converged)."""
+        model = self.model
+        
+        if self.model_type == 'logistic':
+            iterations = 10
+            model.set_params(warm_start=True, max_iter=iterations)
+            
+            def step():
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', ConvergenceWarning)
+                    self.model.fit(X, y, sample_weight=sample_weight)
+                return int(np.max(self.model.n_iter_)) < iterations
+        
+        elif self.model_type == 'sgd_logistic':
+            if sample_weight is None:
+                model.set_params(class_weight=_balanced_class_weight(y))
+            rng = np.random.default_rng(self.random_state)
+            chunk_starts = np.arange(0, len(y), chunk_size)
+            classes = np.array([0, 1])
+            
+            def step():
+                for start in rng.permutation(chunk_starts):
+                    order = start + rng.permutation(min(chunk_size, len(y) - start))
+                    weights = None if sample_weight is None else np.asarray(sample_weight)[order]
+                    self.model.partial_fit(
+                        np.asarray(X)[order], np.asarray(y)[order], classes=classes, sample_weight=weights
+                    )
+                return False
+        
+        elif self.model_type == 'random_forest':
+            trees = 10
+            model.set_params(warm_start=True, n_estimators=0)
+            
+            def step():
+                self.model.set_params(n_estimators=self.model.n_estimators + trees)
+                self.model.fit(X, y, sample_weight=sample_weight)
+                return False
+        
+        elif self.model_type == 'hist_gb':
+            iterations = 10
+            model.set_params(warm_start=True, early_stopping=False, max_iter=0)
+            
+            def step():
+                self.model.set_params(max_iter=self.model.max_iter + iterations)
+                self.model.fit(X, y, sample_weight=sample_weight)
+                return False
+        
+        else:
+            raise ValueError(f"Unknown model type: {self.model_type}")
+        
+        return step
+    
+    def _holdout_metrics(self, X_val, y_val, chunk_size: int, scaler=None) -> dict:
+        """Ranking and calibration metrics on a holdout set, scored in chunks."""
+        y_val = np.asarray(y_val)
+        proba = np.concatenate([
+            self.model.predict_proba(_standardize(X_val[start:start + chunk_size], scaler))[:, 1]
+            for start in range(0, len(y_val), chunk_size)
+        ])
+        y_pred = proba >= 0.5
+        tp = int((y_pred & (y_val == 1)).sum())
+        
+        return {
+            'roc_auc': float(roc_auc_score(y_val, proba)),
+            'pr_auc': float(average_precision_score(y_val, proba)),
+            'log_loss': float(log_loss(y_val, proba, labels=[0, 1])),
+            'precision': tp / max(int(y_pred.sum()), 1),
+            'recall': tp / max(int((y_val == 1).sum()), 1)
+        }
+    
     def evaluate(self, X_test: np.ndarray, y_test: np.ndarray) -> dict:
         """
         Evaluate model performance on test data.
@@ -199,6 +732,262 @@ class FraudModelTrainer:
         joblib.dump(self.training_history, history_path)
         print(f"💾 Training history saved to: {history_path}")
     
+    def export_inference_pipeline(
+        self,
+        model_dir: str,
+        scaler,
+        feature_names: list,
+        threshold: float = 0.5
+    ) -> FraudInferencePipeline:
+        """
+        Export scaler, feature order and model as one inference pipeline.
+        
+        Serving code loads this single artifact and makes one call per
+        batch instead of re-implementing the preprocessing glue. For linear
+        models the scaling is folded into the model weights.
+        
+        decision_threshold.json is kept in step with the pipeline: a file
+        left by an earlier model is removed (its threshold was tuned on that
+        model's scores), and a non-default threshold is written back.
+        
+        Args:
+            model_dir: Directory to save the pipeline
+            scaler: Fitted scaler used for the training data
+            feature_names: Feature order used for training
+            threshold: Decision threshold for serving
+            
+        Returns:
+            The exported FraudInferencePipeline
+        """
+        model_dir = Path(model_dir)
+        model_dir.mkdir(parents=True, exist_ok=True)
+        
+        pipeline = FraudInferencePipeline(feature_names, scaler=scaler, model=self.model, threshold=threshold)
+        pipeline.save(model_dir / PIPELINE_FILENAME)
+        
+        threshold_path = model_dir / DECISION_THRESHOLD_FILENAME
+        if threshold == 0.5:
+            threshold_path.unlink(missing_ok=True)
+        else:
+            write_json_atomic(threshold_path, {'threshold': float(threshold)})
+        return pipeline
+    
+    def load_bundle(self, model_dir: str) -> FraudInferencePipeline:
+        """
+        Load the current model bundle to continue training from it.
+        
+        Args:
+            model_dir: Model directory written by a previous run
+            
+        Returns:
+            FraudInferencePipeline (scaler, feature names, threshold)
+        """
+        model_dir = Path(model_dir)
+        pipeline = load_model_bundle(model_dir)
+        self.model = pipeline.model
+        
+        history_path = model_dir / 'training_history.pkl'
+        self.training_history = joblib.load(history_path) if history_path.exists() else {}
+        self.model_type = self.training_history.get(
+            'model_type', _MODEL_TYPE_BY_CLASS.get(type(self.model).__name__, self.model_type)
+        )
+        print(f"📂 Loaded {self.model_type} bundle (version {self.training_history.get('version', 1)}) "
+              f"from: {model_dir}")
+        return pipeline
+    
+    def update(
+        self,
+        X_new,
+        y_new,
+        scaler=None,
+        n_new_trees: int = 25,
+        max_iter: int = 20,
+        epochs: int = 1
+    ):
+        """
+        Warm-start the current model on newly labeled rows only.
+        
+        Cost scales with the delta, not the full history:
+        - sgd_logistic: partial_fit passes over the new rows
+        - logistic: a bounded number of L-BFGS steps (warm_start) from the
+          current weights
+        - random_forest: `n_new_trees` trees grown on the new rows
+        
+        hist_gb is not supported: a warm-started fit re-bins the features
+        on the new rows only, so the existing trees would be evaluated on
+        bin indices they were not grown on. Retrain it on the full history.
+        
+        No resampling is done; the models' class weights handle imbalance.
+        
+        Args:
+            X_new: New unscaled features in training feature order
+            y_new: New labels (e.g. from chargeback feedback)
+            scaler: Scaler of the current bundle (kept fixed)
+            n_new_trees: Trees added for random_forest
+            max_iter: L-BFGS iterations for logistic
+            epochs: partial_fit passes for sgd_logistic
+            
+        Returns:
+            Updated model
+            
+        Raises:
+            ValueError: For hist_gb, or if the new rows lack a class
+        """
+        if self.model_type == 'hist_gb':
+            raise ValueError(
+                "hist_gb models cannot be updated on new rows only (the feature bins would be "
+                "rebuilt from the delta); retrain on the full history instead"
+            )
+        
+        X = _standardize(X_new, scaler)
+        y = np.asarray(y_new)
+        counts = np.bincount(y, minlength=2)
+        
+        if self.model_type != 'sgd_logistic' and counts.min() == 0:
+            raise ValueError(
+                f"Updating a {self.model_type} model needs both classes in the new rows "
+                f"(got {{0: {counts[0]}, 1: {counts[1]}}})"
+            )
+        
+        print("\n" + "=" * 70)
+        print(f"🔁 INCREMENTAL UPDATE ({self.model_type})")
+        print("=" * 70)
+        print(f"\n📊 New rows: {len(y):,} (fraud: {counts[1]:,})")
+        
+        start_time = datetime.now()
+        model = self.model
+        
+        if self.model_type == 'sgd_logistic':
+            rng = np.random.default_rng(self.random_state)
+            for _ in range(epochs):
+                order = rng.permutation(len(y))
+                model.partial_fit(X[order], y[order], classes=np.array([0, 1]))
+            detail = {'epochs': epochs}
+        
+        elif self.model_type == 'logistic':
+            model.set_params(warm_start=True, max_iter=max_iter)
+            with warnings.catch_warnings():
+                # Stopping after a few steps is the point of an incremental update
+                warnings.simplefilter('ignore', ConvergenceWarning)
+                model.fit(X, y)
+            model.set_params(warm_start=False)
+            detail = {'lbfgs_iterations': int(np.max(model.n_iter_))}
+        
+        elif self.model_type == 'random_forest':
+            n_before = model.n_estimators
+            model.set_params(warm_start=True, n_estimators=n_before + n_new_trees)
+            model.fit(X, y)
+            model.set_params(warm_start=False)
+            detail = {'trees_before': n_before, 'trees_after': model.n_estimators}
+        
+        else:
+            raise ValueError(f"Unknown model type: {self.model_type}")
+        
+        end_time = datetime.now()
+        update_time = (end_time - start_time).total_seconds()
+        print(f"✅ Update complete in {update_time:.2f} seconds ({detail})")
+        
+        self.training_history.setdefault('updates', []).append({
+            'n_samples': len(y),
+            'n_fraud': int(counts[1]),
+            'update_time_seconds': update_time,
+            'updated_at': end_time.isoformat(),
+            **detail
+        })
+        
+        return self.model
+    
+    def save_version(
+        self,
+        model_dir: str,
+        scaler,
+        feature_names: list,
+        threshold: float = 0.5
+    ) -> Path:
+        """
+        Write the current model as a new version under model_dir/versions/.
+        
+        The first call archives the existing top-level artifacts as v1.
+        Use promote_version() to make the new version the served one.
+        
+        Args:
+            model_dir: Model directory
+            scaler: Scaler of the bundle
+            feature_names: Feature order
+            threshold: Decision threshold to keep in the pipeline
+            
+        Returns:
+            Path: New version directory
+        """
+        model_dir = Path(model_dir)
+        versions_dir = model_dir / 'versions'
+        existing = _version_numbers(versions_dir)
+        
+        if not existing and (model_dir / 'fraud_detector.pkl').exists():
+            archive_dir = versions_dir / 'v1'
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            for name in MODEL_ARTIFACTS:
+                if (model_dir / name).exists():
+                    shutil.copy2(model_dir / name, archive_dir / name)
+            existing = [1]
+            print(f"📦 Archived current model as: {archive_dir}")
+        
+        parent = self.training_history.get('version', max(existing) if existing else 0)
+        version = max(existing, default=0) + 1
+        self.training_history['version'] = version
+        self.training_history['parent_version'] = parent
+        
+        version_dir = versions_dir / f'v{version}'
+        self.save_model(version_dir, feature_names=feature_names)
+        joblib.dump(scaler, version_dir / 'scaler.pkl')
+        self.export_inference_pipeline(version_dir, scaler, feature_names, threshold=threshold)
+        if (model_dir / DRIFT_REFERENCE_FILENAME).exists():
+            # Updates keep the training-time baseline for drift monitoring
+            shutil.copy2(model_dir / DRIFT_REFERENCE_FILENAME, version_dir / DRIFT_REFERENCE_FILENAME)
+        print(f"📦 Saved model version v{version} (from v{parent}) to: {version_dir}")
+        
+        return version_dir
+    
+    def save_profile(self, profiler: StageProfiler, model_dir: str) -> Path:
+        """
+        Store a training run's stage profile with the model.
+        
+        The profile (wall/CPU time, peak RSS and array sizes per stage) is
+        added to training_history.pkl under 'profile' and written to a JSON
+        sidecar that diff_training_profiles() can compare across runs.
+        
+        Args:
+            profiler: StageProfiler that recorded the run
+            model_dir: Model directory (training_history.pkl is rewritten)
+            
+        Returns:
+            Path: JSON sidecar path
+        """
+        model_dir = Path(model_dir)
+        profile = {
+            'model_type': self.model_type,
+            'n_samples': self.training_history.get('n_samples'),
+            'n_features': self.training_history.get('n_features'),
+            'recorded_at': datetime.now().isoformat(),
+            'environment': {
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'sklearn': sklearn.__version__,
+                'machine': platform.machine()
+            },
+            'totals': profiler.totals(),
+            'stages': profiler.to_dict()
+        }
+        self.training_history['profile'] = profile
+        joblib.dump(self.training_history, model_dir / 'training_history.pkl')
+        
+        profile_path = model_dir / PROFILE_FILENAME
+        with open(profile_path, 'w') as f:
+            json.dump(profile, f, indent=2)
+        print(f"💾 Run profile saved to: {profile_path}")
+        
+        return profile_path
+    
     def load_model(self, model_path: str):
         """Load trained model from disk."""
         self.model = joblib.load(model_path)
@@ -206,43 +995,608 @@ class FraudModelTrainer:
         return self.model
 
 
+def compare_model_types(
+    X_train: np.ndarray,
+    y_train: np.ndarray,
+    X_test: np.ndarray,
+    y_test: np.ndarray,
+    model_types: list = None,
+    sample_weight: np.ndarray = None,
+    n_single: int = 200,
+    random_state: int = 42
+) -> pd.DataFrame:
+    """
+    Compare model types on training cost, size, serving speed and PR-AUC.
+    
+    Args:
+        X_train, y_train: Scaled (and resampled) training data
+        X_test, y_test: Scaled test data
+        model_types: Types to compare (default: logistic, random_forest, hist_gb)
+        sample_weight: Optional training weights
+        n_single: Single-row predictions timed per model
+        random_state: Random seed for models and timed rows
+        
+    Returns:
+        DataFrame with one row per model type
+    """
+    model_types = model_types or ['logistic', 'random_forest', 'hist_gb']
+    X_test = np.asarray(X_test)
+    rng = np.random.default_rng(random_state)
+    rows = X_test[rng.integers(0, len(X_test), n_single)]
+    
+    results = []
+    for model_type in model_types:
+        trainer = FraudModelTrainer(model_type=model_type, random_state=random_state)
+        trainer.train(X_train, y_train, sample_weight=sample_weight)
+        model = trainer.model
+        
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+        
+        # Warm up once, then time one row per call as a serving request would
+        model.predict_proba(rows[:1])
+        samples_ns = []
+        for i in range(n_single):
+            start = time.perf_counter_ns()
+            model.predict_proba(rows[i:i + 1])
+            samples_ns.append(time.perf_counter_ns() - start)
+        latency = summarize_latencies(samples_ns)
+        
+        start = time.perf_counter()
+        proba = model.predict_proba(X_test)[:, 1]
+        batch_time = time.perf_counter() - start
+        
+        results.append({
+            'Model': model_type,
+            'Train Time (s)': round(trainer.training_history['training_time_seconds'], 3),
+            'Size (KB)': round(buffer.tell() / 1024, 1),
+            'Single p50 (µs)': latency['p50_us'],
+            'Single p99 (µs)': latency['p99_us'],
+            'Batch (rows/s)': int(len(X_test) / batch_time) if batch_time > 0 else None,
+            'PR-AUC': round(average_precision_score(y_test, proba), 4)
+        })
+    
+    df_results = pd.DataFrame(results)
+    
+    print("\n📊 Model Type Comparison:")
+    print(df_results.to_string(index=False))
+    
+    return df_results
+
+
+def check_update(
+    y_holdout,
+    served_proba,
+    updated_proba,
+    max_drop: float = UPDATE_MAX_PR_AUC_DROP
+) -> dict:
+    """
+    Decide whether an updated model may replace the served one.
+    
+    Both models score the same held-out rows; the update passes if its
+    PR-AUC is at most max_drop below the served model's.
+    
+    Args:
+        y_holdout: Labels of the held-out rows
+        served_proba: Served model's fraud probabilities on them
+        updated_proba: Updated model's fraud probabilities on them
+        max_drop: Allowed PR-AUC decrease
+        
+    Returns:
+        Dictionary with both PR-AUCs and 'passed'
+    """
+    served = float(average_precision_score(y_holdout, served_proba))
+    updated = float(average_precision_score(y_holdout, updated_proba))
+    passed = updated >= served - max_drop
+    
+    print(f"\n🔎 Holdout check on {len(y_holdout):,} rows: PR-AUC {served:.4f} (served) "
+          f"-> {updated:.4f} (updated) {'✅' if passed else '❌'}")
+    return {'pr_auc_served': served, 'pr_auc_updated': updated, 'passed': passed}
+
+
+def promote_version(version_dir, model_dir) -> None:
+    """
+    Make a saved version the served model.
+    
+    Each artifact is copied next to its destination and swapped in with an
+    atomic rename, so readers never see a partially written file. Artifacts
+    the version does not have (e.g. no tuned threshold) are removed from
+    model_dir, so nothing from the previously served model is left behind.
+    """
+    version_dir, model_dir = Path(version_dir), Path(model_dir)
+    for name in MODEL_ARTIFACTS:
+        source = version_dir / name
+        if not source.exists():
+            (model_dir / name).unlink(missing_ok=True)
+            continue
+        tmp_path = model_dir / f'.{name}.tmp'
+        shutil.copy2(source, tmp_path)
+        os.replace(tmp_path, model_dir / name)
+    print(f"🚀 Promoted {version_dir.name} to: {model_dir}")
+
+
+def _version_numbers(versions_dir: Path) -> list:
+    """Version numbers present under versions/ (v1, v2, ...)."""
+    if not versions_dir.exists():
+        return []
+    return sorted(
+        int(path.name[1:]) for path in versions_dir.iterdir()
+        if path.is_dir() and path.name[:1] == 'v' and path.name[1:].isdigit()
+    )
+
+
+def load_training_profile(path) -> dict:
+    """
+    Load a run profile from a JSON sidecar, training_history.pkl or model directory.
+    
+    Raises:
+        FileNotFoundError: If no profile is found
+        ValueError: If the history has no profile
+    """
+    path = Path(path)
+    if path.is_dir():
+        path = path / PROFILE_FILENAME if (path / PROFILE_FILENAME).exists() else path / 'training_history.pkl'
+    if not path.exists():
+        raise FileNotFoundError(f"No training profile found at {path}")
+    
+    if path.suffix == '.json':
+        with open(path) as f:
+            return json.load(f)
+    
+    history = joblib.load(path)
+    if 'profile' not in history:
+        raise ValueError(f"{path} has no run profile (trained before profiling was recorded)")
+    return history['profile']
+
+
+def diff_training_profiles(
+    old: dict,
+    new: dict,
+    tolerance: float = 0.2,
+    min_seconds: float = 0.05,
+    min_mb: float = 10.0
+) -> pd.DataFrame:
+    """
+    Compare two run profiles stage by stage and flag regressions.
+    
+    A stage regresses when wall time, CPU time or peak RSS grows by more
+    than `tolerance` (relative) and by more than the absolute floor
+    (`min_seconds` / `min_mb`), which keeps millisecond stages from
+    flapping.
+    
+    Args:
+        old: Baseline profile (see load_training_profile)
+        new: Candidate profile
+        tolerance: Allowed relative increase (0.2 = +20%)
+        min_seconds: Ignore time increases smaller than this
+        min_mb: Ignore memory increases smaller than this
+        
+    Returns:
+        DataFrame with one row per stage plus a TOTAL row
+    """
+    def by_stage(profile):
+        stages = {}
+        for entry in profile['stages']:
+            # Repeated stage names (e.g. per-epoch stages) are summed
+            merged = stages.setdefault(entry['stage'], {'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                                         'peak_rss_mb': None, 'arrays_mb': 0.0})
+            merged['wall_seconds'] += entry['wall_seconds']
+            merged['cpu_seconds'] += entry.get('cpu_seconds') or 0.0
+            if entry.get('peak_rss_mb') is not None:
+                merged['peak_rss_mb'] = max(merged['peak_rss_mb'] or 0.0, entry['peak_rss_mb'])
+            merged['arrays_mb'] += sum(a['mb'] for a in entry.get('arrays', {}).values())
+        return stages
+    
+    def change(before, after, floor):
+        if before is None or after is None:
+            return None, False
+        delta = after - before
+        relative = delta / before if before > 0 else (float('inf') if delta > 0 else 0.0)
+        return relative, delta > floor and relative > tolerance
+    
+    old_stages, new_stages = by_stage(old), by_stage(new)
+    old_stages['TOTAL'] = dict(old['totals'], arrays_mb=sum(s['arrays_mb'] for s in old_stages.values()))
+    new_stages['TOTAL'] = dict(new['totals'], arrays_mb=sum(s['arrays_mb'] for s in new_stages.values()))
+    names = list(new_stages) + [name for name in old_stages if name not in new_stages]
+    
+    rows = []
+    for name in names:
+        before, after = old_stages.get(name, {}), new_stages.get(name, {})
+        row = {'Stage': name}
+        regressions = []
+        for key, label, floor in (('wall_seconds', 'Wall (s)', min_seconds),
+                                  ('cpu_seconds', 'CPU (s)', min_seconds),
+                                  ('peak_rss_mb', 'Peak RSS (MB)', min_mb)):
+            relative, regressed = change(before.get(key), after.get(key), floor)
+            row[f'{label} old'] = before.get(key)
+            row[f'{label} new'] = after.get(key)
+            row[f'{label} Δ%'] = None if relative is None else round(100 * relative, 1)
+            if regressed:
+                regressions.append(label.split(' ')[0])
+        row['Arrays (MB) old'] = round(before['arrays_mb'], 1) if before else None
+        row['Arrays (MB) new'] = round(after['arrays_mb'], 1) if after else None
+        row['Regression'] = ', '.join(regressions)
+        rows.append(row)
+    
+    df_diff = pd.DataFrame(rows)
+    
+    print(f"\n📊 Training run diff (tolerance +{tolerance:.0%}):")
+    print(f"   rows: {old.get('n_samples')} → {new.get('n_samples')} | "
+          f"model: {old.get('model_type')} → {new.get('model_type')}")
+    print(df_diff.to_string(index=False))
+    
+    regressed = df_diff.loc[df_diff['Regression'] != '', 'Stage'].tolist()
+    if regressed:
+        print(f"\n⚠️  Regressions in: {', '.join(regressed)}")
+    else:
+        print("\n✅ No regressions beyond tolerance")
+    
+    return df_diff
+
+
+def _build_cv_folds(X, y, n_splits: int, resampling: str, random_state: int):
+    """
+    Scale and resample every CV fold once and stack them into one dataset.
+    
+    Returns:
+        X_stacked (float32), y_stacked, sample weights (None unless the
+        strategy produces them), and a list of (train, validation) index
+        arrays into the stacked rows
+    """
+    from preprocessing import FraudPreprocessor
+    
+    folds = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    parts_X, parts_y, parts_w, splits = [], [], [], []
+    weighted = False
+    offset = 0
+    
+    for train_idx, val_idx in folds.split(X, y):
+        preprocessor = FraudPreprocessor(random_state=random_state, resampling=resampling)
+        X_tr, X_val = preprocessor.scale_features(X[train_idx], X[val_idx])
+        X_tr, y_tr = preprocessor.handle_imbalance(X_tr, y[train_idx])
+        w_tr = preprocessor.sample_weight
+        weighted = weighted or w_tr is not None
+        
+        n_tr, n_val = len(y_tr), len(val_idx)
+        splits.append((
+            np.arange(offset, offset + n_tr),
+            np.arange(offset + n_tr, offset + n_tr + n_val)
+        ))
+        parts_X += [np.asarray(X_tr, dtype=np.float32), np.asarray(X_val, dtype=np.float32)]
+        parts_y += [np.asarray(y_tr), y[val_idx]]
+        parts_w += [np.ones(n_tr) if w_tr is None else np.asarray(w_tr), np.ones(n_val)]
+        offset += n_tr + n_val
+    
+    return (
+        np.concatenate(parts_X),
+        np.concatenate(parts_y),
+        np.concatenate(parts_w) if weighted else None,
+        splits
+    )
+
+
+def _balanced_class_weight(y) -> dict:
+    """'balanced' class weights as an explicit dict (usable with partial_fit)."""
+    counts = np.bincount(np.asarray(y), minlength=2)
+    n_samples = counts.sum()
+    return {
+        c: float(n_samples / (len(counts) * counts[c])) if counts[c] else 1.0
+        for c in range(len(counts))
+    }
+
+
+def _model_size(model) -> int:
+    """Trees or iterations grown so far (coefficient count for linear models)."""
+    if hasattr(model, 'estimators_'):
+        return len(model.estimators_)
+    if hasattr(model, 'n_iter_') and not hasattr(model, 'coef_'):
+        return int(model.n_iter_)
+    return int(np.size(model.coef_))
+
+
+def _plain(value):
+    """NumPy scalars as plain Python values (for readable histories)."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _standardize(X, scaler=None) -> np.ndarray:
+    """Materialize a chunk (e.g. a memmap slice) and apply a fitted scaler."""
+    X = np.asarray(X, dtype=np.float64)
+    if scaler is None:
+        return X
+    return (X - scaler.mean_) / scaler.scale_
+
+
 # Training script
 if __name__ == "__main__":
+    import argparse
     from data_loader import FraudDataLoader
     from preprocessing import FraudPreprocessor
     
+    parser = argparse.ArgumentParser(description='Train the fraud detection model')
+    parser.add_argument(
+        '--model-type',
+        choices=MODEL_TYPES,
+        default='logistic',
+        help='Model to train (default: logistic)'
+    )
+    parser.add_argument(
+        '--store',
+        type=str,
+        help='Train out-of-core from a time-ordered feature store (sgd_logistic only); '
+             'the last 20%% of rows are the holdout'
+    )
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='Rows per partial_fit chunk')
+    parser.add_argument('--epochs', type=int, default=5, help='Passes over the data for sgd_logistic')
+    parser.add_argument(
+        '--compare',
+        nargs='*',
+        choices=MODEL_TYPES,
+        metavar='MODEL_TYPE',
+        help='Compare train time, size, latency, throughput and PR-AUC of model types '
+             '(default: logistic random_forest hist_gb) and exit'
+    )
+    parser.add_argument(
+        '--tune',
+        action='store_true',
+        help='Run a successive-halving hyperparameter search before training'
+    )
+    parser.add_argument('--n-candidates', type=int, default=20, help='Candidates for --tune')
+    parser.add_argument(
+        '--diff-runs',
+        nargs=2,
+        metavar=('OLD', 'NEW'),
+        help='Diff two run profiles (training_profile.json, training_history.pkl or model dirs) '
+             'and exit non-zero on regressions'
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='Allowed relative increase for --diff-runs (default: 0.2)'
+    )
+    parser.add_argument(
+        '--time-budget',
+        type=float,
+        metavar='SECONDS',
+        help='Anytime training: grow the model in warm-start steps, checkpoint the best '
+             'on a holdout and stop before the budget is spent'
+    )
+    parser.add_argument(
+        '--update',
+        type=str,
+        metavar='NEW_ROWS',
+        help='Warm-start the current model on newly labeled rows (CSV/Parquet/feature store, '
+             'oldest first), write a new version and promote it if it passes a holdout check'
+    )
+    parser.add_argument('--model-dir', type=str, help='Model directory (default: models/)')
+    parser.add_argument('--new-trees', type=int, default=25, help='Trees added by --update (random_forest)')
+    parser.add_argument(
+        '--max-pr-auc-drop',
+        type=float,
+        default=UPDATE_MAX_PR_AUC_DROP,
+        help=f'Largest holdout PR-AUC decrease for which --update promotes the new version '
+             f'(default: {UPDATE_MAX_PR_AUC_DROP})'
+    )
+    args = parser.parse_args()
+    
+    model_dir = Path(args.model_dir) if args.model_dir else Path(__file__).parent.parent / 'models'
+    
+    if args.update:
+        # Incremental update: only the new rows are read, scaled and fitted
+        loader = FraudDataLoader()
+        trainer = FraudModelTrainer(model_type=args.model_type, random_state=42)
+        profiler = StageProfiler()
+        
+        with profiler.stage('load'):
+            pipeline = trainer.load_bundle(model_dir)
+            delta = pd.concat(loader.iter_chunks(args.update), ignore_index=True)
+            X_new = delta.reindex(columns=pipeline.feature_names, fill_value=0)
+            y_new = delta['Class'].to_numpy()
+            profiler.record_arrays(X_new=X_new)
+        
+        # Hold out the newest rows; the served model scores them before the
+        # update changes it in place
+        split = int(len(y_new) * (1 - UPDATE_HOLDOUT_SIZE))
+        if np.bincount(y_new[split:], minlength=2).min() == 0:
+            parser.error(f"the newest {len(y_new) - split:,} rows of --update need both classes "
+                         "to check the updated model")
+        served_proba = pipeline.score(X_new.iloc[split:])
+        
+        with profiler.stage('fit'):
+            trainer.update(
+                X_new.iloc[:split], y_new[:split],
+                scaler=pipeline.scaler,
+                n_new_trees=args.new_trees,
+                epochs=args.epochs
+            )
+        
+        with profiler.stage('save'):
+            # The served threshold was tuned on the old model's scores; re-tune
+            # with evaluate_model.py --save-threshold
+            version_dir = trainer.save_version(model_dir, pipeline.scaler, pipeline.feature_names)
+        
+        with profiler.stage('check'):
+            check = check_update(
+                y_new[split:], served_proba,
+                load_model_bundle(version_dir).score(X_new.iloc[split:]),
+                max_drop=args.max_pr_auc_drop
+            )
+        
+        profiler.report('Update run profile')
+        trainer.save_profile(profiler, version_dir)
+        if not check['passed']:
+            print(f"⚠️  {version_dir.name} was not promoted; the served model is unchanged")
+            raise SystemExit(1)
+        promote_version(version_dir, model_dir)
+        raise SystemExit(0)
+    
+    if args.diff_runs:
+        diff = diff_training_profiles(
+            load_training_profile(args.diff_runs[0]),
+            load_training_profile(args.diff_runs[1]),
+            tolerance=args.tolerance
+        )
+        raise SystemExit(1 if (diff['Regression'] != '').any() else 0)
+    
+    if args.store and args.model_type != 'sgd_logistic':
+        parser.error("--store requires --model-type sgd_logistic")
+    if args.store and args.compare is not None:
+        parser.error("--compare works on the in-memory dataset, not --store")
+    if args.store and args.tune:
+        parser.error("--tune works on the in-memory dataset, not --store")
+    if args.store and args.time_budget:
+        parser.error("--time-budget works on the in-memory dataset, not --store")
+    
     print("\n" + "=" * 70)
     print("🚀 FRAUD DETECTION MODEL TRAINING")
     print("=" * 70)
     
-    # 1. Load data
-    print("\n📂 Step 1: Loading data...")
     loader = FraudDataLoader()
-    try:
-        df = loader.load_creditcard_data()
-    except FileNotFoundError:
-        print("⚠️  Using sample data for demo")
-        df = loader.load_sample_data()
-    
-    # 2. Preprocess data
-    print("\n🔧 Step 2: Preprocessing...")
     preprocessor = FraudPreprocessor(test_size=0.2, random_state=42)
-    processed_data = preprocessor.full_preprocessing_pipeline(df, apply_smote=True)
-    
-    # 3. Train model
-    print("\n🎯 Step 3: Training model...")
-    trainer = FraudModelTrainer(model_type='logistic', random_state=42)
-    trainer.train(processed_data['X_train'], processed_data['y_train'])
+    trainer = FraudModelTrainer(model_type=args.model_type, random_state=42)
+    profiler = StageProfiler()
     
-    # 4. Evaluate model
-    print("\n📊 Step 4: Evaluating model...")
-    metrics = trainer.evaluate(processed_data['X_test'], processed_data['y_test'])
+    if args.store:
+        # 1. Open the store memory-mapped; nothing is loaded yet
+        print("\n📂 Step 1: Opening feature store...")
+        with profiler.stage('load'):
+            store = loader.load_feature_store(args.store)
+            X, y = preprocessor.split_feature_store(store)
+            feature_names = preprocessor.feature_columns
+            profiler.record_arrays(X=X, y=y)
+        
+        # 2. Time-ordered holdout: train on the past, validate on the most recent rows
+        with profiler.stage('split'):
+            split = int(len(y) * (1 - preprocessor.test_size))
+            print(f"\n✂️  Time-ordered holdout: train {split:,} rows, holdout {len(y) - split:,} rows")
+        
+        print("\n🔧 Step 2: Fitting scaler out-of-core...")
+        with profiler.stage('scale'):
+            preprocessor.fit_scaler_incremental(
+                (pd.DataFrame(X[start:start + args.chunk_size], columns=feature_names)
+                 for start in range(0, split, args.chunk_size)),
+                feature_names
+            )
+        
+        # 3. Train chunk by chunk with per-epoch holdout metrics
+        print("\n🎯 Step 3: Training model...")
+        with profiler.stage('fit'):
+            trainer.train_incremental(
+                X[:split], y[:split],
+                chunk_size=args.chunk_size,
+                epochs=args.epochs,
+                X_val=X[split:],
+                y_val=y[split:],
+                scaler=preprocessor.scaler
+            )
+        
+        print("\n📊 Step 4: Holdout metrics per epoch recorded in training history")
+    else:
+        # 1. Load data
+        print("\n📂 Step 1: Loading data...")
+        with profiler.stage('load'):
+            try:
+                df = loader.load_creditcard_data()
+            except FileNotFoundError:
+                print("⚠️  Using sample data for demo")
+                df = loader.load_sample_data()
+            profiler.record_arrays(df=df)
+        
+        if args.tune:
+            # Search on the training split only; folds are cached for reruns
+            print("\n🔍 Step 1b: Tuning hyperparameters...")
+            with profiler.stage('tune'):
+                X, y = preprocessor.split_features_target(df)
+                X_train, _, y_train, _ = preprocessor.train_test_split_data(X, y)
+                trainer.tune(
+                    X_train, y_train,
+                    n_candidates=args.n_candidates,
+                    resampling=preprocessor.resampling
+                )
+        
+        # 2. Preprocess data (records the split, scale and resample stages)
+        print("\n🔧 Step 2: Preprocessing...")
+        processed_data = preprocessor.full_preprocessing_pipeline(
+            df, apply_smote=True, profiler=profiler
+        )
+        feature_names = processed_data['feature_names']
+        
+        if args.compare is not None:
+            compare_model_types(
+                processed_data['X_train'], processed_data['y_train'],
+                processed_data['X_test'], processed_data['y_test'],
+                model_types=args.compare or None,
+                sample_weight=processed_data['sample_weight']
+            )
+            raise SystemExit(0)
+        
+        if args.time_budget:
+            # Half of the test split selects checkpoints; the other half stays unseen
+            X_val, X_eval, y_val, y_eval = train_test_split(
+                processed_data['X_test'], processed_data['y_test'],
+                test_size=0.5, random_state=42, stratify=processed_data['y_test']
+            )
+            processed_data['X_test'], processed_data['y_test'] = X_eval, y_eval
+        
+        # 3. Train model
+        print("\n🎯 Step 3: Training model...")
+        with profiler.stage('fit'):
+            if args.time_budget:
+                trainer.train_with_budget(
+                    processed_data['X_train'],
+                    processed_data['y_train'],
+                    X_val, y_val,
+                    time_budget=args.time_budget,
+                    sample_weight=processed_data['sample_weight'],
+                    chunk_size=args.chunk_size
+                )
+            elif args.model_type == 'sgd_logistic':
+                trainer.train_incremental(
+                    processed_data['X_train'],
+                    processed_data['y_train'],
+                    chunk_size=args.chunk_size,
+                    epochs=args.epochs,
+                    X_val=processed_data['X_test'],
+                    y_val=processed_data['y_test'],
+                    sample_weight=processed_data['sample_weight']
+                )
+            else:
+                trainer.train(
+                    processed_data['X_train'],
+                    processed_data['y_train'],
+                    sample_weight=processed_data['sample_weight']
+                )
+        
+        # 4. Evaluate model
+        print("\n📊 Step 4: Evaluating model...")
+        with profiler.stage('evaluate'):
+            metrics = trainer.evaluate(processed_data['X_test'], processed_data['y_test'])
     
     # 5. Save model and scaler
     print("\n💾 Step 5: Saving model...")
-    model_dir = Path(__file__).parent.parent / 'models'
-    trainer.save_model(model_dir, feature_names=processed_data['feature_names'])
-    preprocessor.save_scaler(model_dir / 'scaler.pkl')
+    with profiler.stage('save'):
+        trainer.save_model(model_dir, feature_names=feature_names)
+        preprocessor.save_scaler(model_dir / 'scaler.pkl')
+        trainer.export_inference_pipeline(model_dir, preprocessor.scaler, feature_names)
+        
+        # Reference histograms of the raw training rows, for drift monitoring
+        if args.store:
+            reference = build_drift_reference(X[:split], feature_names)
+        else:
+            train_index, _ = train_test_split(
+                np.arange(len(df)),
+                test_size=preprocessor.test_size,
+                random_state=preprocessor.random_state,
+                stratify=df['Class']
+            )
+            reference = build_drift_reference(
+                df, [name for name in feature_names if name in df.columns], rows=train_index
+            )
+        save_drift_reference(reference, model_dir)
+    
+    profiler.report('Training run profile')
+    trainer.save_profile(profiler, model_dir)
     
     print("\n" + "=" * 70)
     print("✅ TRAINING PIPELINE COMPLETE!")
@@ -252,4 +1606,7 @@ if __name__ == "__main__":
     print(f"   - scaler.pkl")
     print(f"   - feature_names.pkl")
     print(f"   - training_history.pkl")
+    print(f"   - {PIPELINE_FILENAME}")
+    print(f"   - {PROFILE_FILENAME}")
+    print(f"   - {DRIFT_REFERENCE_FILENAME}")
     print(f"\n🎯 Model is ready for predictions!")
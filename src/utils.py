@@ -5,13 +5,28 @@ Team: Three Unknowns | VRSEC
 This module contains helper functions used across the project.
 """
 
+import os
+import json
+import bisect
 import pandas as pd
 import numpy as np
 import joblib
+import hashlib
+import sys
+import time
+import uuid
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict, List, Union, Tuple
 
 
+# Risk bands shared by single and batch predictions; edges are lower-inclusive
+# (p >= 0.8 is HIGH), like the proba >= threshold decision rule
+RISK_LEVELS = ['VERY LOW', 'LOW', 'MEDIUM', 'HIGH']
+RISK_BIN_EDGES = [0.3, 0.5, 0.8]
+PREDICTION_LABELS = ['GENUINE', 'FRAUD']
+
+
 def load_model(model_path: str = '../models/fraud_detector.pkl'):
     """
     Load the trained fraud detection model.
@@ -74,6 +89,33 @@ def load_feature_names(feature_path: str = '../models/feature_names.pkl'):
         return ['Time', 'V1', 'V2', 'V3', 'V4', 'V5', 'Amount']
 
 
+def file_checksum(*paths: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """
+    Compute a SHA-256 checksum over one or more files.
+    
+    Args:
+        paths: Files to hash, in order
+        chunk_size: Bytes read per step
+        
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(chunk_size), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def write_json_atomic(path: Union[str, Path], data: dict):
+    """Write JSON to a temporary file and atomically move it into place."""
+    tmp_path = Path(f"{path}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
 def preprocess_transaction(
     transaction_data: Union[Dict, pd.DataFrame],
     scaler,
@@ -94,15 +136,13 @@ def preprocess_transaction(
     if isinstance(transaction_data, dict):
         df = pd.DataFrame([transaction_data])
     else:
-        df = transaction_data.copy()
-    
-    # Ensure all required features are present
-    for feature in feature_names:
-        if feature not in df.columns:
-            df[feature] = 0  # Fill missing features with 0
+        df = transaction_data
     
-    # Select features in correct order
-    df = df[feature_names]
+    # Select features in correct order, filling missing features with 0.
+    # Frames already in training order (e.g. a memory-mapped feature store)
+    # are passed through without an intermediate copy.
+    if list(df.columns) != list(feature_names):
+        df = df.reindex(columns=feature_names, fill_value=0)
     
     # Scale features
     scaled_features = scaler.transform(df)
@@ -130,14 +170,7 @@ def interpret_prediction(
     confidence = probability if is_fraud else (1 - probability)
     
     # Risk level based on probability
-    if probability >= 0.8:
-        risk_level = "HIGH"
-    elif probability >= 0.5:
-        risk_level = "MEDIUM"
-    elif probability >= 0.3:
-        risk_level = "LOW"
-    else:
-        risk_level = "VERY LOW"
+    risk_level = RISK_LEVELS[bisect.bisect_right(RISK_BIN_EDGES, probability)]
     
     # Recommendation
     if is_fraud:
@@ -160,6 +193,244 @@ def interpret_prediction(
     }
 
 
+def build_batch_results(
+    probabilities: np.ndarray,
+    threshold: float = 0.5,
+    index: pd.Index = None,
+    ids: Union[pd.Series, np.ndarray] = None,
+    id_column: str = 'id',
+    scores_only: bool = False
+) -> pd.DataFrame:
+    """
+    Assemble batch prediction columns from fraud probabilities.
+    
+    Labels are derived from the probabilities, so the model only has to be
+    scored once. Prediction and Risk_Level are stored as categoricals
+    (one byte per row) instead of Python strings.
+    
+    Args:
+        probabilities: Fraud probability per transaction
+        threshold: Decision threshold for the FRAUD label
+        index: Index to align the results with the input rows
+        ids: Optional transaction identifiers to include
+        id_column: Name of the identifier column
+        scores_only: Return only the identifiers and Fraud_Probability
+        
+    Returns:
+        DataFrame aligned with the input rows
+    """
+    probabilities = np.asarray(probabilities)
+    columns = {}
+    
+    if ids is not None:
+        columns[id_column] = np.asarray(ids)
+    
+    if not scores_only:
+        columns['Prediction'] = pd.Categorical.from_codes(
+            (probabilities >= threshold).astype(np.int8),
+            categories=PREDICTION_LABELS
+        )
+    
+    columns['Fraud_Probability'] = probabilities
+    
+    if not scores_only:
+        # Same bands as interpret_prediction(), without a Python loop
+        columns['Risk_Level'] = pd.Categorical.from_codes(
+            np.searchsorted(RISK_BIN_EDGES, probabilities, side='right').astype(np.int8),
+            categories=RISK_LEVELS,
+            ordered=True
+        )
+    
+    return pd.DataFrame(columns, index=index)
+
+
+def summarize_latencies(samples_ns: Union[List[int], np.ndarray]) -> Dict[str, float]:
+    """
+    Summarize latency samples as percentiles in microseconds.
+    
+    Args:
+        samples_ns: Latency samples in nanoseconds
+        
+    Returns:
+        Dictionary with mean, p50, p95, p99 and max (microseconds)
+    """
+    samples_us = np.asarray(samples_ns, dtype=np.float64) / 1e3
+    p50, p95, p99 = np.percentile(samples_us, [50, 95, 99])
+    return {
+        'mean_us': round(float(samples_us.mean()), 2),
+        'p50_us': round(float(p50), 2),
+        'p95_us': round(float(p95), 2),
+        'p99_us': round(float(p99), 2),
+        'max_us': round(float(samples_us.max()), 2),
+        'n_samples': int(samples_us.size)
+    }
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Reset the process peak-RSS counter where the OS allows it.
+    
+    Linux resets VmHWM via /proc/self/clear_refs; elsewhere the peak is
+    the lifetime peak and per-stage values are upper bounds.
+    """
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def get_rss_mb() -> Tuple[float, float]:
+    """
+    Current and peak resident set size of this process.
+    
+    Returns:
+        Tuple of (current_mb, peak_mb); values are None when unavailable
+    """
+    try:
+        values = {}
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(('VmRSS:', 'VmHWM:')):
+                    key, value = line.split(':', 1)
+                    values[key] = int(value.split()[0]) / 1024  # kB -> MB
+        return values.get('VmRSS'), values.get('VmHWM')
+    except OSError:
+        pass
+    
+    try:
+        import psutil  # Optional; provides peak_wset on Windows
+        info = psutil.Process().memory_info()
+        peak = getattr(info, 'peak_wset', None)
+        return info.rss / 1024**2, (peak / 1024**2 if peak else None)
+    except ImportError:
+        pass
+    
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        divisor = 1024**2 if sys.platform == 'darwin' else 1024  # bytes on macOS, kB elsewhere
+        return None, peak / divisor
+    except ImportError:
+        return None, None
+
+
+class StageProfiler:
+    """
+    Record wall time, CPU time, memory and array sizes for named pipeline stages.
+    
+    Usage:
+        profiler = StageProfiler()
+        with profiler.stage('scale'):
+            ...
+            profiler.record_arrays(X_train=X_train, X_test=X_test)
+        profiler.report()
+    """
+    
+    def __init__(self):
+        self.stages = []
+        self._open = None
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Profile the enclosed block as stage `name`."""
+        _reset_peak_rss()
+        rss_before, _ = get_rss_mb()
+        entry = {'stage': name}
+        self._open = entry
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            cpu = time.process_time() - cpu_start
+            rss_after, peak = get_rss_mb()
+            self._open = None
+            entry.update({
+                'wall_seconds': round(wall, 4),
+                'cpu_seconds': round(cpu, 4),
+                'rss_before_mb': _round_or_none(rss_before),
+                'rss_after_mb': _round_or_none(rss_after),
+                'peak_rss_mb': _round_or_none(peak)
+            })
+            # Keep 'stage' first and 'arrays' last for readable dumps
+            arrays = entry.pop('arrays', None)
+            if arrays is not None:
+                entry['arrays'] = arrays
+            self.stages.append(entry)
+    
+    def record_arrays(self, **arrays):
+        """
+        Record shape, dtype and size of arrays produced by a stage.
+        
+        Attaches to the stage currently running, or to the last finished
+        stage when called outside a `stage()` block. None values are skipped.
+        """
+        entry = self._open if self._open is not None else (self.stages[-1] if self.stages else None)
+        if entry is None:
+            raise RuntimeError("record_arrays() needs a profiled stage")
+        entry.setdefault('arrays', {}).update(
+            {name: array_size(value) for name, value in arrays.items() if value is not None}
+        )
+    
+    def to_dict(self) -> List[Dict]:
+        """Return the recorded stages."""
+        return list(self.stages)
+    
+    def totals(self) -> Dict[str, float]:
+        """Total wall/CPU time and the largest peak RSS over all stages."""
+        peaks = [entry['peak_rss_mb'] for entry in self.stages if entry['peak_rss_mb'] is not None]
+        return {
+            'wall_seconds': round(sum(entry['wall_seconds'] for entry in self.stages), 4),
+            'cpu_seconds': round(sum(entry['cpu_seconds'] for entry in self.stages), 4),
+            'peak_rss_mb': max(peaks) if peaks else None
+        }
+    
+    def report(self, title: str = 'Stage profile', stages: List[Dict] = None):
+        """Print a table of recorded stages (default: all of them)."""
+        print(f"\n📈 {title}:")
+        for entry in self.stages if stages is None else stages:
+            peak = entry['peak_rss_mb']
+            peak_text = f"{peak:,.1f} MB" if peak is not None else "n/a"
+            arrays_mb = sum(a['mb'] for a in entry.get('arrays', {}).values())
+            arrays_text = f"   arrays {arrays_mb:,.1f} MB" if 'arrays' in entry else ""
+            print(f"   {entry['stage']:<12} {entry['wall_seconds']:>8.3f}s   "
+                  f"cpu {entry['cpu_seconds']:>8.3f}s   peak RSS {peak_text}{arrays_text}")
+
+
+def array_size(value) -> Dict:
+    """
+    Shape, dtype and in-memory size of an array, DataFrame or Series.
+    
+    Memory-mapped arrays are flagged: their bytes live in the page cache,
+    not necessarily in RSS.
+    """
+    if isinstance(value, pd.DataFrame):
+        dtypes = value.dtypes.unique()
+        return {
+            'shape': list(value.shape),
+            'dtype': str(dtypes[0]) if len(dtypes) == 1 else 'mixed',
+            'mb': round(float(value.memory_usage(index=False).sum()) / 1024**2, 3)
+        }
+    
+    array = value.to_numpy() if isinstance(value, pd.Series) else np.asarray(value)
+    info = {
+        'shape': list(array.shape),
+        'dtype': str(array.dtype),
+        'mb': round(array.nbytes / 1024**2, 3)
+    }
+    if isinstance(value, np.memmap) or isinstance(getattr(value, 'base', None), np.memmap):
+        info['memmap'] = True
+    return info
+
+
+def _round_or_none(value, digits: int = 1):
+    """Round a number, passing None through."""
+    return None if value is None else round(value, digits)
+
+
 def calculate_transaction_risk_score(
     amount: float,
     time_hour: int,
@@ -249,20 +520,32 @@ def save_prediction_log(
     transaction_data: Dict,
     result: Dict,
     log_file: str = '../data/predictions_log.csv'
-) -> None:
+) -> str:
     """
     Save prediction to log file for tracking.
     
+    Every entry carries a 'transaction_id' (the one in transaction_data,
+    or a new UUID) so late-arriving labels can be joined to it, e.g. by
+    StreamingEvaluator.update_from_log(). Entries are appended in the
+    column order of the existing header; if the fields differ from it, the
+    old log is renamed to <name>.<timestamp>.csv and a new one is started,
+    so columns never shift under a header.
+    
     Args:
         transaction_data: Original transaction data
         result: Prediction result
         log_file: Path to log file
+        
+    Returns:
+        The logged transaction_id
     """
     import datetime
     
+    transaction_id = str(transaction_data.get('transaction_id') or uuid.uuid4().hex)
     log_entry = {
         'timestamp': datetime.datetime.now().isoformat(),
-        **transaction_data,
+        'transaction_id': transaction_id,
+        **{key: value for key, value in transaction_data.items() if key != 'transaction_id'},
         'prediction': result['prediction'],
         'fraud_probability': result['fraud_probability'],
         'risk_level': result['risk_level']
@@ -273,9 +556,19 @@ def save_prediction_log(
     # Append to existing log or create new
     log_path = Path(log_file)
     if log_path.exists():
-        log_df.to_csv(log_file, mode='a', header=False, index=False)
-    else:
-        log_df.to_csv(log_file, mode='w', header=True, index=False)
+        header = list(pd.read_csv(log_path, nrows=0).columns)
+        if sorted(header) == sorted(log_df.columns):
+            log_df[header].to_csv(log_path, mode='a', header=False, index=False)
+            return transaction_id
+        
+        stamp = datetime.datetime.now().strftime('%Y%m%dT%H%M%S')
+        archived = log_path.with_name(f"{log_path.stem}.{stamp}{log_path.suffix}")
+        os.replace(log_path, archived)
+        print(f"⚠️  Prediction log columns changed; previous log moved to: {archived}")
+    
+    log_df.to_csv(log_path, mode='w', header=True, index=False)
+    
+    return transaction_id
 
 
 if __name__ == '__main__':
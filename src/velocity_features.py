@@ -0,0 +1,357 @@
+"""
+Velocity Features Module
+========================
+Per-entity transaction velocity (counts and amount sums over sliding time
+windows) for serving and for offline training backfills.
+
+Online, VelocityFeatureStore keeps one array-backed ring buffer per entity
+(card, customer, ...) with a start pointer per window, so recording a
+transaction and reading its window aggregates is O(1) amortized. Idle
+entities are evicted first when the store reaches its memory cap.
+
+Offline, backfill_velocity_features() computes the same features for a
+whole DataFrame with sorts and searchsorted instead of a Python loop.
+Amounts are accumulated as int64 fixed-point units, so window sums are
+exact and both paths produce bit-identical values for in-order streams.
+
+Author: Team Three Unknowns
+Date: January 2026
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Tuple
+
+
+# Window name -> length in seconds (same unit as the 'Time' column)
+DEFAULT_WINDOWS = {'1m': 60, '1h': 3_600, '24h': 86_400}
+
+# Amounts are summed as integers in units of 1 / AMOUNT_SCALE
+AMOUNT_SCALE = 10_000
+
+INITIAL_CAPACITY = 8
+
+
+def velocity_feature_names(windows: Dict[str, float] = None) -> List[str]:
+    """Names of the velocity features, in output order."""
+    windows = DEFAULT_WINDOWS if windows is None else windows
+    names = []
+    for name in _sorted_windows(windows):
+        names += [f'txn_count_{name}', f'amount_sum_{name}']
+    return names
+
+
+def _sorted_windows(windows: Dict[str, float]) -> List[str]:
+    """Window names from shortest to longest."""
+    if not windows:
+        raise ValueError("At least one velocity window is required")
+    if any(length <= 0 for length in windows.values()):
+        raise ValueError(f"Window lengths must be positive: {windows}")
+    return sorted(windows, key=windows.get)
+
+
+def _amount_units(amount) -> np.ndarray:
+    """Fixed-point amount units (round half to even, like np.rint)."""
+    return np.rint(np.asarray(amount, dtype=np.float64) * AMOUNT_SCALE).astype(np.int64)
+
+
+class _EntityBuffer:
+    """
+    Ring buffer of (time, cumulative amount units) for one entity.
+
+    Live entries are times[head:tail]; starts[k] is the first entry inside
+    window k. Entries older than the longest window are dropped by moving
+    head, and the buffer is compacted or doubled when tail hits capacity.
+    """
+
+    __slots__ = ('times', 'cum', 'head', 'tail', 'starts', 'base')
+
+    def __init__(self, n_windows: int):
+        self.times = np.empty(INITIAL_CAPACITY, dtype=np.float64)
+        self.cum = np.empty(INITIAL_CAPACITY, dtype=np.int64)
+        self.head = 0
+        self.tail = 0
+        self.starts = [0] * n_windows
+        self.base = 0  # Cumulative units before times[0]
+
+    @property
+    def nbytes(self) -> int:
+        return self.times.nbytes + self.cum.nbytes
+
+    @property
+    def last_time(self) -> float:
+        return float(self.times[self.tail - 1]) if self.tail > self.head else float('-inf')
+
+    def reset(self):
+        """Forget all entries (every window is empty)."""
+        self.head = self.tail = 0
+        self.starts = [0] * len(self.starts)
+        self.base = 0
+
+    def _make_room(self):
+        """Compact live entries to the front, doubling capacity if mostly full."""
+        live = self.tail - self.head
+        capacity = len(self.times)
+        if live > capacity // 2:
+            capacity *= 2
+
+        times = np.empty(capacity, dtype=np.float64) if capacity != len(self.times) else self.times
+        cum = np.empty(capacity, dtype=np.int64) if capacity != len(self.cum) else self.cum
+        if self.head > 0:
+            self.base = int(self.cum[self.head - 1])
+        times[:live] = self.times[self.head:self.tail]
+        cum[:live] = self.cum[self.head:self.tail]
+
+        self.starts = [s - self.head for s in self.starts]
+        self.times, self.cum = times, cum
+        self.head, self.tail = 0, live
+
+    def push(self, time: float, units: int, lengths: List[float]):
+        """Append one transaction and advance the window start pointers."""
+        if self.tail == len(self.times):
+            self._make_room()
+
+        previous = int(self.cum[self.tail - 1]) if self.tail > 0 else self.base
+        self.times[self.tail] = time
+        self.cum[self.tail] = previous + units
+        self.tail += 1
+
+        times = self.times
+        for k, length in enumerate(lengths):
+            bound = time - length
+            s = self.starts[k]
+            while times[s] <= bound:
+                s += 1
+            self.starts[k] = s
+
+        # Nothing before the longest window's start can be queried again
+        self.head = self.starts[-1]
+
+    def window_sums(self, starts: List[int]) -> List[Tuple[int, int]]:
+        """(count, amount units) for each window start index."""
+        if self.tail == 0:
+            return [(0, 0)] * len(starts)
+        last = int(self.cum[self.tail - 1])
+        return [
+            (self.tail - s, last - (int(self.cum[s - 1]) if s > 0 else self.base))
+            for s in starts
+        ]
+
+
+class VelocityFeatureStore:
+    """
+    In-process online store of per-entity velocity features.
+
+    Example:
+        >>> store = VelocityFeatureStore()
+        >>> store.update('card_42', time=1000.0, amount=25.0)
+        {'txn_count_1m': 1, 'amount_sum_1m': 25.0, ...}
+
+    Transactions for one entity are expected in time order; a late
+    transaction is recorded at the entity's latest time. Windows include
+    the transaction being recorded. The store is safe to share between
+    threads (e.g. a threaded web server): every call holds one lock.
+    """
+
+    def __init__(self, windows: Dict[str, float] = None, max_memory_mb: float = 256.0):
+        """
+        Initialize the store.
+
+        Args:
+            windows: Window name -> length in seconds (default: 1m, 1h, 24h)
+            max_memory_mb: Cap on ring buffer memory; least recently updated
+                entities are evicted above it (idle ones lose nothing)
+        """
+        windows = DEFAULT_WINDOWS if windows is None else windows
+        self.window_names = _sorted_windows(windows)
+        self.window_lengths = [float(windows[name]) for name in self.window_names]
+        self.max_window = self.window_lengths[-1]
+        self.feature_names = velocity_feature_names(windows)
+        self.max_bytes = int(max_memory_mb * 1024 * 1024)
+
+        self._entities: 'OrderedDict[Hashable, _EntityBuffer]' = OrderedDict()
+        self._nbytes = 0
+        self._latest_time = float('-inf')
+        self.evicted_idle = 0
+        self.evicted_active = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def __contains__(self, entity) -> bool:
+        return entity in self._entities
+
+    def update(self, entity: Hashable, time: float, amount: float) -> Dict[str, float]:
+        """
+        Record a transaction and return its velocity features.
+
+        Args:
+            entity: Entity key (card number, customer id, ...)
+            time: Transaction time in seconds
+            amount: Transaction amount
+
+        Returns:
+            Dictionary of velocity features (see velocity_feature_names)
+        """
+        time = float(time)
+        with self._lock:
+            buffer = self._entities.get(entity)
+            if buffer is None:
+                buffer = _EntityBuffer(len(self.window_lengths))
+                self._entities[entity] = buffer
+                self._nbytes += buffer.nbytes
+            else:
+                self._entities.move_to_end(entity)
+                last_time = buffer.last_time
+                if time < last_time:
+                    time = last_time
+                elif time - last_time > self.max_window:
+                    buffer.reset()  # Every previous entry is outside every window
+
+            nbytes = buffer.nbytes
+            buffer.push(time, int(_amount_units(amount)), self.window_lengths)
+            self._nbytes += buffer.nbytes - nbytes
+
+            self._latest_time = max(self._latest_time, time)
+            if self._nbytes > self.max_bytes:
+                self._evict(keep=entity)
+
+            return self._features(buffer.window_sums(buffer.starts))
+
+    def query(self, entity: Hashable, time: float) -> Dict[str, float]:
+        """
+        Velocity features of already recorded transactions, without recording one.
+
+        Args:
+            entity: Entity key
+            time: End of the windows in seconds
+
+        Returns:
+            Dictionary of velocity features (zeros for unknown entities)
+        """
+        with self._lock:
+            buffer = self._entities.get(entity)
+            if buffer is None or buffer.tail == buffer.head:
+                return self._features([(0, 0)] * len(self.window_lengths))
+
+            time = max(float(time), buffer.last_time)
+            live = buffer.times[buffer.head:buffer.tail]
+            starts = [
+                buffer.head + int(np.searchsorted(live, time - length, side='right'))
+                for length in self.window_lengths
+            ]
+            return self._features(buffer.window_sums(starts))
+
+    def evict_idle(self, now: float = None) -> int:
+        """
+        Drop entities with no transaction inside the longest window.
+
+        Args:
+            now: Current time (default: latest transaction time seen)
+
+        Returns:
+            Number of entities evicted
+        """
+        with self._lock:
+            now = self._latest_time if now is None else now
+            idle = [
+                entity for entity, buffer in self._entities.items()
+                if now - buffer.last_time > self.max_window
+            ]
+            for entity in idle:
+                self._nbytes -= self._entities.pop(entity).nbytes
+            self.evicted_idle += len(idle)
+            return len(idle)
+
+    def _evict(self, keep: Hashable):
+        """Evict least recently updated entities until under the memory cap (lock held)."""
+        while self._nbytes > self.max_bytes and len(self._entities) > 1:
+            entity, buffer = next(iter(self._entities.items()))
+            if entity == keep:
+                break
+            del self._entities[entity]
+            self._nbytes -= buffer.nbytes
+            if self._latest_time - buffer.last_time > self.max_window:
+                self.evicted_idle += 1
+            else:
+                self.evicted_active += 1
+
+    def _features(self, sums: List[Tuple[int, int]]) -> Dict[str, float]:
+        features = {}
+        for name, (count, units) in zip(self.window_names, sums):
+            features[f'txn_count_{name}'] = count
+            features[f'amount_sum_{name}'] = units / AMOUNT_SCALE
+        return features
+
+    def stats(self) -> dict:
+        """Entity count, buffer memory and eviction counters."""
+        with self._lock:
+            return {
+                'entities': len(self._entities),
+                'memory_mb': round(self._nbytes / (1024 * 1024), 3),
+                'max_memory_mb': round(self.max_bytes / (1024 * 1024), 3),
+                'evicted_idle': self.evicted_idle,
+                'evicted_active': self.evicted_active
+            }
+
+
+def backfill_velocity_features(
+    df: pd.DataFrame,
+    entity_column: str,
+    time_column: str = 'Time',
+    amount_column: str = 'Amount',
+    windows: Dict[str, float] = None
+) -> pd.DataFrame:
+    """
+    Compute velocity features for every row, offline and vectorized.
+
+    Matches replaying the rows through VelocityFeatureStore.update() in
+    time order (ties in their original order) exactly.
+
+    Args:
+        df: Transactions with entity, time and amount columns
+        entity_column: Column identifying the entity
+        time_column: Transaction time in seconds
+        amount_column: Transaction amount
+        windows: Window name -> length in seconds (default: 1m, 1h, 24h)
+
+    Returns:
+        DataFrame of velocity features aligned with df.index
+    """
+    windows = DEFAULT_WINDOWS if windows is None else windows
+    window_names = _sorted_windows(windows)
+
+    n = len(df)
+    entity_codes, _ = pd.factorize(df[entity_column], sort=False)
+    times = df[time_column].to_numpy(dtype=np.float64)
+    units = _amount_units(df[amount_column].to_numpy())
+
+    # Sort by (entity, time); lexsort is stable, so ties keep row order
+    order = np.lexsort((times, entity_codes))
+    entity_sorted = entity_codes[order].astype(np.int64)
+    times_sorted = times[order]
+    cum = np.concatenate(([0], np.cumsum(units[order])))
+
+    # Exact integer key (entity, time rank), sorted because rows are
+    unique_times = np.unique(times_sorted)
+    stride = len(unique_times) + 1
+    keys = entity_sorted * stride + np.searchsorted(unique_times, times_sorted)
+
+    position = np.arange(n)
+    features = {}
+    for name in window_names:
+        # Rank of the latest time <= t - window, per row
+        bound_rank = np.searchsorted(unique_times, times_sorted - windows[name], side='right') - 1
+        starts = np.searchsorted(keys, entity_sorted * stride + bound_rank, side='right')
+
+        counts = np.empty(n, dtype=np.int64)
+        sums = np.empty(n, dtype=np.float64)
+        counts[order] = position - starts + 1
+        sums[order] = (cum[position + 1] - cum[starts]) / AMOUNT_SCALE
+        features[f'txn_count_{name}'] = counts
+        features[f'amount_sum_{name}'] = sums
+
+    return pd.DataFrame(features, index=df.index)
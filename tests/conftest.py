@@ -0,0 +1,6 @@
+"""Shared pytest setup: the modules in src/ import each other by top-level name."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
@@ -0,0 +1,74 @@
+"""Tests for the online feature drift monitor in drift_monitor.py."""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from drift_monitor import DriftMonitor, build_drift_reference
+
+FEATURES = ['Time', 'V1', 'V2', 'Amount']
+
+
+@pytest.fixture
+def reference():
+    rng = np.random.default_rng(0)
+    train = pd.DataFrame(rng.normal(size=(20_000, len(FEATURES))), columns=FEATURES)
+    train['Amount'] = train['Amount'].abs().round(1)  # Tied values on bin edges
+    return build_drift_reference(train, FEATURES)
+
+
+def test_live_counts_match_reference_binning(reference):
+    rng = np.random.default_rng(1)
+    # Serving matrices in another column order, with an unmonitored feature
+    served = ['V2', 'extra', 'Amount', 'Time', 'V1']
+    X = rng.normal(size=(5_000, len(served)))
+    X[:, served.index('Amount')] = np.abs(X[:, served.index('Amount')]).round(1)
+
+    monitor = DriftMonitor(reference, served, buffer_rows=700)
+    for start in range(0, len(X), 37):
+        monitor.observe(X[start:start + 37])
+    live = monitor.live_counts()
+
+    for k, name in enumerate(monitor.feature_names):
+        edges = reference['edges'][reference['feature_names'].index(name)]
+        expected = np.bincount(np.searchsorted(edges, X[:, served.index(name)], side='right'), minlength=len(edges) + 1)
+        np.testing.assert_array_equal(live[k, :len(expected)], expected)
+        assert live[k, len(expected):].sum() == 0
+
+
+def test_drift_flags_only_shifted_features(reference):
+    rng = np.random.default_rng(2)
+    X = rng.normal(size=(5_000, len(FEATURES)))
+    X[:, FEATURES.index('Amount')] = np.abs(X[:, FEATURES.index('Amount')]).round(1)
+    X[:, FEATURES.index('V1')] += 1.0
+
+    monitor = DriftMonitor(reference)
+    monitor.observe(X)
+    report = monitor.drift()
+
+    assert report['n_live'] == len(X)
+    assert report['drifted_features'] == ['V1']
+    assert report['features']['V2']['status'] == 'stable'
+
+
+def test_concurrent_observers_get_their_own_shards(reference):
+    rng = np.random.default_rng(3)
+    rows = rng.normal(size=(8_000, len(FEATURES)))
+    monitor = DriftMonitor(reference, n_shards=4)
+    barrier = threading.Barrier(4)
+
+    def observe_rows(offset):
+        barrier.wait()
+        for i in range(offset, offset + 2_000, 10):
+            monitor.observe(rows[i:i + 10])
+
+    threads = [threading.Thread(target=observe_rows, args=(k * 2_000,)) for k in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert monitor.stats()['shard_rows'] == [2_000] * 4
+    assert int(monitor.live_counts()[0].sum()) == len(rows)
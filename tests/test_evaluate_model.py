@@ -0,0 +1,217 @@
+"""Tests for threshold sweeps, bootstrap intervals and streaming evaluation in evaluate_model.py."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import (
+    average_precision_score, confusion_matrix, precision_recall_curve, precision_score,
+    recall_score, roc_auc_score, roc_curve
+)
+
+from evaluate_model import (
+    FraudModelEvaluator, StreamingEvaluator, _bootstrap_batch, _curve_metrics, _sorted_cumulative_counts
+)
+from inference_pipeline import FraudInferencePipeline, PIPELINE_FILENAME, load_decision_threshold
+
+
+@pytest.fixture
+def scores():
+    """Imbalanced labels with overlapping, partly tied scores."""
+    rng = np.random.default_rng(0)
+    y = (rng.random(3_000) < 0.05).astype(int)
+    proba = np.clip(rng.normal(0.2 + 0.45 * y, 0.15), 0, 1).round(3)
+    return y, proba
+
+
+def test_threshold_sweep_matches_sklearn_curves(scores):
+    y, proba = scores
+    sweep = FraudModelEvaluator().threshold_sweep(y, proba).set_index('Threshold')
+
+    precision, recall, thresholds = precision_recall_curve(y, proba)
+    rows = sweep.loc[thresholds]
+    np.testing.assert_allclose(rows['Precision'], precision[:-1])
+    np.testing.assert_allclose(rows['Recall'], recall[:-1])
+
+    fpr, tpr, thresholds = roc_curve(y, proba, drop_intermediate=False)
+    rows = sweep.loc[thresholds[1:]]  # thresholds[0] is sklearn's "flag nothing"
+    np.testing.assert_allclose(rows['FPR'], fpr[1:])
+    np.testing.assert_allclose(rows['Recall'], tpr[1:])
+
+
+def test_threshold_sweep_counts_flag_at_or_above(scores):
+    y, proba = scores
+    sweep = FraudModelEvaluator().threshold_sweep(y, proba, fp_cost=1, fn_cost=20)
+
+    assert sweep['True Positives'].iloc[0] == 0 and sweep['False Positives'].iloc[0] == 0
+    for _, row in sweep.iloc[1::97].iterrows():
+        tn, fp, fn, tp = confusion_matrix(y, proba >= row['Threshold'], labels=[0, 1]).ravel()
+        assert (row['True Positives'], row['False Positives'], row['False Negatives'], row['True Negatives']) == (tp, fp, fn, tn)
+        assert row['Cost'] == fp + 20 * fn
+
+
+def test_threshold_sweep_rejects_empty_scores():
+    with pytest.raises(ValueError):
+        FraudModelEvaluator().threshold_sweep(np.array([]), np.array([]))
+
+
+@pytest.mark.parametrize('fp_cost, fn_cost', [(1, 20), (1, 1), (1, 1_000), (1_000, 1)])
+def test_optimal_threshold_is_inside_the_minimum_cost_range(scores, fp_cost, fn_cost):
+    y, proba = scores
+    evaluator = FraudModelEvaluator()
+    sweep = evaluator.threshold_sweep(y, proba, fp_cost, fn_cost)
+    result = evaluator.find_optimal_threshold(y, proba, fp_cost, fn_cost, sweep=sweep)
+
+    threshold = result['threshold']
+    flagged = proba >= threshold
+    cost = fp_cost * np.sum(flagged & (y == 0)) + fn_cost * np.sum(~flagged & (y == 1))
+    assert cost == result['cost'] == sweep['Cost'].min()
+    # Not on a score: between the lowest flagged and the highest unflagged one
+    assert threshold not in set(proba)
+    if flagged.any() and not flagged.all():
+        assert proba[~flagged].max() < threshold < proba[flagged].min()
+
+
+def test_optimal_threshold_is_tuned_on_validation_rows(scores):
+    y, proba = scores
+    evaluator = FraudModelEvaluator()
+    evaluator.model = LogisticRegression().fit(proba.reshape(-1, 1), y)
+
+    X_val = proba[:1_500].reshape(-1, 1)
+    tuned = evaluator._tune_threshold(y[1_500:], proba[1_500:], X_val, y[:1_500], 1, 20)
+    expected = evaluator.find_optimal_threshold(y[:1_500], evaluator.model.predict_proba(X_val)[:, 1], 1, 20)
+
+    assert tuned['tuned_on'] == 'validation'
+    assert tuned['threshold'] == expected['threshold']
+    assert tuned['n_samples'] == 1_500
+    assert evaluator._tune_threshold(y, proba, None, None, 1, 20)['tuned_on'] == 'test'
+
+
+def test_saved_threshold_is_served(scores, tmp_path):
+    y, proba = scores
+    model = LogisticRegression().fit(proba.reshape(-1, 1), y)
+    FraudInferencePipeline(['score'], model=model).save(tmp_path / PIPELINE_FILENAME)
+
+    evaluator = FraudModelEvaluator()
+    result = evaluator.find_optimal_threshold(y, proba)
+    evaluator.save_decision_threshold(result, tmp_path)
+
+    assert load_decision_threshold(tmp_path) == result['threshold']
+    assert FraudInferencePipeline.load(tmp_path / PIPELINE_FILENAME).threshold == result['threshold']
+    assert not list(tmp_path.glob('*.tmp'))
+
+
+def _sklearn_metrics(y, proba, threshold, sample_weight=None):
+    """ROC-AUC, PR-AUC, precision and recall in BOOTSTRAP_METRICS order."""
+    flagged = (proba >= threshold).astype(int)
+    return [
+        roc_auc_score(y, proba, sample_weight=sample_weight),
+        average_precision_score(y, proba, sample_weight=sample_weight),
+        precision_score(y, flagged, sample_weight=sample_weight, zero_division=0),
+        recall_score(y, flagged, sample_weight=sample_weight)
+    ]
+
+
+def test_weighted_curve_metrics_match_sklearn(scores):
+    y, proba = scores
+    weights = np.random.default_rng(1).integers(0, 4, size=(5, len(y)))
+
+    metrics = _curve_metrics(*_sorted_cumulative_counts(y, proba, sample_weight=weights), 0.4)
+
+    for k, w in enumerate(weights):
+        np.testing.assert_allclose(metrics[:, k], _sklearn_metrics(y, proba, 0.4, sample_weight=w))
+
+
+def test_bootstrap_replicates_match_resampled_sklearn_metrics(scores):
+    y, proba = scores
+    seed = np.random.SeedSequence(7)
+
+    metrics = _bootstrap_batch(y, proba, 0.4, 6, seed)
+
+    # The same draws, as explicit resampled copies
+    draws = np.random.default_rng(seed).integers(0, len(y), size=(6, len(y)))
+    for k, rows in enumerate(draws):
+        np.testing.assert_allclose(metrics[:, k], _sklearn_metrics(y[rows], proba[rows], 0.4))
+
+
+def test_bootstrap_intervals_do_not_depend_on_n_jobs(scores):
+    y, proba = scores
+    evaluator = FraudModelEvaluator()
+
+    serial = evaluator.bootstrap_confidence_intervals(y, proba, n_bootstrap=300, batch_size=64, n_jobs=1)
+    parallel = evaluator.bootstrap_confidence_intervals(y, proba, n_bootstrap=300, batch_size=64, n_jobs=2)
+
+    assert serial.equals(parallel)
+    np.testing.assert_allclose(serial['Estimate'], _sklearn_metrics(y, proba, 0.5))
+    assert (serial['CI Lower'] <= serial['Estimate']).all() and (serial['Estimate'] <= serial['CI Upper']).all()
+    assert (serial['Replicates'] == 300).all()
+
+
+@pytest.fixture
+def logged(scores):
+    """Predictions spread over four days, with scores on a 1/1024 grid."""
+    y, proba = scores
+    grid = np.floor(proba * 1024) / 1024
+    times = pd.Timestamp('2026-01-01') + pd.to_timedelta(np.linspace(0, 4 * 86_400 - 1, len(y)), unit='s')
+    return y, grid, times
+
+
+def test_streaming_merge_equals_single_pass(logged):
+    y, proba, times = logged
+    single = StreamingEvaluator(n_bins=1024).update(y, proba, times)
+
+    # Interleaved shards, so both hold rows of every day
+    shards = [StreamingEvaluator(n_bins=1024).update(y[k::2], proba[k::2], times[k::2]) for k in range(2)]
+    merged = shards[0].merge(shards[1])
+
+    assert merged.buckets.keys() == single.buckets.keys()
+    for start, counts in single.buckets.items():
+        np.testing.assert_array_equal(merged.buckets[start], counts)
+    assert merged.metrics() == single.metrics()
+    assert merged.metrics(start='2026-01-02', end='2026-01-03') == single.metrics(start='2026-01-02', end='2026-01-03')
+
+
+def test_streaming_metrics_are_exact_on_the_bin_grid(logged):
+    y, proba, times = logged
+    metrics = StreamingEvaluator(n_bins=1024).update(y, proba, times).metrics(threshold=0.5)
+
+    expected = _sklearn_metrics(y, proba, 0.5)
+    np.testing.assert_allclose(
+        [metrics['roc_auc'], metrics['pr_auc'], metrics['precision'], metrics['recall']], expected
+    )
+
+
+def test_streaming_state_survives_save_and_load(logged, tmp_path):
+    y, proba, times = logged
+    stream = StreamingEvaluator(n_bins=1024).update(y, proba, times)
+    stream.n_unlabeled = 3
+
+    stream.save(tmp_path / 'stream.npz')
+    loaded = StreamingEvaluator.load(tmp_path / 'stream.npz')
+
+    assert loaded.n_unlabeled == 3
+    assert loaded.metrics() == stream.metrics()
+
+
+def test_streaming_merge_rejects_different_bins():
+    with pytest.raises(ValueError):
+        StreamingEvaluator(n_bins=100).merge(StreamingEvaluator(n_bins=200))
+
+
+def test_log_ids_join_labels_as_strings(tmp_path):
+    log = pd.DataFrame({
+        'timestamp': ['2026-01-01T10:00:00'] * 4,
+        'transaction_id': ['0042', '42', 'a7', '0007'],
+        'fraud_probability': [0.9, 0.1, 0.8, 0.2]
+    })
+    log.to_csv(tmp_path / 'predictions_log.csv', index=False)
+    pd.DataFrame({'transaction_id': ['0042', '42', '0007'], 'Class': [1, 0, 0]}).to_csv(
+        tmp_path / 'labels.csv', index=False
+    )
+
+    stream = StreamingEvaluator().update_from_log(tmp_path / 'predictions_log.csv', labels=tmp_path / 'labels.csv')
+
+    assert stream.n_unlabeled == 1
+    genuine, fraud = stream.histogram()
+    assert fraud.sum() == 1 and genuine.sum() == 2
+    assert fraud[int(0.9 * stream.n_bins)] == 1
@@ -0,0 +1,68 @@
+"""Tests for the fused serving pipeline in inference_pipeline.py."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import StandardScaler
+
+from inference_pipeline import FraudInferencePipeline
+
+FEATURES = ['Time', 'V1', 'V2', 'V3', 'Amount']
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    # Unscaled features of very different magnitudes, like Time and Amount
+    X = rng.normal(size=(400, len(FEATURES))) * [50_000.0, 1.0, 2.0, 0.5, 250.0] + [80_000.0, 0, 0, 0, 90.0]
+    y = (X[:, 1] + X[:, 2] + rng.normal(size=len(X)) > 1.5).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize('model, fused', [
+    (LogisticRegression(), True),
+    (SGDClassifier(loss='log_loss', random_state=0), True),
+    (RandomForestClassifier(n_estimators=20, random_state=0), False),
+])
+def test_score_matches_scaler_and_model(data, model, fused):
+    X, y = data
+    scaler = StandardScaler().fit(X)
+    model.fit(scaler.transform(X), y)
+
+    pipeline = FraudInferencePipeline(FEATURES, scaler=scaler, model=model)
+
+    assert pipeline.is_fused == fused
+    expected = model.predict_proba(scaler.transform(X))[:, 1]
+    np.testing.assert_allclose(pipeline.score(X), expected, rtol=1e-9, atol=1e-12)
+
+
+def test_named_inputs_are_reordered_and_missing_features_are_zero(data):
+    X, y = data
+    scaler = StandardScaler().fit(X)
+    pipeline = FraudInferencePipeline(FEATURES, scaler=scaler, model=LogisticRegression().fit(scaler.transform(X), y))
+
+    frame = pd.DataFrame(X, columns=FEATURES)
+    np.testing.assert_allclose(pipeline.score(frame[FEATURES[::-1]]), pipeline.score(X), rtol=1e-12)
+
+    row = dict(zip(FEATURES, X[0]))
+    del row['V3']
+    expected = X[:1].copy()
+    expected[0, 3] = 0.0
+    np.testing.assert_allclose(pipeline.score(row), pipeline.score(expected), rtol=1e-12)
+
+
+def test_saved_pipeline_scores_the_same(data, tmp_path):
+    X, y = data
+    scaler = StandardScaler().fit(X)
+    pipeline = FraudInferencePipeline(
+        FEATURES, scaler=scaler, model=LogisticRegression().fit(scaler.transform(X), y), threshold=0.3
+    )
+
+    path = tmp_path / 'inference_pipeline.pkl'
+    pipeline.save(path)
+    loaded = FraudInferencePipeline.load(path)
+
+    assert loaded.threshold == 0.3
+    np.testing.assert_array_equal(loaded.score(X), pipeline.score(X))
@@ -0,0 +1,106 @@
+"""Tests for chunked, resumable batch scoring in predict.py."""
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import StandardScaler
+
+import predict
+from predict import FraudDetector
+
+FEATURES = ['Time', 'V1', 'V2', 'V3', 'Amount']
+
+
+@pytest.fixture
+def detector(tmp_path):
+    """Detector loaded from a small model saved as separate artifacts."""
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(500, len(FEATURES))), columns=FEATURES)
+    y = (X['V1'] + rng.normal(scale=0.5, size=len(X)) > 1.0).astype(int)
+
+    scaler = StandardScaler().fit(X)
+    model = LogisticRegression().fit(scaler.transform(X), y)
+
+    model_dir = tmp_path / 'models'
+    model_dir.mkdir()
+    joblib.dump(model, model_dir / 'fraud_detector.pkl')
+    joblib.dump(scaler, model_dir / 'scaler.pkl')
+    joblib.dump(FEATURES, model_dir / 'feature_names.pkl')
+    return FraudDetector(str(model_dir))
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    rng = np.random.default_rng(1)
+    path = tmp_path / 'transactions.csv'
+    pd.DataFrame(rng.normal(size=(1_000, len(FEATURES))), columns=FEATURES).to_csv(path, index=False)
+    return str(path)
+
+
+def test_resumed_run_is_byte_identical(detector, input_file, tmp_path, monkeypatch):
+    expected = tmp_path / 'expected.csv'
+    detector.predict_batch_resumable(input_file, str(expected), chunk_size=128)
+
+    # Stop after three committed chunks
+    iter_chunks = predict._iter_input_chunks
+
+    def crashing_chunks(*args, **kwargs):
+        for i, chunk in enumerate(iter_chunks(*args, **kwargs)):
+            if i == 3:
+                raise RuntimeError('simulated crash')
+            yield chunk
+
+    output = tmp_path / 'resumed.csv'
+    monkeypatch.setattr(predict, '_iter_input_chunks', crashing_chunks)
+    with pytest.raises(RuntimeError):
+        detector.predict_batch_resumable(input_file, str(output), chunk_size=128)
+    monkeypatch.setattr(predict, '_iter_input_chunks', iter_chunks)
+
+    summary = detector.predict_batch_resumable(input_file, str(output), chunk_size=128, resume=True)
+
+    assert output.read_bytes() == expected.read_bytes()
+    assert summary['rows'] == 1_000
+    assert summary['chunks'] == 8
+    assert not (tmp_path / 'resumed.csv.checkpoint').exists()
+
+
+def test_resume_after_all_chunks_skips_scoring(detector, input_file, tmp_path, monkeypatch):
+    expected = tmp_path / 'expected.csv'
+    detector.predict_batch_resumable(input_file, str(expected), chunk_size=128)
+
+    # Stop while assembling the shards
+    output = tmp_path / 'resumed.csv'
+    def disk_full(*args, **kwargs):
+        raise OSError('disk full')
+
+    copy_shard = predict.shutil.copyfileobj
+    monkeypatch.setattr(predict.shutil, 'copyfileobj', disk_full)
+    with pytest.raises(OSError):
+        detector.predict_batch_resumable(input_file, str(output), chunk_size=128)
+    monkeypatch.setattr(predict.shutil, 'copyfileobj', copy_shard)
+
+    def no_input(*args, **kwargs):
+        raise AssertionError('input read again after every chunk was committed')
+
+    monkeypatch.setattr(predict, '_iter_input_chunks', no_input)
+    detector.predict_batch_resumable(input_file, str(output), chunk_size=128, resume=True)
+
+    assert output.read_bytes() == expected.read_bytes()
+
+
+def test_resume_rejects_different_settings(detector, input_file, tmp_path, monkeypatch):
+    iter_chunks = predict._iter_input_chunks
+
+    def crashing_chunks(*args, **kwargs):
+        yield next(iter_chunks(*args, **kwargs))
+        raise RuntimeError('simulated crash')
+
+    output = tmp_path / 'scores.csv'
+    monkeypatch.setattr(predict, '_iter_input_chunks', crashing_chunks)
+    with pytest.raises(RuntimeError):
+        detector.predict_batch_resumable(input_file, str(output), chunk_size=128)
+
+    with pytest.raises(ValueError, match='chunk_size'):
+        detector.predict_batch_resumable(input_file, str(output), chunk_size=256, resume=True)
@@ -0,0 +1,76 @@
+"""Tests for incremental model updates and versioning in train_model.py."""
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.preprocessing import StandardScaler
+
+from inference_pipeline import load_model_bundle
+from train_model import FraudModelTrainer, check_update, promote_version
+
+FEATURES = ['Time', 'V1', 'V2', 'V3', 'Amount']
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(1_200, len(FEATURES)))
+    y = (X[:, 1] + rng.normal(scale=0.7, size=len(X)) > 1.3).astype(int)
+    return X, y
+
+
+@pytest.fixture
+def model_dir(tmp_path, data):
+    """Served logistic bundle trained on the first 800 rows, with a tuned threshold."""
+    X, y = data
+    scaler = StandardScaler().fit(X[:800])
+    trainer = FraudModelTrainer('logistic')
+    trainer.train(scaler.transform(X[:800]), y[:800])
+
+    model_dir = tmp_path / 'models'
+    trainer.save_model(model_dir, feature_names=FEATURES)
+    joblib.dump(scaler, model_dir / 'scaler.pkl')
+    trainer.export_inference_pipeline(model_dir, scaler, FEATURES, threshold=0.3)
+    return model_dir
+
+
+def test_hist_gb_update_is_rejected(data):
+    X, y = data
+    trainer = FraudModelTrainer('hist_gb')
+    trainer.model.set_params(max_iter=5)
+    trainer.train(X[:800], y[:800])
+
+    with pytest.raises(ValueError, match='hist_gb'):
+        trainer.update(X[800:], y[800:])
+
+
+def test_update_saves_a_version_at_the_default_threshold(model_dir, data):
+    X, y = data
+    trainer = FraudModelTrainer()
+    pipeline = trainer.load_bundle(model_dir)
+    assert pipeline.threshold == 0.3
+
+    trainer.update(X[800:], y[800:], scaler=pipeline.scaler)
+    version_dir = trainer.save_version(model_dir, pipeline.scaler, pipeline.feature_names)
+    promote_version(version_dir, model_dir)
+
+    served = load_model_bundle(model_dir)
+    assert version_dir.name == 'v2'
+    assert (model_dir / 'versions' / 'v1' / 'fraud_detector.pkl').exists()
+    # The old threshold was tuned on the previous model's scores
+    assert served.threshold == 0.5
+    np.testing.assert_allclose(
+        served.score(X[800:]),
+        trainer.model.predict_proba(pipeline.scaler.transform(X[800:]))[:, 1]
+    )
+
+
+def test_check_update_allows_only_a_small_pr_auc_drop():
+    y = np.array([0, 0, 0, 1, 0, 1, 0, 1])
+    perfect = np.where(y == 1, 0.9, 0.1)
+    worse = np.array([0.1, 0.2, 0.95, 0.9, 0.1, 0.8, 0.1, 0.3])
+
+    assert check_update(y, perfect, perfect)['passed']
+    assert check_update(y, worse, perfect)['passed']
+    assert not check_update(y, perfect, worse)['passed']
+    assert check_update(y, perfect, worse, max_drop=1.0)['passed']
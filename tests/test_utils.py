@@ -0,0 +1,64 @@
+"""Tests for the shared prediction helpers in utils.py."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import RISK_BIN_EDGES, build_batch_results, interpret_prediction, save_prediction_log
+
+
+def test_batch_risk_levels_match_single_predictions():
+    # Every band edge, and the values just either side of it
+    probabilities = np.concatenate([
+        [0.0, 1.0],
+        RISK_BIN_EDGES,
+        np.nextafter(RISK_BIN_EDGES, 0.0),
+        np.nextafter(RISK_BIN_EDGES, 1.0),
+        np.random.default_rng(0).random(200)
+    ])
+
+    batch = build_batch_results(probabilities)
+    single = [interpret_prediction(int(p >= 0.5), float(p))['risk_level'] for p in probabilities]
+
+    assert list(batch['Risk_Level'].astype(str)) == single
+
+
+@pytest.mark.parametrize('edge', RISK_BIN_EDGES)
+def test_risk_band_edges_are_lower_inclusive(edge):
+    below = interpret_prediction(0, float(np.nextafter(edge, 0.0)))['risk_level']
+    at = interpret_prediction(0, float(edge))['risk_level']
+    assert below != at
+
+
+def test_batch_labels_use_the_threshold_inclusively():
+    results = build_batch_results(np.array([0.29, 0.3, 0.31]), threshold=0.3)
+    assert list(results['Prediction'].astype(str)) == ['GENUINE', 'FRAUD', 'FRAUD']
+
+
+RESULT = {'prediction': 'GENUINE', 'fraud_probability': 0.1, 'risk_level': 'VERY LOW'}
+
+
+def test_prediction_log_appends_in_header_order(tmp_path):
+    log_file = tmp_path / 'predictions_log.csv'
+    save_prediction_log({'Amount': 10.0, 'V1': -1.0}, RESULT, str(log_file))
+    # Same fields in another order, with an incoming transaction id
+    logged_id = save_prediction_log({'V1': 2.0, 'transaction_id': '0042', 'Amount': 20.0}, RESULT, str(log_file))
+
+    log = pd.read_csv(log_file, dtype={'transaction_id': str})
+    assert logged_id == '0042'
+    assert list(log['Amount']) == [10.0, 20.0]
+    assert list(log['V1']) == [-1.0, 2.0]
+    assert log['transaction_id'].iloc[1] == '0042'
+    assert log['transaction_id'].iloc[0]  # A generated id
+
+
+def test_prediction_log_with_new_fields_starts_a_new_file(tmp_path):
+    log_file = tmp_path / 'predictions_log.csv'
+    save_prediction_log({'Amount': 10.0}, RESULT, str(log_file))
+    save_prediction_log({'Amount': 20.0, 'V1': 1.0}, RESULT, str(log_file))
+
+    archived = list(tmp_path.glob('predictions_log.*.csv'))
+    assert len(archived) == 1
+    assert list(pd.read_csv(archived[0])['Amount']) == [10.0]
+    log = pd.read_csv(log_file)
+    assert list(log['Amount']) == [20.0] and list(log['V1']) == [1.0]
@@ -0,0 +1,72 @@
+"""Tests for online and offline velocity features in velocity_features.py."""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from velocity_features import VelocityFeatureStore, backfill_velocity_features, velocity_feature_names
+
+
+@pytest.fixture
+def transactions():
+    """Bursty card transactions over three days, with tied times and idle gaps."""
+    rng = np.random.default_rng(0)
+    n = 5_000
+    times = np.sort(np.concatenate([
+        rng.uniform(0, 3 * 86_400, size=n - 500),
+        np.repeat(rng.uniform(0, 3 * 86_400, size=50), 10)  # Bursts at the same second
+    ])).round()
+    return pd.DataFrame({
+        'card': rng.choice([f'card_{i}' for i in range(40)], size=n),
+        'Time': times,
+        'Amount': rng.exponential(80, size=n).round(2)
+    })
+
+
+def test_online_updates_match_backfill(transactions):
+    store = VelocityFeatureStore()
+    online = pd.DataFrame(
+        [store.update(row.card, row.Time, row.Amount) for row in transactions.itertuples()],
+        index=transactions.index
+    )
+
+    offline = backfill_velocity_features(transactions, 'card')
+
+    assert list(offline.columns) == velocity_feature_names()
+    pd.testing.assert_frame_equal(online[offline.columns], offline, check_dtype=False, check_exact=True)
+
+
+def test_concurrent_updates_match_backfill(transactions):
+    store = VelocityFeatureStore()
+    online = {}
+    cards = transactions['card'].unique()
+    barrier = threading.Barrier(4)
+
+    def replay(owned):
+        # Each thread serves its own cards, in time order
+        barrier.wait()
+        for row in transactions[transactions['card'].isin(owned)].itertuples():
+            online[row.Index] = store.update(row.card, row.Time, row.Amount)
+
+    threads = [threading.Thread(target=replay, args=(cards[k::4],)) for k in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    offline = backfill_velocity_features(transactions, 'card')
+    online = pd.DataFrame.from_dict(online, orient='index').loc[offline.index, offline.columns]
+    pd.testing.assert_frame_equal(online, offline, check_dtype=False, check_exact=True)
+    assert store.stats()['entities'] == len(cards)
+
+
+def test_query_does_not_record():
+    store = VelocityFeatureStore()
+    store.update('card_0', 1_000.0, 25.0)
+
+    assert store.query('card_0', 1_030.0)['txn_count_1m'] == 1
+    assert store.query('card_0', 1_030.0)['amount_sum_1m'] == 25.0
+    assert store.query('card_0', 1_061.0)['txn_count_1m'] == 0
+    assert store.query('unknown', 1_000.0)['txn_count_24h'] == 0